@@ -0,0 +1,37 @@
+const appRoot = require('app-root-path');
+const _ = require('lodash');
+
+const { bindList } = appRoot.require('api/v1/db/oracledb/query-builder');
+const { logger } = appRoot.require('utils/logger');
+
+/**
+ * @summary Select which of the given IDs exist in a table with a single query
+ * @function
+ * @param {object} connection Oracle connection
+ * @param {string} tableName Name of the table
+ * @param {string[]} ids IDs to look up. At most 1000 IDs can be looked up at once.
+ * @returns {Promise<Set>} Promise object represents the IDs which exist as strings
+ */
+const existingIds = async (connection, tableName, ids) => {
+  if (_.isEmpty(ids)) {
+    return new Set();
+  }
+  const { sqlList, sqlParams } = bindList('id', ids);
+  const sqlQuery = `SELECT ID AS "id" FROM ${tableName} WHERE ID IN (${sqlList})`;
+  const { rows } = await connection.execute(sqlQuery, sqlParams);
+  return new Set(_.map(rows, ({ id }) => String(id)));
+};
+
+/**
+ * @summary Collect the offsets of the rows of an executeMany batch that failed. The errors are
+ *          logged since only a generic detail is returned to the client.
+ * @function
+ * @param {object} result Result of executeMany with batchErrors enabled
+ * @returns {Set} Offsets of the failed rows
+ */
+const failedOffsets = (result) => {
+  _.forEach(result.batchErrors, err => logger.error(err));
+  return new Set(_.map(result.batchErrors, 'offset'));
+};
+
+module.exports = { existingIds, failedOffsets };
@@ -0,0 +1,100 @@
+const _ = require('lodash');
+
+/**
+ * Build the error of a checkout which is turned away because the database is overloaded. The
+ * error handler responds to it with 503 Service Unavailable.
+ *
+ * @param {string} detail A human-readable explanation
+ * @returns {Error} Error
+ */
+const overloadedError = detail => _.assign(new Error(detail), { status: 503 });
+
+/**
+ * Create a queue which limits the number of connections checked out at the same time. Checkouts
+ * over the limit wait in first in, first out order. A checkout is rejected right away when
+ * queueMax checkouts are already waiting and rejected once it waited queueTimeout milliseconds.
+ *
+ * @param {object} options Options
+ * @param {number} options.limit Number of connections which may be checked out at the same time
+ * @param {number} options.queueMax Number of checkouts which may wait. 0 means no limit.
+ * @param {number} options.queueTimeout Number of milliseconds a checkout may wait. 0 means no
+ *                                      limit.
+ * @returns {object} Checkout queue
+ */
+const createCheckoutQueue = ({ limit, queueMax, queueTimeout }) => {
+  const waiters = [];
+  const rejected = { queueFull: 0, queueTimeout: 0 };
+  let currentLimit = limit;
+  let inUse = 0;
+
+  /** Hand the free slots to the longest waiting checkouts */
+  const dispatch = () => {
+    while (inUse < currentLimit && !_.isEmpty(waiters)) {
+      const waiter = waiters.shift();
+      clearTimeout(waiter.timer);
+      inUse += 1;
+      waiter.resolve();
+    }
+  };
+
+  /** Free the slot of a checkout */
+  const release = () => {
+    inUse -= 1;
+    dispatch();
+  };
+
+  /**
+   * Wait for a free slot
+   *
+   * @returns {Promise<Function>} Promise object represents a function which frees the slot. It
+   *                              must be called exactly once.
+   */
+  const acquire = () => {
+    if (inUse < currentLimit && _.isEmpty(waiters)) {
+      inUse += 1;
+      return Promise.resolve(_.once(release));
+    }
+    if (queueMax && waiters.length >= queueMax) {
+      rejected.queueFull += 1;
+      return Promise.reject(overloadedError('Too many requests are waiting for the database.'));
+    }
+
+    return new Promise((resolve, reject) => {
+      const waiter = { resolve: () => resolve(_.once(release)) };
+      if (queueTimeout) {
+        waiter.timer = setTimeout(() => {
+          _.pull(waiters, waiter);
+          rejected.queueTimeout += 1;
+          reject(overloadedError('Timed out waiting for a database connection.'));
+        }, queueTimeout);
+      }
+      waiters.push(waiter);
+    });
+  };
+
+  /**
+   * Change the number of connections which may be checked out at the same time
+   *
+   * @param {number} newLimit New limit
+   */
+  const setLimit = (newLimit) => {
+    currentLimit = newLimit;
+    dispatch();
+  };
+
+  /**
+   * Take a snapshot of the queue
+   *
+   * @returns {object} Number of checked out connections, waiting and rejected checkouts
+   */
+  const stats = () => ({
+    limit: currentLimit,
+    inUse,
+    queued: waiters.length,
+    rejected: _.clone(rejected),
+  });
+
+  return { acquire, setLimit, stats };
+};
+
+module.exports = { createCheckoutQueue };
@@ -0,0 +1,62 @@
+/** Columns of VIDEO_GAMES keyed by the field names of gameResource */
+const gameColumns = {
+  id: 'ID',
+  developerId: 'DEVELOPER_ID',
+  name: 'NAME',
+  score: 'SCORE',
+  reviewCount: 'REVIEW_COUNT',
+  releaseDate: 'RELEASE_DATE',
+};
+
+/** Columns of DEVELOPERS keyed by the field names of developerResource */
+const developerColumns = {
+  id: 'ID',
+  name: 'NAME',
+  website: 'WEBSITE',
+};
+
+/** Columns of REVIEWS keyed by the field names of reviewResource */
+const reviewColumns = {
+  id: 'ID',
+  reviewer: 'REVIEWER',
+  gameId: 'GAME_ID',
+  score: 'SCORE',
+  reviewText: 'REVIEW_TEXT',
+  reviewDate: 'REVIEW_DATE',
+};
+
+/** Types of the columns of VIDEO_GAMES keyed by field name */
+const gameColumnTypes = {
+  id: 'number',
+  developerId: 'number',
+  name: 'string',
+  score: 'number',
+  reviewCount: 'number',
+  releaseDate: 'date',
+};
+
+/** Types of the columns of DEVELOPERS keyed by field name */
+const developerColumnTypes = {
+  id: 'number',
+  name: 'string',
+  website: 'string',
+};
+
+/** Types of the columns of REVIEWS keyed by field name */
+const reviewColumnTypes = {
+  id: 'number',
+  reviewer: 'string',
+  gameId: 'number',
+  score: 'number',
+  reviewText: 'string',
+  reviewDate: 'date',
+};
+
+module.exports = {
+  gameColumns,
+  developerColumns,
+  reviewColumns,
+  gameColumnTypes,
+  developerColumnTypes,
+  reviewColumnTypes,
+};
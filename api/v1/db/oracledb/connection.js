@@ -1,37 +1,215 @@
 const appRoot = require('app-root-path');
 const config = require('config');
+const _ = require('lodash');
 const oracledb = require('oracledb');
+const { finished } = require('stream');
 
-const { logger } = appRoot.require('utils/logger');
+const { dataSources } = config.get('dataSources');
 
-const dbConfig = config.get('dataSources').oracledb;
+/**
+ * Name of the data source which the DAOs query. A local SQLite database can stand in for Oracle,
+ * so that the DAOs can be benchmarked without an Oracle instance.
+ */
+const dataSource = dataSources.includes('sqlite') ? 'sqlite' : 'oracledb';
+const dbConfig = config.get('dataSources')[dataSource];
 
 process.on('SIGINT', () => process.exit());
 oracledb.outFormat = oracledb.OBJECT;
 oracledb.fetchAsString = [oracledb.DATE, oracledb.NUMBER];
 
-/** Increase 1 extra thread for every 5 pools but no more than 128 */
-const threadPoolSize = dbConfig.poolMax + (dbConfig.poolMax / 5);
-process.env.UV_THREADPOOL_SIZE = threadPoolSize > 128 ? 128 : threadPoolSize;
+/**
+ * Every process has its own pool of poolMax connections, so the thread pool of each process is
+ * sized for its own pool. Increase 1 extra thread for every 5 connections but no more than 128
+ * and no less than the default of 4. libuv reads the size when the thread pool is first used.
+ */
+const threadPoolSize = _.clamp(Math.ceil(dbConfig.poolMax * 1.2), 4, 128);
+process.env.UV_THREADPOOL_SIZE = threadPoolSize;
+
+// the logger opens its log file with the thread pool, so it is loaded once the size is set
+const { createCheckoutQueue } = appRoot.require('api/v1/db/oracledb/checkout-queue');
+const { startStatementTimer } = appRoot.require('api/v1/db/oracledb/instrument');
+const { createHistogram, startTimer } = appRoot.require('utils/histogram');
+const { logger } = appRoot.require('utils/logger');
+const { registerMetrics } = appRoot.require('utils/metrics');
+const { recordStage, timeStage } = appRoot.require('utils/request-timing');
+
+const createPool = dataSource === 'sqlite'
+  ? appRoot.require('api/v1/db/sqlite/connection').createPool
+  : options => oracledb.createPool(options);
+
+/** Options of the checkout queue which are not options of the oracledb pool */
+const queueOptionKeys = ['queueMax', 'adaptivePool', 'targetWaitTime'];
+
+const {
+  poolMin,
+  poolMax,
+  poolIncrement,
+  queueMax,
+  queueTimeout,
+  adaptivePool,
+  targetWaitTime,
+} = _.defaults({}, dbConfig, {
+  poolMin: 0,
+  poolIncrement: 1,
+  queueMax: 500,
+  queueTimeout: 60000,
+  adaptivePool: false,
+  targetWaitTime: 50,
+});
+
+/** Number of milliseconds between two adjustments of the limit of an adaptive pool */
+const adaptInterval = 5000;
+
+/** Number of distinct statement texts which are tracked */
+const maxTrackedStatements = 1000;
+
+/**
+ * Checkouts of connections. In adaptive mode the number of connections which may be checked out
+ * starts at poolMin and grows up to poolMax while checkouts wait longer than targetWaitTime.
+ */
+const checkoutQueue = createCheckoutQueue({
+  limit: adaptivePool ? Math.max(poolMin, 1) : poolMax,
+  queueMax,
+  queueTimeout,
+});
+const checkoutWait = createHistogram();
+
+/** Checkouts and slow checkouts since the last adjustment of the limit of an adaptive pool */
+const adaptWindow = { checkouts: 0, slowCheckouts: 0, peakInUse: 0 };
+
+/**
+ * Distinct statement texts executed by this process. Oracle hard parses a statement whose text it
+ * has not seen before, and each connection only caches stmtCacheSize statements, so this number
+ * should stay small and stop growing once every kind of request has been served.
+ */
+const statementTexts = new Set();
+const statementStats = { executions: 0 };
+
+let poolPromise;
+let openedPool;
+
+/**
+ * Grow the limit of an adaptive pool when more than a tenth of the checkouts waited longer than
+ * targetWaitTime and shrink it by one connection when no checkout was slow and connections were
+ * left unused. Idle connections over poolMin are closed by the pool after poolTimeout.
+ */
+const adaptPoolLimit = () => {
+  const { limit } = checkoutQueue.stats();
+  const { checkouts, slowCheckouts, peakInUse } = adaptWindow;
+
+  if (slowCheckouts > checkouts / 10 && limit < poolMax) {
+    checkoutQueue.setLimit(Math.min(limit + Math.max(poolIncrement, 1), poolMax));
+  } else if (slowCheckouts === 0 && peakInUse < limit && limit > Math.max(poolMin, 1)) {
+    checkoutQueue.setLimit(limit - 1);
+  }
+  _.assign(adaptWindow, { checkouts: 0, slowCheckouts: 0, peakInUse: 0 });
+};
 
 /**
- * Create a pool of connection
+ * Create the pool of connections of this process once it is first needed, so that a cluster
+ * primary which loads this module to size the thread pool of its workers opens no connections
  *
  * @returns {Promise} Promise object represents a pool of connections
  */
-const poolPromise = oracledb.createPool(dbConfig);
+const getPool = () => {
+  if (!poolPromise) {
+    poolPromise = createPool(_.omit(dbConfig, queueOptionKeys)).then((pool) => {
+      openedPool = pool;
+      if (adaptivePool) {
+        setInterval(adaptPoolLimit, adaptInterval).unref();
+      }
+      return pool;
+    });
+  }
+  return poolPromise;
+};
+
+/**
+ * Record how long a checkout waited for its connection
+ *
+ * @param {number} duration Number of milliseconds the checkout waited
+ */
+const recordCheckout = (duration) => {
+  checkoutWait.observe(duration);
+  adaptWindow.checkouts += 1;
+  if (duration > targetWaitTime) {
+    adaptWindow.slowCheckouts += 1;
+  }
+  adaptWindow.peakInUse = Math.max(adaptWindow.peakInUse, checkoutQueue.stats().inUse);
+};
+
+/**
+ * Record the statements executed on a connection. Every statement is timed into the statement
+ * latency histogram of the DAO function which executes it. A streamed query is timed until its
+ * last row is fetched. The time execute and executeMany take is also the "db" stage of the
+ * request.
+ *
+ * @param {object} connection Oracle connection
+ */
+const trackStatements = (connection) => {
+  _.forEach(['execute', 'executeMany', 'queryStream'], (method) => {
+    const bound = connection[method].bind(connection);
+    const run = method === 'queryStream' ? bound : timeStage('db', bound);
+    connection[method] = (sqlQuery, ...args) => {
+      statementStats.executions += 1;
+      if (statementTexts.size < maxTrackedStatements) {
+        statementTexts.add(sqlQuery);
+      }
+      const stopTimer = startStatementTimer();
+      if (method === 'queryStream') {
+        const stream = run(sqlQuery, ...args);
+        finished(stream, stopTimer);
+        return stream;
+      }
+      return run(sqlQuery, ...args).finally(stopTimer);
+    };
+  });
+};
 
 /**
- * Get a connection from created pool
+ * Get a connection from created pool. The checkout waits in the checkout queue while the limit of
+ * connections is checked out and is rejected with a 503 error when the queue is full or the wait
+ * exceeds queueTimeout.
  *
  * @returns {Promise} Promise object represents a connection from created pool
  */
-const getConnection = () => new Promise(async (resolve, reject) => {
-  poolPromise.then(async (pool) => {
+const getConnection = async () => {
+  const elapsed = startTimer();
+  const release = await checkoutQueue.acquire();
+  try {
+    const pool = await getPool();
     const connection = await pool.getConnection();
-    resolve(connection);
-  }).catch(err => reject(err));
-});
+    const checkoutDuration = elapsed();
+    recordCheckout(checkoutDuration);
+    recordStage('pool', checkoutDuration);
+    trackStatements(connection);
+
+    // the slot of the checkout is freed once the connection is back in the pool
+    const close = connection.close.bind(connection);
+    connection.close = (...args) => {
+      const closing = close(...args);
+      Promise.resolve(closing).then(release, release);
+      return closing;
+    };
+    return connection;
+  } catch (err) {
+    release();
+    throw err;
+  }
+};
+
+registerMetrics('pool', () => _.assign(
+  {
+    poolMin,
+    poolMax,
+    open: openedPool ? openedPool.connectionsOpen : 0,
+  },
+  checkoutQueue.stats(),
+  {
+    checkoutWait: checkoutWait.snapshot(),
+    statements: _.assign({ distinctTexts: statementTexts.size }, statementStats),
+  },
+));
 
 /**
  * Validate database connection and throw an error if invalid
@@ -1,10 +1,56 @@
 const appRoot = require('app-root-path');
 const _ = require('lodash');
-const oracledb = require('oracledb');
+const { pipeline } = require('stream');
 
-const { serializeDeveloper, serializeDevelopers } = require('../../serializers/developers-serializer');
+const {
+  serializeDeveloper,
+  serializeDevelopers,
+  serializeDevelopersStream,
+} = require('../../serializers/developers-serializer');
 
+const {
+  developerColumns,
+  developerColumnTypes,
+} = appRoot.require('api/v1/db/oracledb/columns');
 const conn = appRoot.require('api/v1/db/oracledb/connection');
+const { instrumentDao } = appRoot.require('api/v1/db/oracledb/instrument');
+const { executePaginated } = appRoot.require('api/v1/db/oracledb/pagination');
+const { streamQuery } = appRoot.require('api/v1/db/oracledb/query-stream');
+const { returningRow } = appRoot.require('api/v1/db/oracledb/returning');
+const {
+  selectList,
+  whereClause,
+  searchConditions,
+  searchParams,
+} = appRoot.require('api/v1/db/oracledb/query-builder');
+const { withConnection } = appRoot.require('api/v1/db/oracledb/with-connection');
+const { createCache } = appRoot.require('utils/cache');
+const { singleFlight } = appRoot.require('utils/single-flight');
+
+/** Serialized developers keyed by ID */
+const developerCache = createCache('developers');
+
+/** RETURNING clause which returns every column of an inserted or updated developer */
+const developerReturning = returningRow(developerColumns, developerColumnTypes);
+
+/** Conditions of the filters of developers keyed by bind parameter */
+const developerFilters = searchConditions('name', 'NAME');
+
+/**
+ * @summary Build the query which selects the developers matching the query parameters
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {object} SQL query and its bind parameters
+ */
+const developersQuery = (queries) => {
+  const sqlParams = searchParams('name', queries);
+  const sqlQuery = `
+    SELECT ${selectList(developerColumns, queries['fields[developer]'])}
+    FROM DEVELOPERS
+    ${whereClause(developerFilters, sqlParams)}
+  `;
+  return { sqlQuery, sqlParams };
+};
 
 /**
  * @summary Return a list of developers
@@ -13,38 +59,60 @@ const conn = appRoot.require('api/v1/db/oracledb/connection');
  */
 const getDevelopers = async (queries) => {
   const connection = await conn.getConnection();
-  const sqlParams = {};
-  if (queries.name) {
-    sqlParams.name = queries.name;
-  }
-  const sqlQuery = `
-    SELECT ID AS "id", NAME AS "name", WEBSITE AS "website"
-    FROM DEVELOPERS 
-    ${sqlParams.name ? 'WHERE NAME = :name' : ''}
-  `;
+  const { sqlQuery, sqlParams } = developersQuery(queries);
   try {
-    const { rows } = await connection.execute(sqlQuery, sqlParams);
-    const serializedDevelopers = serializeDevelopers(rows, queries);
+    const { rows, pageResult } = await executePaginated(
+      connection, sqlQuery, sqlParams, queries,
+    );
+    const serializedDevelopers = serializeDevelopers(rows, queries, pageResult);
     return serializedDevelopers;
   } finally {
     connection.close();
   }
 };
 
+/**
+ * @summary Return every developer as a stream of the serialized document
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {Promise<stream.Readable>} Promise object represents a stream of the serialized
+ *                                     developers
+ */
+const streamDevelopers = async (queries) => {
+  const { sqlQuery, sqlParams } = developersQuery(queries);
+
+  const connection = await conn.getConnection();
+  const rowStream = streamQuery(connection, sqlQuery, sqlParams);
+  return pipeline(rowStream, serializeDevelopersStream(queries), _.noop);
+};
+
 /**
  * @summary Return a specific developer by unique ID
  * @function
  * @param {string} id Unique developer ID
+ * @param {object} [queries] Query parameters. Only complete developers are cached.
+ * @param {object} [transaction] Connection of the caller. Reads on it may see its uncommitted
+ *                               changes so they are not cached.
  * @returns {Promise<object>} Promise object represents a specific developer or return undefined if
  *                            term is not found
  */
-const getDeveloperById = async (id) => {
-  const connection = await conn.getConnection();
-  try {
+const getDeveloperById = async (id, queries = {}, transaction) => {
+  const isCacheable = !transaction && !queries['fields[developer]'];
+  const cachedDeveloper = isCacheable && developerCache.get(String(id));
+  if (cachedDeveloper) {
+    return cachedDeveloper;
+  }
+  const generation = developerCache.generation();
+
+  return withConnection(transaction, async (connection) => {
     const sqlParams = {
       developerId: id,
     };
-    const sqlQuery = 'SELECT ID AS "id", NAME AS "name", WEBSITE AS "website" FROM DEVELOPERS WHERE ID = :developerId';
+    const sqlQuery = `
+      SELECT ${selectList(developerColumns, queries['fields[developer]'])}
+      FROM DEVELOPERS
+      WHERE ID = :developerId
+    `;
     const { rows } = await connection.execute(sqlQuery, sqlParams);
 
     if (rows.length > 1) {
@@ -52,73 +120,104 @@ const getDeveloperById = async (id) => {
     } else if (_.isEmpty(rows)) {
       return undefined;
     } else {
-      const serializedDeveloper = serializeDeveloper(rows[0]);
+      const serializedDeveloper = serializeDeveloper(rows[0], queries);
+      if (isCacheable) {
+        developerCache.set(String(id), serializedDeveloper, generation);
+      }
       return serializedDeveloper;
     }
-  } finally {
-    connection.close();
-  }
+  });
 };
 
 /**
  * @summary Inserts row into the developer table
+ * @function
+ * @param {object} body Request body
+ * @param {object} [transaction] Connection of the caller. The insert is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the serialized developer which was inserted
  */
-const postDeveloper = async (body) => {
-  const connection = await conn.getConnection();
-
-  try {
-    // Bind newly inserted developer row ID to outId
-    // We can use outId to query the newly created row and return it
+const postDeveloper = async (body, transaction) => withConnection(
+  transaction,
+  async (connection) => {
     const { attributes } = body.data;
-    attributes.outId = { type: oracledb.NUMBER, dir: oracledb.BIND_OUT };
-    const sqlQuery = 'INSERT INTO DEVELOPERS (NAME, WEBSITE) VALUES (:name, :website) RETURNING ID INTO :outId';
-    const rawDevelopers = await connection.execute(sqlQuery, attributes, { autoCommit: true });
-
-    // query the newly inserted row
-    const result = await getDeveloperById(rawDevelopers.outBinds.outId[0]);
+    const { sqlClause, sqlParams, toRow } = developerReturning;
+    const sqlQuery = `
+      INSERT INTO DEVELOPERS (NAME, WEBSITE)
+      VALUES (:name, :website)
+      ${sqlClause}
+    `;
+    const { outBinds } = await connection.execute(
+      sqlQuery,
+      _.assign({}, attributes, sqlParams),
+      { autoCommit: !transaction },
+    );
+    const rawDeveloper = toRow(outBinds);
+    developerCache.invalidate(String(rawDeveloper.id));
 
-    return result;
-  } finally {
-    connection.close();
-  }
-};
+    return serializeDeveloper(rawDeveloper);
+  },
+);
 
 /**
  * @summary Deletes developer row from db by ID
  * @function
  * @param {string} developerId Unique developer ID
+ * @param {object} [transaction] Connection of the caller. The deletion is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the result of the deletion
  */
-const deleteDeveloper = async (developerId) => {
-  const connection = await conn.getConnection();
-
-  try {
+const deleteDeveloper = async (developerId, transaction) => withConnection(
+  transaction,
+  async (connection) => {
     const sqlQuery = 'DELETE FROM DEVELOPERS WHERE ID = :developerId';
     const sqlParams = { developerId };
-    const response = await connection.execute(sqlQuery, sqlParams, { autoCommit: true });
+    const response = await connection.execute(
+      sqlQuery,
+      sqlParams,
+      { autoCommit: !transaction },
+    );
+    developerCache.invalidate(String(developerId));
 
     return response;
-  } finally {
-    connection.close();
-  }
-};
+  },
+);
 
 /**
- * @summary update a developer record
+ * @summary update a developer record. The updated row is returned by the UPDATE itself.
+ * @function
+ * @param {string} id Unique developer ID
+ * @param {object} body Request body
+ * @param {object} [transaction] Connection of the caller. The update is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the serialized developer which was updated
+ *                            or undefined if the developer is not found
  */
-const patchDeveloper = async (id, body) => {
-  const connection = await conn.getConnection();
-  try {
+const patchDeveloper = async (id, body, transaction) => withConnection(
+  transaction,
+  async (connection) => {
     const { attributes } = body.data;
-    attributes.developerId = id;
-    const sqlQuery = 'UPDATE DEVELOPERS SET NAME = :name, WEBSITE = :website WHERE ID = :developerId';
-    const response = await connection.execute(sqlQuery, attributes, { autoCommit: true });
+    const { sqlClause, sqlParams, toRow } = developerReturning;
+    const sqlQuery = `
+      UPDATE DEVELOPERS
+      SET NAME = :name, WEBSITE = :website
+      WHERE ID = :developerId
+      ${sqlClause}
+    `;
+    const { outBinds } = await connection.execute(
+      sqlQuery,
+      _.assign({ developerId: id }, attributes, sqlParams),
+      { autoCommit: !transaction },
+    );
+    developerCache.invalidate(String(id));
 
-    return response;
-  } finally {
-    connection.close();
-  }
-};
+    const rawDeveloper = toRow(outBinds);
+    return rawDeveloper && serializeDeveloper(rawDeveloper);
+  },
+);
 
-module.exports = {
-  getDevelopers, getDeveloperById, postDeveloper, deleteDeveloper, patchDeveloper,
-};
+module.exports = instrumentDao('developers', {
+  getDevelopers: singleFlight('developers', getDevelopers),
+  streamDevelopers,
+  getDeveloperById,
+  postDeveloper,
+  deleteDeveloper,
+  patchDeveloper,
+});
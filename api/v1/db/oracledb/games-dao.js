@@ -1,72 +1,236 @@
 const appRoot = require('app-root-path');
 const _ = require('lodash');
 const oracledb = require('oracledb');
+const { pipeline } = require('stream');
 
-const { serializeGame, serializeGames } = require('../../serializers/games-serializer');
+const {
+  serializeGame,
+  serializeGames,
+  serializeGamesStream,
+  serializeGameResults,
+} = require('../../serializers/games-serializer');
 
-const { openapi } = appRoot.require('utils/load-openapi');
-const getParameters = openapi.paths['/games'].get.parameters;
+const { parameterNames } = appRoot.require('utils/load-openapi');
 
+const { existingIds, failedOffsets } = appRoot.require('api/v1/db/oracledb/bulk');
+const {
+  gameColumns,
+  developerColumns,
+  reviewColumns,
+  gameColumnTypes,
+} = appRoot.require('api/v1/db/oracledb/columns');
 const conn = appRoot.require('api/v1/db/oracledb/connection');
+const { instrumentDao } = appRoot.require('api/v1/db/oracledb/instrument');
+const { executePaginated } = appRoot.require('api/v1/db/oracledb/pagination');
+const {
+  selectList,
+  requiredFields,
+  bindList,
+  whereClause,
+  searchConditions,
+  searchParams,
+  rangeConditions,
+  rangeParams,
+} = appRoot.require('api/v1/db/oracledb/query-builder');
+const { streamQuery } = appRoot.require('api/v1/db/oracledb/query-stream');
+const { returningRow } = appRoot.require('api/v1/db/oracledb/returning');
+const { invalidateGameStats } = appRoot.require('api/v1/db/oracledb/stats-dao');
+const { withConnection } = appRoot.require('api/v1/db/oracledb/with-connection');
+const { createCache } = appRoot.require('utils/cache');
+const { singleFlight } = appRoot.require('utils/single-flight');
+
+/** Serialized games keyed by ID */
+const gameCache = createCache('games');
+
+/** RETURNING clause which returns every column of an inserted or updated game */
+const gameReturning = returningRow(gameColumns, gameColumnTypes);
 
 /**
- * @summary Return a list of games
+ * Sort keys of games in terms of the wrapped query alias "q". Games without reviews have no score
+ * so they are sorted as if their score was 0.
+ */
+const gameSortKeys = {
+  score: {
+    expression: 'NVL(q."score", 0)',
+    toCursor: 'TO_CHAR(NVL(q."score", 0))',
+    fromCursor: 'TO_NUMBER(:afterValue)',
+  },
+};
+
+/**
+ * Queries of the resources related to games keyed by relationship name. The related rows of a
+ * whole page of games are selected by a single query which binds the foreign keys of the page.
+ */
+const relatedQueries = {
+  developer: {
+    foreignKeys: games => _.map(games, 'developerId'),
+    sqlQuery: (sqlList, queries) => `
+      SELECT ${selectList(developerColumns, queries['fields[developer]'])}
+      FROM DEVELOPERS
+      WHERE ID IN (${sqlList})
+      ORDER BY ID
+    `,
+  },
+  reviews: {
+    foreignKeys: games => _.map(games, 'id'),
+    // gameId is always selected to relate the reviews to their games
+    sqlQuery: (sqlList, queries) => `
+      SELECT ${selectList(reviewColumns, requiredFields(queries['fields[review]'], 'gameId'))}
+      FROM REVIEWS
+      WHERE GAME_ID IN (${sqlList})
+      ORDER BY GAME_ID, ID
+    `,
+  },
+};
+
+/**
+ * @summary Select the resources related to games with one query per included relationship
  * @function
- * @returns {Promise<object[]>} Promise object represents a list of games
+ * @param {object} connection Oracle connection
+ * @param {object[]} games Raw game rows
+ * @param {object} queries Query parameters
+ * @returns {Promise<object>} Promise object represents the related rows keyed by relationship name
  */
-const getGames = async (queries) => {
-  // parse passed in parameters and construct query
-  const sqlParams = {};
-  // iterate through parameters and add parameters in request to the sql query
-  _.forEach(getParameters, (key) => {
-    if (queries[key.name] && key.name !== 'page[size]' && key.name !== 'page[number]') {
-      sqlParams[key.name] = queries[key.name];
+const getRelated = async (connection, games, queries) => {
+  const include = queries.include || [];
+  const relatedRows = await Promise.all(_.map(include, async (relationship) => {
+    const { foreignKeys, sqlQuery } = relatedQueries[relationship];
+    const ids = _.uniq(_.reject(foreignKeys(games), _.isNil));
+    if (_.isEmpty(ids)) {
+      return [];
     }
-  });
+    const { sqlList, sqlParams } = bindList('id', ids);
+    const { rows } = await connection.execute(sqlQuery(sqlList, queries), sqlParams);
+    return rows;
+  }));
+  return _.zipObject(include, relatedRows);
+};
+
+/**
+ * @summary Select the columns of the requested games fields along with the columns that sorting
+ *          and included relationships depend on
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {string} Select list of games
+ */
+const gamesSelectList = queries => selectList(gameColumns, requiredFields(
+  queries['fields[game]'],
+  queries.sort,
+  _.includes(queries.include, 'developer') ? 'developerId' : undefined,
+));
+
+/**
+ * Conditions of the filters of games keyed by query parameter. scoreMin is at least 1, so comparing
+ * NVL(SCORE, 0) selects the same games and lets the filter use the index on NVL(SCORE, 0).
+ */
+const gameFilters = _.assign(
+  {
+    scoreMin: 'NVL(SCORE, 0) >= :scoreMin',
+    scoreMax: 'SCORE <= :scoreMax',
+  },
+  searchConditions('name', 'NAME'),
+  { developerId: 'DEVELOPER_ID = :developerId' },
+  rangeConditions('releaseDate', 'RELEASE_DATE'),
+);
+
+/** Parameters of GET /games which are not bound to the query as they are */
+const paramsToFilter = [
+  'page[size]',
+  'page[number]',
+  'page[after]',
+  'sort',
+  'include',
+  'fields[game]',
+  'fields[developer]',
+  'fields[review]',
+  'name[prefix]',
+  'name[contains]',
+  'releaseDate[gte]',
+  'releaseDate[lt]',
+];
+
+/** Parameters of GET /games which filter games by the value of a column */
+const gameFilterParams = _.difference(parameterNames['/games'].get, paramsToFilter);
+
+/**
+ * @summary Build the query which selects the games matching the query parameters
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {object} SQL query and its bind parameters
+ */
+const gamesQuery = (queries) => {
+  // add the filters in request to the sql query
+  const sqlParams = _.pickBy(_.pick(queries, gameFilterParams));
+  _.assign(sqlParams, searchParams('name', queries), rangeParams('releaseDate', queries));
   const sqlQuery = `
-    SELECT ID AS "id",
-    DEVELOPER_ID AS "developerId",
-    NAME AS "name",
-    SCORE AS "score",
-    RELEASE_DATE AS "releaseDate"
+    SELECT ${gamesSelectList(queries)}
     FROM VIDEO_GAMES
-    WHERE 1=1
-    ${sqlParams.scoreMin ? 'AND SCORE >= :scoreMin' : ''}
-    ${sqlParams.scoreMax ? 'AND SCORE <= :scoreMax' : ''}
-    ${sqlParams.name ? 'AND NAME = :name' : ''}
-    ${sqlParams.developerId ? 'AND DEVELOPER_ID = :developerId' : ''}
+    ${whereClause(gameFilters, sqlParams)}
   `;
+  return { sqlQuery, sqlParams };
+};
+
+/**
+ * @summary Return a list of games
+ * @function
+ * @returns {Promise<object[]>} Promise object represents a list of games
+ */
+const getGames = async (queries) => {
+  const { sqlQuery, sqlParams } = gamesQuery(queries);
 
   const connection = await conn.getConnection();
   try {
     // execute query and return results
-    const { rows } = await connection.execute(sqlQuery, sqlParams);
-    const serializedGames = serializeGames(rows, queries);
+    const { rows, pageResult } = await executePaginated(
+      connection, sqlQuery, sqlParams, queries, gameSortKeys,
+    );
+    const related = await getRelated(connection, rows, queries);
+    const serializedGames = serializeGames(rows, queries, pageResult, related);
     return serializedGames;
   } finally {
     connection.close();
   }
 };
 
+/**
+ * @summary Return every game as a stream of the serialized document
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {Promise<stream.Readable>} Promise object represents a stream of the serialized games
+ */
+const streamGames = async (queries) => {
+  const { sqlQuery, sqlParams } = gamesQuery(queries);
+
+  const connection = await conn.getConnection();
+  const rowStream = streamQuery(connection, sqlQuery, sqlParams, gameSortKeys[queries.sort]);
+  return pipeline(rowStream, serializeGamesStream(queries), _.noop);
+};
+
 /**
  * @summary Return a specific game by unique ID
  * @function
  * @param {string} id Unique game ID
+ * @param {object} [queries] Query parameters. Only complete games without included resources
+ *                           are cached.
+ * @param {object} [transaction] Connection of the caller. Reads on it may see its uncommitted
+ *                               changes so they are not cached.
  * @returns {Promise<object>} Promise object represents a specific game or return undefined if
  *                            term is not found
  */
-const getGameById = async (id) => {
-  const connection = await conn.getConnection();
-  try {
+const getGameById = async (id, queries = {}, transaction) => {
+  const isCacheable = !transaction && !queries.include && !queries['fields[game]'];
+  const cachedGame = isCacheable && gameCache.get(String(id));
+  if (cachedGame) {
+    return cachedGame;
+  }
+  const generation = gameCache.generation();
+
+  return withConnection(transaction, async (connection) => {
     const sqlParams = {
       gameId: id,
     };
     const sqlQuery = `
-      SELECT ID AS "id",
-      DEVELOPER_ID AS "developerId",
-      NAME AS "name",
-      SCORE AS "score",
-      RELEASE_DATE AS "releaseDate"
+      SELECT ${gamesSelectList(queries)}
       FROM VIDEO_GAMES
       WHERE ID = :gameId
     `;
@@ -77,36 +241,102 @@ const getGameById = async (id) => {
     } else if (_.isEmpty(rows)) {
       return undefined;
     } else {
-      const serializedGame = serializeGame(rows[0]);
+      const related = await getRelated(connection, rows, queries);
+      const serializedGame = serializeGame(rows[0], queries, related);
+      if (isCacheable) {
+        gameCache.set(String(id), serializedGame, generation);
+      }
       return serializedGame;
     }
-  } finally {
-    connection.close();
-  }
+  });
 };
 
 /**
- * @summary Inserts row into the game table
+ * @summary Inserts row into the game table. A developerId which does not exist is rejected by
+ *          the foreign key constraint with ORA-02291.
+ * @function
+ * @param {object} body Request body
+ * @param {object} [transaction] Connection of the caller. The insert is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the serialized game which was inserted
  */
-const postGame = async (body) => {
-  const connection = await conn.getConnection();
+const postGame = async (body, transaction) => withConnection(transaction, async (connection) => {
+  const { attributes } = body.data;
+  const { sqlClause, sqlParams, toRow } = gameReturning;
+  const sqlQuery = `
+    INSERT INTO VIDEO_GAMES (NAME, RELEASE_DATE, DEVELOPER_ID)
+    VALUES (:name, TO_DATE(:releaseDate, 'YYYY/MM/DD'), :developerId)
+    ${sqlClause}
+  `;
+  const { outBinds } = await connection.execute(
+    sqlQuery,
+    _.assign({}, attributes, sqlParams),
+    { autoCommit: !transaction },
+  );
+  const rawGame = toRow(outBinds);
+  gameCache.invalidate(String(rawGame.id));
+
+  return serializeGame(rawGame);
+});
 
+/**
+ * @summary Inserts game rows in bulk. Games of developers that do not exist are rejected and the
+ *          others are inserted by a single batch and committed at once.
+ * @function
+ * @param {object[]} games Game resources of the request body
+ * @returns {Promise<object>} Promise object represents the serialized result of each game
+ */
+const postGames = async (games) => {
+  const developerIds = _.uniq(_.map(games, ({ attributes }) => String(attributes.developerId)));
+  const sqlQuery = `
+    INSERT INTO VIDEO_GAMES (NAME, RELEASE_DATE, DEVELOPER_ID)
+    VALUES (:name, TO_DATE(:releaseDate, 'YYYY/MM/DD'), :developerId)
+    RETURNING ID INTO :outId
+  `;
+  const bindDefs = {
+    name: { type: oracledb.STRING, maxSize: 255 },
+    releaseDate: { type: oracledb.STRING, maxSize: 10 },
+    developerId: { type: oracledb.NUMBER },
+    outId: { type: oracledb.NUMBER, dir: oracledb.BIND_OUT },
+  };
+
+  const connection = await conn.getConnection();
   try {
-    // Bind newly inserted game row ID to outId
-    // We can use outId to query the newly created row and return it
-    const { attributes } = body.data;
-    attributes.outId = { type: oracledb.NUMBER, dir: oracledb.BIND_OUT };
-    const sqlQuery = `
-      INSERT INTO VIDEO_GAMES (NAME, RELEASE_DATE, DEVELOPER_ID)
-      VALUES (:name, TO_DATE(:releaseDate, 'YYYY/MM/DD'), :developerId)
-      RETURNING ID INTO :outId
-    `;
-    const rawGames = await connection.execute(sqlQuery, attributes, { autoCommit: true });
+    const validDeveloperIds = await existingIds(connection, 'DEVELOPERS', developerIds);
+    const results = [];
+    const rows = [];
+    _.forEach(games, ({ attributes }, index) => {
+      if (validDeveloperIds.has(String(attributes.developerId))) {
+        rows.push({ index, attributes });
+      } else {
+        results[index] = {
+          index,
+          status: '400',
+          detail: 'A developer with developerId does not exist.',
+        };
+      }
+    });
 
-    // query the newly inserted row
-    const result = await getGameById(rawGames.outBinds.outId[0]);
+    if (!_.isEmpty(rows)) {
+      const binds = _.map(rows, ({ attributes: { name, releaseDate, developerId } }) => ({
+        name,
+        releaseDate,
+        developerId: Number(developerId),
+      }));
+      const result = await connection.executeMany(
+        sqlQuery,
+        binds,
+        { bindDefs, batchErrors: true },
+      );
+      await connection.commit();
 
-    return result;
+      const failed = failedOffsets(result);
+      _.forEach(rows, ({ index }, offset) => {
+        results[index] = failed.has(offset)
+          ? { index, status: '400', detail: 'The game could not be created.' }
+          : { index, status: '201', id: String(result.outBinds[offset].outId[0]) };
+      });
+    }
+    return serializeGameResults(results);
   } finally {
     connection.close();
   }
@@ -116,70 +346,237 @@ const postGame = async (body) => {
  * @summary Deletes game row from db by ID
  * @function
  * @param {string} gameId Unique game ID
+ * @param {object} [transaction] Connection of the caller. The deletion is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the result of the deletion
  */
-const deleteGame = async (gameId) => {
-  const connection = await conn.getConnection();
-
-  try {
+const deleteGame = async (gameId, transaction) => withConnection(
+  transaction,
+  async (connection) => {
     const sqlQuery = 'DELETE FROM VIDEO_GAMES WHERE ID = :id';
     const sqlParams = { id: gameId };
-    const response = await connection.execute(sqlQuery, sqlParams, { autoCommit: true });
+    const response = await connection.execute(
+      sqlQuery,
+      sqlParams,
+      { autoCommit: !transaction },
+    );
+    gameCache.invalidate(String(gameId));
+    invalidateGameStats(gameId);
 
     return response;
-  } finally {
-    connection.close();
-  }
-};
+  },
+);
 
 /**
- * @summary update a game record
+ * @summary update a game record. The updated row is returned by the UPDATE itself.
+ * @function
+ * @param {string} id Unique game ID
+ * @param {object} body Request body
+ * @param {object} [transaction] Connection of the caller. The update is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the serialized game which was updated or
+ *                            undefined if the game is not found
  */
-const patchGame = async (id, body) => {
-  const connection = await conn.getConnection();
-  try {
+const patchGame = async (id, body, transaction) => withConnection(
+  transaction,
+  async (connection) => {
     const { attributes } = body.data;
-    attributes.id = id;
+    const { sqlClause, sqlParams, toRow } = gameReturning;
+    /*
+     * attributes which are not changed are bound as null so that every patch shares one statement.
+     * The binds are typed so that a null binds like a value and the statement keeps one cursor.
+     */
     const sqlQuery = `
       UPDATE VIDEO_GAMES
-      SET ${attributes.name ? 'NAME = :name' : ''}
-      ${attributes.releaseDate ? `${attributes.name ? ', ' : ''} RELEASE_DATE = TO_DATE(:releaseDate, 'YYYY/MM/DD')` : ''}
+      SET NAME = NVL(:name, NAME),
+      RELEASE_DATE = NVL(TO_DATE(:releaseDate, 'YYYY/MM/DD'), RELEASE_DATE)
       WHERE ID = :id
+      ${sqlClause}
     `;
-    const response = await connection.execute(sqlQuery, attributes, { autoCommit: true });
+    const patchParams = {
+      id,
+      name: { type: oracledb.STRING, val: _.isNil(attributes.name) ? null : attributes.name },
+      releaseDate: {
+        type: oracledb.STRING,
+        val: _.isNil(attributes.releaseDate) ? null : attributes.releaseDate,
+      },
+    };
+    const { outBinds } = await connection.execute(
+      sqlQuery,
+      _.assign(patchParams, sqlParams),
+      { autoCommit: !transaction },
+    );
+    gameCache.invalidate(String(id));
 
-    return response;
+    const rawGame = toRow(outBinds);
+    return rawGame && serializeGame(rawGame);
+  },
+);
+
+/**
+ * @summary Update game records in bulk with a single batch which is committed once
+ * @function
+ * @param {object[]} games Game resources of the request body
+ * @returns {Promise<object>} Promise object represents the serialized result of each game
+ */
+const patchGames = async (games) => {
+  // attributes which are not changed are bound as null so that every row shares one statement
+  const sqlQuery = `
+    UPDATE VIDEO_GAMES
+    SET NAME = NVL(:name, NAME),
+    RELEASE_DATE = NVL(TO_DATE(:releaseDate, 'YYYY/MM/DD'), RELEASE_DATE)
+    WHERE ID = :id
+  `;
+  const bindDefs = {
+    id: { type: oracledb.NUMBER },
+    name: { type: oracledb.STRING, maxSize: 255 },
+    releaseDate: { type: oracledb.STRING, maxSize: 10 },
+  };
+  const binds = _.map(games, ({ id, attributes: { name, releaseDate } }) => ({
+    id: Number(id),
+    name: _.isNil(name) ? null : name,
+    releaseDate: _.isNil(releaseDate) ? null : releaseDate,
+  }));
+
+  const connection = await conn.getConnection();
+  try {
+    const result = await connection.executeMany(
+      sqlQuery,
+      binds,
+      { bindDefs, batchErrors: true, dmlRowCounts: true },
+    );
+    await connection.commit();
+
+    const failed = failedOffsets(result);
+    const results = _.map(games, ({ id }, index) => {
+      if (failed.has(index)) {
+        return {
+          index,
+          status: '400',
+          id: String(id),
+          detail: 'The game could not be updated.',
+        };
+      }
+      if (result.dmlRowCounts[index] < 1) {
+        return {
+          index,
+          status: '404',
+          id: String(id),
+          detail: 'A game with the specified ID was not found.',
+        };
+      }
+      gameCache.invalidate(String(id));
+      return { index, status: '200', id: String(id) };
+    });
+    return serializeGameResults(results);
   } finally {
     connection.close();
   }
 };
 
 /**
- * @summary Checks if a developer record with an id that matches the passed in developerId exists
- * @param {string} developerId id of developer record to check existance
- * @returns {boolean} true if developer record is found and false if no records are found
+ * Statement which adds the change of the reviews of a game to its running score sum and review
+ * count and recomputes its aggregate score from them
+ */
+const gameScoreQuery = `
+  UPDATE VIDEO_GAMES
+  SET SCORE_SUM = SCORE_SUM + :scoreDelta,
+  REVIEW_COUNT = REVIEW_COUNT + :countDelta,
+  SCORE = CASE WHEN REVIEW_COUNT + :countDelta = 0 THEN NULL
+    ELSE (SCORE_SUM + :scoreDelta) / (REVIEW_COUNT + :countDelta) END
+  WHERE ID = :gameId
+`;
+
+/**
+ * @summary Apply the change of a review to the running score sum and review count of its game,
+ *          recompute the aggregate score and commit the transaction which changed the review
+ * @function
+ * @param {object} connection Oracle connection of the transaction which changed the review
+ * @param {string} gameId Unique game ID
+ * @param {number} scoreDelta Change of the sum of the review scores
+ * @param {number} countDelta Change of the number of reviews
+ * @param {boolean} [autoCommit] Whether to commit the transaction. The caller commits it otherwise.
+ * @returns {Promise<object>} Promise object represents the result of the update
+ */
+const applyReviewScore = async (connection, gameId, scoreDelta, countDelta, autoCommit = true) => {
+  const sqlParams = { gameId, scoreDelta, countDelta };
+  const response = await connection.execute(gameScoreQuery, sqlParams, { autoCommit });
+  gameCache.invalidate(String(gameId));
+  invalidateGameStats(gameId);
+
+  return response;
+};
+
+/**
+ * @summary Apply the changes of a batch of reviews to the scores of their games with a single
+ *          batch and commit the transaction which changed the reviews
+ * @function
+ * @param {object} connection Oracle connection of the transaction which changed the reviews
+ * @param {object[]} scoreDeltas gameId, scoreDelta and countDelta of each game. There should be
+ *                               at most one entry per game.
+ * @returns {Promise<object>} Promise object represents the result of the batch
+ */
+const applyReviewScores = async (connection, scoreDeltas) => {
+  if (_.isEmpty(scoreDeltas)) {
+    return undefined;
+  }
+  const bindDefs = {
+    gameId: { type: oracledb.NUMBER },
+    scoreDelta: { type: oracledb.NUMBER },
+    countDelta: { type: oracledb.NUMBER },
+  };
+  const response = await connection.executeMany(
+    gameScoreQuery,
+    scoreDeltas,
+    { bindDefs, autoCommit: true },
+  );
+  _.forEach(scoreDeltas, ({ gameId }) => {
+    gameCache.invalidate(String(gameId));
+    invalidateGameStats(gameId);
+  });
+
+  return response;
+};
+
+/**
+ * @summary Recompute the score sum, review count and aggregate score of every game from its reviews
+ * @function
+ * @returns {Promise<number>} Promise object represents the number of games updated
  */
-const isValidDeveloper = async (developerId) => {
-  const sqlParams = { id: developerId };
+const rebuildGameScores = async () => {
   const sqlQuery = `
-    SELECT COUNT(ID) AS "id"
-    FROM DEVELOPERS
-    WHERE ID = :id
+    MERGE INTO VIDEO_GAMES g
+    USING (
+      SELECT VIDEO_GAMES.ID AS ID,
+      NVL(SUM(REVIEWS.SCORE), 0) AS SCORE_SUM,
+      COUNT(REVIEWS.ID) AS REVIEW_COUNT
+      FROM VIDEO_GAMES
+      LEFT JOIN REVIEWS ON REVIEWS.GAME_ID = VIDEO_GAMES.ID
+      GROUP BY VIDEO_GAMES.ID
+    ) s
+    ON (g.ID = s.ID)
+    WHEN MATCHED THEN UPDATE SET g.SCORE_SUM = s.SCORE_SUM,
+    g.REVIEW_COUNT = s.REVIEW_COUNT,
+    g.SCORE = CASE WHEN s.REVIEW_COUNT = 0 THEN NULL ELSE s.SCORE_SUM / s.REVIEW_COUNT END
   `;
 
   const connection = await conn.getConnection();
   try {
-    const response = await connection.execute(sqlQuery, sqlParams);
-    return response.rows[0].id > 0;
+    const { rowsAffected } = await connection.execute(sqlQuery, {}, { autoCommit: true });
+    return rowsAffected;
   } finally {
     connection.close();
   }
 };
 
-module.exports = {
-  getGames,
+module.exports = instrumentDao('games', {
+  getGames: singleFlight('games', getGames),
+  streamGames,
   getGameById,
   postGame,
-  isValidDeveloper,
+  postGames,
   deleteGame,
   patchGame,
-};
+  patchGames,
+  applyReviewScore,
+  applyReviewScores,
+  rebuildGameScores,
+});
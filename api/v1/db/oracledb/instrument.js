@@ -0,0 +1,55 @@
+const appRoot = require('app-root-path');
+const { AsyncLocalStorage } = require('async_hooks');
+const _ = require('lodash');
+
+const { createHistogram, startTimer } = appRoot.require('utils/histogram');
+const { registerMetrics } = appRoot.require('utils/metrics');
+const { recordStage } = appRoot.require('utils/request-timing');
+
+/**
+ * Statement latency histogram of the DAO function which the current code runs for. A DAO function
+ * called by another one, such as applyReviewScore called by postReview, runs with its own
+ * histogram.
+ */
+const daoStorage = new AsyncLocalStorage();
+
+/**
+ * Instrument every function of a DAO. The statements each function executes are timed into a
+ * latency histogram of the function in the admin metrics, so cache hits and calls which wait for
+ * the query of another call are not counted. The whole call is timed as the "dao" stage of the
+ * current request.
+ *
+ * @param {string} daoName Name of the DAO in the metrics document
+ * @param {object} functions Async DAO functions keyed by name
+ * @returns {object} Instrumented DAO functions keyed by name
+ */
+const instrumentDao = (daoName, functions) => _.mapValues(functions, (fn, name) => {
+  const latency = createHistogram();
+  registerMetrics(`dao.${daoName}.${name}`, latency.snapshot);
+
+  return async (...args) => {
+    const elapsed = startTimer();
+    try {
+      return await daoStorage.run(latency, () => fn(...args));
+    } finally {
+      recordStage('dao', elapsed());
+    }
+  };
+});
+
+/**
+ * Start timing a statement of the current DAO function
+ *
+ * @returns {Function} Function which records the latency of the statement once it is done.
+ *                     Statements outside of a DAO function are not recorded.
+ */
+const startStatementTimer = () => {
+  const latency = daoStorage.getStore();
+  if (!latency) {
+    return _.noop;
+  }
+  const elapsed = startTimer();
+  return () => latency.observe(elapsed());
+};
+
+module.exports = { instrumentDao, startStatementTimer };
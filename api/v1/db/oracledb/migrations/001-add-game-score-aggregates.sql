@@ -0,0 +1,10 @@
+-- Adds the running score sum and review count of each game to a database created by an earlier
+-- setupDB.sql. Run it before deploying the API which maintains them, then backfill them from the
+-- existing reviews with `npm run rebuild-scores`.
+ALTER TABLE VIDEO_GAMES ADD (
+  SCORE_SUM NUMBER DEFAULT 0 NOT NULL,
+  REVIEW_COUNT NUMBER DEFAULT 0 NOT NULL
+);
+
+COMMENT ON COLUMN VIDEO_GAMES.SCORE_SUM IS 'Running sum of the scores of the reviews of this game';
+COMMENT ON COLUMN VIDEO_GAMES.REVIEW_COUNT IS 'Running number of reviews of this game';
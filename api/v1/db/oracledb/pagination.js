@@ -0,0 +1,157 @@
+const appRoot = require('app-root-path');
+const _ = require('lodash');
+
+const { encodeCursor, decodeCursor } = appRoot.require('utils/paginator');
+
+/**
+ * Build the ORDER BY clause of a wrapped query. Rows are always ordered by "id" last so that the
+ * order is total and stable between pages.
+ *
+ * @param {object} [sortKey] Sort key definition
+ * @returns {string} ORDER BY clause
+ */
+const orderByClause = sortKey => (
+  sortKey ? `ORDER BY ${sortKey.expression}, q."id"` : 'ORDER BY q."id"'
+);
+
+/**
+ * Wrap a query so that Oracle only returns a single page of rows. The total number of rows matched
+ * by the unpaginated query is returned as the "totalResults" column of every row.
+ *
+ * @param {string} sqlQuery SQL query which selects an "id" column
+ * @param {object} [sortKey] Sort key definition
+ * @returns {string} Paginated SQL query
+ */
+const paginatedQuery = (sqlQuery, sortKey) => `
+  SELECT q.*, COUNT(*) OVER () AS "totalResults"
+  FROM (${sqlQuery}) q
+  ${orderByClause(sortKey)}
+  OFFSET :pageOffset ROWS FETCH NEXT :pageSize ROWS ONLY
+`;
+
+/**
+ * Wrap a query so that Oracle seeks directly past the row identified by a cursor instead of
+ * skipping over every row of the preceding pages
+ *
+ * @param {string} sqlQuery SQL query which selects an "id" column
+ * @param {object} [sortKey] Sort key definition
+ * @param {boolean} hasCursor Whether the query should seek past a cursor
+ * @returns {string} Keyset paginated SQL query
+ */
+const keysetQuery = (sqlQuery, sortKey, hasCursor) => {
+  let seekClause = '';
+  if (hasCursor) {
+    seekClause = sortKey
+      ? `WHERE ${sortKey.expression} > ${sortKey.fromCursor}
+        OR (${sortKey.expression} = ${sortKey.fromCursor} AND q."id" > :afterId)`
+      : 'WHERE q."id" > :afterId';
+  }
+  return `
+    SELECT q.*${sortKey ? `, ${sortKey.toCursor} AS "cursorValue"` : ''}
+    FROM (${sqlQuery}) q
+    ${seekClause}
+    ${orderByClause(sortKey)}
+    FETCH FIRST :pageSize ROWS ONLY
+  `;
+};
+
+/**
+ * Wrap a query so that Oracle only returns the number of rows it matches
+ *
+ * @param {string} sqlQuery SQL query
+ * @returns {string} Count SQL query
+ */
+const countQuery = sqlQuery => `SELECT COUNT(*) AS "totalResults" FROM (${sqlQuery})`;
+
+/**
+ * Fetch the page of rows following the page[after] cursor. One extra row is fetched to find out
+ * whether there is a next page.
+ *
+ * @param {object} connection Oracle connection
+ * @param {string} sqlQuery SQL query which selects an "id" column
+ * @param {object} sqlParams Bind parameters of the SQL query
+ * @param {object} queries Query parameters
+ * @param {object} sortKeys Sort key definitions of the resource keyed by sort parameter value
+ * @returns {Promise<object>} Promise object represents the fetched rows and the next cursor
+ */
+const executeKeyset = async (connection, sqlQuery, sqlParams, queries, sortKeys) => {
+  const pageSize = parseInt(queries['page[size]'], 10);
+  const sort = queries.sort || 'id';
+  const sortKey = sortKeys[sort];
+  const cursor = queries['page[after]'] ? decodeCursor(queries['page[after]']) : null;
+
+  const keysetParams = Object.assign({}, sqlParams, { pageSize: pageSize + 1 });
+  if (cursor) {
+    keysetParams.afterId = cursor.id;
+    if (sortKey) {
+      keysetParams.afterValue = cursor.value;
+    }
+  }
+  const { rows } = await connection.execute(
+    keysetQuery(sqlQuery, sortKey, !!cursor),
+    keysetParams,
+  );
+
+  const hasNextPage = rows.length > pageSize;
+  if (hasNextPage) {
+    rows.pop();
+  }
+  const lastRow = _.last(rows);
+  const nextCursor = hasNextPage
+    ? encodeCursor(sort, sortKey ? lastRow.cursorValue : null, lastRow.id)
+    : null;
+  if (sortKey) {
+    _.forEach(rows, (row) => {
+      delete row.cursorValue;
+    });
+  }
+  return { rows, pageResult: { nextCursor } };
+};
+
+/**
+ * Execute a query and fetch only the page of rows requested by the page[size] and page[number]
+ * query parameters, or by page[size] and page[after] if cursor pagination is requested. If
+ * page[size] is not set, every row is fetched.
+ *
+ * @param {object} connection Oracle connection
+ * @param {string} sqlQuery SQL query which selects an "id" column
+ * @param {object} sqlParams Bind parameters of the SQL query
+ * @param {object} queries Query parameters
+ * @param {object} [sortKeys] Sort key definitions of the resource keyed by sort parameter value.
+ *                            Each definition contains the SQL expression to order by in terms of
+ *                            the wrapped query alias "q", the expression that converts it to a
+ *                            cursor value and the expression that converts :afterValue back.
+ * @returns {Promise<object>} Promise object represents the fetched rows and the page result which
+ *                            is undefined if the rows are not paginated
+ */
+const executePaginated = async (connection, sqlQuery, sqlParams, queries, sortKeys = {}) => {
+  const pageSize = parseInt(queries['page[size]'], 10);
+  if (!pageSize) {
+    const { rows } = await connection.execute(sqlQuery, sqlParams);
+    return { rows, pageResult: undefined };
+  }
+  if (queries['page[after]'] !== undefined) {
+    return executeKeyset(connection, sqlQuery, sqlParams, queries, sortKeys);
+  }
+
+  const sortKey = sortKeys[queries.sort];
+  const pageNumber = parseInt(queries['page[number]'], 10) || 1;
+  const pageOffset = (pageNumber - 1) * pageSize;
+  const pageParams = Object.assign({}, sqlParams, { pageOffset, pageSize });
+  const { rows } = await connection.execute(paginatedQuery(sqlQuery, sortKey), pageParams);
+
+  let totalResults = 0;
+  if (!_.isEmpty(rows)) {
+    totalResults = parseInt(rows[0].totalResults, 10);
+    _.forEach(rows, (row) => {
+      delete row.totalResults;
+    });
+  } else if (pageOffset > 0) {
+    // The requested page is out of bounds, so the window count is not available
+    const countResult = await connection.execute(countQuery(sqlQuery), sqlParams);
+    totalResults = parseInt(countResult.rows[0].totalResults, 10);
+  }
+  return { rows, pageResult: { totalResults } };
+};
+
+module.exports = { executePaginated, orderByClause };
@@ -0,0 +1,141 @@
+const _ = require('lodash');
+
+/**
+ * Sizes of the bind lists of IN conditions. Lists are padded to the next size so that lists of any
+ * length share a handful of statement texts, and Oracle allows at most 1000 values in a list.
+ */
+const bindListSizes = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1000];
+
+/**
+ * Build the select list of a query from the columns of the requested fields. The "id" column is
+ * always selected and the columns keep the order they are defined in.
+ *
+ * @param {object} columns Column expressions keyed by field name
+ * @param {string[]} [fields] Names of the fields to select. Every column is selected if omitted.
+ * @returns {string} Comma separated column expressions aliased by their field names
+ */
+const selectList = (columns, fields) => {
+  const selectedFields = _.filter(_.keys(columns), field => (
+    !fields || field === 'id' || _.includes(fields, field)
+  ));
+  return _.map(selectedFields, field => `${columns[field]} AS "${field}"`).join(', ');
+};
+
+/**
+ * Add the fields a query depends on, such as its sort key, to a sparse fieldset
+ *
+ * @param {string[]} [fields] Requested fields. Every field is selected if omitted.
+ * @param {...string} dependencies Fields the query depends on. Undefined fields are ignored.
+ * @returns {string[]} Fields to select
+ */
+const requiredFields = (fields, ...dependencies) => (
+  fields ? _.compact(_.concat(fields, dependencies)) : undefined
+);
+
+/**
+ * Build the bind variables of an IN condition so that every value is bound rather than
+ * concatenated into the SQL text. The list is padded with its last value up to the next bind list
+ * size, which does not change the rows the condition matches.
+ *
+ * @param {string} name Prefix of the bind variable names
+ * @param {Array} values Values to bind. At most 1000 values can be bound.
+ * @returns {object} Comma separated bind variables and their bind parameters
+ */
+const bindList = (name, values) => {
+  if (values.length > _.last(bindListSizes)) {
+    throw new Error(`Cannot bind more than ${_.last(bindListSizes)} values in a list.`);
+  }
+  const size = _.find(bindListSizes, bindListSize => bindListSize >= values.length);
+  const paddedValues = _.concat(values, _.fill(Array(size - values.length), _.last(values)));
+
+  const sqlParams = {};
+  const binds = _.map(paddedValues, (value, index) => {
+    sqlParams[`${name}${index}`] = value;
+    return `:${name}${index}`;
+  });
+  return { sqlList: binds.join(', '), sqlParams };
+};
+
+/**
+ * Build a WHERE clause from the conditions of the filters which are set. Conditions are always
+ * joined in the order they are defined in, so the same filters always produce the same statement
+ * text and the number of distinct statements stays bounded.
+ *
+ * @param {object} conditions SQL conditions keyed by filter name
+ * @param {object} filters Filter values keyed by filter name
+ * @returns {string} WHERE clause or an empty string if no filter is set
+ */
+const whereClause = (conditions, filters) => {
+  const usedConditions = _.filter(conditions, (condition, filter) => !_.isNil(filters[filter]));
+  return _.isEmpty(usedConditions) ? '' : `WHERE ${usedConditions.join(' AND ')}`;
+};
+
+/**
+ * Build the conditions of the text search on a column. An exact match is looked up through the
+ * index on UPPER(column) and then compared exactly. The [prefix] and [contains] modes are case
+ * insensitive, and [prefix] seeks the index on UPPER(column).
+ *
+ * @param {string} field Name of the query parameter
+ * @param {string} column Column to search
+ * @returns {object} SQL conditions keyed by bind parameter name
+ */
+const searchConditions = (field, column) => ({
+  [field]: `UPPER(${column}) = UPPER(:${field}) AND ${column} = :${field}`,
+  [`${field}Prefix`]: `UPPER(${column}) LIKE :${field}Prefix ESCAPE '\\'`,
+  [`${field}Contains`]: `UPPER(${column}) LIKE :${field}Contains ESCAPE '\\'`,
+});
+
+/**
+ * Build the bind parameters of the text search on a column from the query parameters
+ *
+ * @param {string} field Name of the query parameter
+ * @param {object} queries Query parameters
+ * @returns {object} Bind parameters of the search modes which are requested
+ */
+const searchParams = (field, queries) => {
+  // escape the wildcards of LIKE so that they are matched literally
+  const escape = value => value.toUpperCase().replace(/[\\%_]/g, '\\$&');
+  const patterns = {
+    [field]: queries[field],
+    [`${field}Prefix`]: queries[`${field}[prefix]`] && `${escape(queries[`${field}[prefix]`])}%`,
+    [`${field}Contains`]: queries[`${field}[contains]`]
+      && `%${escape(queries[`${field}[contains]`])}%`,
+  };
+  return _.pickBy(patterns);
+};
+
+/**
+ * Build the conditions of the [gte] and [lt] date range filters on a column. The range is half
+ * open and compares the column itself, so it seeks the index on the column.
+ *
+ * @param {string} field Name of the query parameter
+ * @param {string} column Date column
+ * @returns {object} SQL conditions keyed by bind parameter name
+ */
+const rangeConditions = (field, column) => ({
+  [`${field}Gte`]: `${column} >= TO_DATE(:${field}Gte, 'YYYY-MM-DD')`,
+  [`${field}Lt`]: `${column} < TO_DATE(:${field}Lt, 'YYYY-MM-DD')`,
+});
+
+/**
+ * Build the bind parameters of the date range filters on a column from the query parameters
+ *
+ * @param {string} field Name of the query parameter
+ * @param {object} queries Query parameters
+ * @returns {object} Bind parameters of the bounds which are requested
+ */
+const rangeParams = (field, queries) => _.pickBy({
+  [`${field}Gte`]: queries[`${field}[gte]`],
+  [`${field}Lt`]: queries[`${field}[lt]`],
+});
+
+module.exports = {
+  selectList,
+  requiredFields,
+  bindList,
+  whereClause,
+  searchConditions,
+  searchParams,
+  rangeConditions,
+  rangeParams,
+};
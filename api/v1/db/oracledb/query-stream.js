@@ -0,0 +1,30 @@
+const appRoot = require('app-root-path');
+
+const { orderByClause } = appRoot.require('api/v1/db/oracledb/pagination');
+const { logger } = appRoot.require('utils/logger');
+
+/**
+ * Stream the rows of a query ordered by a sort key and "id". Rows are fetched from Oracle in
+ * batches as the stream is consumed, so only a bounded number of rows is held in memory. The
+ * connection is closed once the stream is closed, either after the last row or when the stream is
+ * destroyed.
+ *
+ * @param {object} connection Oracle connection
+ * @param {string} sqlQuery SQL query which selects an "id" column
+ * @param {object} sqlParams Bind parameters of the SQL query
+ * @param {object} [sortKey] Sort key definition
+ * @returns {stream.Readable} Object mode stream of rows
+ */
+const streamQuery = (connection, sqlQuery, sqlParams, sortKey) => {
+  const rowStream = connection.queryStream(
+    `SELECT q.* FROM (${sqlQuery}) q ${orderByClause(sortKey)}`,
+    sqlParams,
+    { fetchArraySize: 500 },
+  );
+  rowStream.on('close', () => {
+    connection.close().catch(err => logger.error(err));
+  });
+  return rowStream;
+};
+
+module.exports = { streamQuery };
@@ -0,0 +1,16 @@
+const appRoot = require('app-root-path');
+
+const { rebuildGameScores } = appRoot.require('api/v1/db/oracledb/games-dao');
+const { logger } = appRoot.require('utils/logger');
+
+/**
+ * Recompute the aggregate score of every game from its reviews. The API keeps the scores up to
+ * date as reviews change, so this is only needed after reviews are changed outside of the API.
+ */
+rebuildGameScores().then((gameCount) => {
+  logger.info(`Rebuilt the scores of ${gameCount} games`);
+  process.exit(0);
+}).catch((err) => {
+  logger.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,42 @@
+const _ = require('lodash');
+const oracledb = require('oracledb');
+
+/**
+ * Out bind definitions of column types. Numbers are returned as strings, the same way queries
+ * fetch them, so returned rows serialize like selected rows.
+ */
+const outBindTypes = {
+  number: { type: oracledb.STRING, maxSize: 40 },
+  string: { type: oracledb.STRING, maxSize: 4000 },
+  date: { type: oracledb.DATE },
+};
+
+/**
+ * Build a RETURNING INTO clause which returns every column of the changed row, so the row does not
+ * have to be selected again after an INSERT or UPDATE
+ *
+ * @param {object} columns Column expressions keyed by field name
+ * @param {object} columnTypes Column types keyed by field name
+ * @returns {object} SQL clause, its out bind parameters and a function which maps the out binds of
+ *                   a single row statement to the row. The row is undefined if no row changed.
+ */
+const returningRow = (columns, columnTypes) => {
+  const fields = _.keys(columns);
+  const bindName = field => `out${_.upperFirst(field)}`;
+
+  const sqlClause = `
+    RETURNING ${_.map(fields, field => columns[field]).join(', ')}
+    INTO ${_.map(fields, field => `:${bindName(field)}`).join(', ')}
+  `;
+  const sqlParams = _.zipObject(
+    _.map(fields, bindName),
+    _.map(fields, field => _.assign({ dir: oracledb.BIND_OUT }, outBindTypes[columnTypes[field]])),
+  );
+  const toRow = outBinds => (_.isEmpty(_.get(outBinds, bindName('id')))
+    ? undefined
+    : _.zipObject(fields, _.map(fields, field => _.get(outBinds, [bindName(field), 0]))));
+
+  return { sqlClause, sqlParams, toRow };
+};
+
+module.exports = { returningRow };
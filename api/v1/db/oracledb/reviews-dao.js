@@ -1,79 +1,201 @@
 const appRoot = require('app-root-path');
 const _ = require('lodash');
 const oracledb = require('oracledb');
+const { pipeline } = require('stream');
 
-const { serializeReview, serializeReviews } = require('../../serializers/reviews-serializer');
+const {
+  serializeReview,
+  serializeReviews,
+  serializeReviewsStream,
+  serializeReviewResults,
+} = require('../../serializers/reviews-serializer');
 
+const { existingIds, failedOffsets } = appRoot.require('api/v1/db/oracledb/bulk');
+const { reviewColumns, reviewColumnTypes } = appRoot.require('api/v1/db/oracledb/columns');
 const conn = appRoot.require('api/v1/db/oracledb/connection');
-const { openapi } = appRoot.require('utils/load-openapi');
+const { applyReviewScore, applyReviewScores } = appRoot.require('api/v1/db/oracledb/games-dao');
+const { instrumentDao } = appRoot.require('api/v1/db/oracledb/instrument');
+const { executePaginated } = appRoot.require('api/v1/db/oracledb/pagination');
+const {
+  selectList,
+  requiredFields,
+  bindList,
+  whereClause,
+  searchConditions,
+  searchParams,
+  rangeConditions,
+  rangeParams,
+} = appRoot.require('api/v1/db/oracledb/query-builder');
+const { streamQuery } = appRoot.require('api/v1/db/oracledb/query-stream');
+const { returningRow } = appRoot.require('api/v1/db/oracledb/returning');
+const { withConnection } = appRoot.require('api/v1/db/oracledb/with-connection');
+const { createCache } = appRoot.require('utils/cache');
+const { singleFlight } = appRoot.require('utils/single-flight');
+const { parameterNames } = appRoot.require('utils/load-openapi');
+
+/** Serialized reviews keyed by ID */
+const reviewCache = createCache('reviews');
+
+/** RETURNING clause which returns every column of an inserted or updated review */
+const reviewReturning = returningRow(reviewColumns, reviewColumnTypes);
+
+/** Sort keys of reviews in terms of the wrapped query alias "q" */
+const reviewSortKeys = {
+  score: {
+    expression: 'q."score"',
+    toCursor: 'TO_CHAR(q."score")',
+    fromCursor: 'TO_NUMBER(:afterValue)',
+  },
+  reviewDate: {
+    expression: 'q."reviewDate"',
+    toCursor: 'TO_CHAR(q."reviewDate", \'YYYY-MM-DD HH24:MI:SS\')',
+    fromCursor: 'TO_DATE(:afterValue, \'YYYY-MM-DD HH24:MI:SS\')',
+  },
+};
 
 /**
- * @summary Return a list of reviews
+ * @summary Select the columns of the requested reviews fields along with the column of the sort key
  * @function
- * @returns {Promise<object[]>} Promise object represents a list of reviews
+ * @param {object} queries Query parameters
+ * @returns {string} Select list of reviews
  */
-const getReviews = async (queries) => {
-  // get parameters accepted by this endpoint in openapi
-  // filter params that should not be included in query
-  // gameIds is special since the values are parsed directly into the query string
-  const paramsToFilter = ['page[size]', 'page[number]', 'gameIds'];
-  const acceptedParams = openapi.paths['/reviews'].get.parameters.map(x => x.name).filter(param => !paramsToFilter.includes(param));
+const reviewsSelectList = queries => selectList(
+  reviewColumns,
+  requiredFields(queries['fields[review]'], queries.sort),
+);
+
+/**
+ * Conditions of the filters of reviews keyed by bind parameter. reviewDate is compared as the
+ * range of its day rather than with TRUNC(REVIEW_DATE) so that the filter uses the index on
+ * REVIEW_DATE.
+ */
+const reviewFilters = _.assign(
+  searchConditions('reviewer', 'REVIEWER'),
+  {
+    scoreMin: 'SCORE >= :scoreMin',
+    scoreMax: 'SCORE <= :scoreMax',
+    reviewDate: `REVIEW_DATE >= TO_DATE(:reviewDate, 'YYYY-MM-DD')
+      AND REVIEW_DATE < TO_DATE(:reviewDate, 'YYYY-MM-DD') + 1`,
+  },
+  rangeConditions('reviewDate', 'REVIEW_DATE'),
+);
+
+/**
+ * Parameters of GET /reviews which are not bound to the query as they are. gameIds is special
+ * since it is bound as a list.
+ */
+const paramsToFilter = [
+  'page[size]',
+  'page[number]',
+  'page[after]',
+  'sort',
+  'fields[review]',
+  'gameIds',
+  'reviewer',
+  'reviewer[prefix]',
+  'reviewer[contains]',
+  'reviewDate[gte]',
+  'reviewDate[lt]',
+];
 
-  // pick parameters specified in openapi (getReviewsParameters) from passed in queries list
-  const sqlParams = _.pick(queries, acceptedParams);
+/** Parameters of GET /reviews in openapi which are bound to the query as they are */
+const acceptedParams = _.difference(parameterNames['/reviews'].get, paramsToFilter);
+
+/**
+ * @summary Build the query which selects the reviews matching the query parameters
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {object} SQL query and its bind parameters
+ */
+const reviewsQuery = (queries) => {
+  const conditions = _.clone(reviewFilters);
+  let gameIdParams = {};
+  if (!_.isEmpty(queries.gameIds)) {
+    const gameIdList = bindList('gameId', queries.gameIds);
+    conditions.gameIds = `GAME_ID IN (${gameIdList.sqlList})`;
+    gameIdParams = gameIdList.sqlParams;
+  }
+
+  // pick parameters specified in openapi (acceptedParams) from passed in queries list
+  const sqlParams = _.assign(
+    _.pick(queries, acceptedParams),
+    searchParams('reviewer', queries),
+    rangeParams('reviewDate', queries),
+  );
 
   // construct query
   const sqlQuery = `
-    SELECT ID AS "id",
-    REVIEWER AS "reviewer",
-    GAME_ID AS "gameId",
-    SCORE AS "score",
-    REVIEW_TEXT AS "reviewText",
-    REVIEW_DATE AS "reviewDate"
+    SELECT ${reviewsSelectList(queries)}
     FROM REVIEWS
-    WHERE 1=1
-    ${sqlParams.reviewer ? 'AND REVIEWER = :reviewer' : ''}
-    ${queries.gameIds ? `AND GAME_ID IN (${queries.gameIds})` : ''}
-    ${sqlParams.scoreMin ? 'AND SCORE >= :scoreMin' : ''}
-    ${sqlParams.scoreMax ? 'AND SCORE <= :scoreMax' : ''}
-    ${sqlParams.reviewDate ? 'AND TRUNC(REVIEW_DATE) = TO_DATE(:reviewDate, \'YYYY-MM-DD\')' : ''}
+    ${whereClause(conditions, _.assign({ gameIds: queries.gameIds }, sqlParams))}
   `;
+  _.assign(sqlParams, gameIdParams);
+  return { sqlQuery, sqlParams };
+};
+
+/**
+ * @summary Return a list of reviews
+ * @function
+ * @returns {Promise<object[]>} Promise object represents a list of reviews
+ */
+const getReviews = async (queries) => {
+  const { sqlQuery, sqlParams } = reviewsQuery(queries);
 
   const connection = await conn.getConnection();
   try {
     // execute query and return results
-    const { rows } = await connection.execute(sqlQuery, sqlParams);
-    const serializedReviews = serializeReviews(rows, queries);
+    const { rows, pageResult } = await executePaginated(
+      connection, sqlQuery, sqlParams, queries, reviewSortKeys,
+    );
+    const serializedReviews = serializeReviews(rows, queries, pageResult);
     return serializedReviews;
   } finally {
     connection.close();
   }
 };
 
+/**
+ * @summary Return every review as a stream of the serialized document
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {Promise<stream.Readable>} Promise object represents a stream of the serialized reviews
+ */
+const streamReviews = async (queries) => {
+  const { sqlQuery, sqlParams } = reviewsQuery(queries);
+
+  const connection = await conn.getConnection();
+  const rowStream = streamQuery(connection, sqlQuery, sqlParams, reviewSortKeys[queries.sort]);
+  return pipeline(rowStream, serializeReviewsStream(queries), _.noop);
+};
+
 /**
  * @summary Return a specific review by unique ID
  * @function
  * @param {string} id Unique review ID
+ * @param {object} [queries] Query parameters. Only complete reviews are cached.
+ * @param {object} [transaction] Connection of the caller. Reads on it may see its uncommitted
+ *                               changes so they are not cached.
  * @returns {Promise<object>} Promise object represents a specific review or return undefined if
  *                            term is not found
  */
-const getReviewById = async (id) => {
+const getReviewById = async (id, queries = {}, transaction) => {
+  const isCacheable = !transaction && !queries['fields[review]'];
+  const cachedReview = isCacheable && reviewCache.get(String(id));
+  if (cachedReview) {
+    return cachedReview;
+  }
+  const generation = reviewCache.generation();
+
   const sqlParams = {
     reviewId: id,
   };
   const sqlQuery = `
-    SELECT ID AS "id",
-    REVIEWER AS "reviewer",
-    GAME_ID AS "gameId",
-    SCORE AS "score",
-    REVIEW_TEXT AS "reviewText",
-    REVIEW_DATE AS "reviewDate"
+    SELECT ${reviewsSelectList(queries)}
     FROM REVIEWS
     WHERE ID = :reviewId
   `;
 
-  const connection = await conn.getConnection();
-  try {
+  return withConnection(transaction, async (connection) => {
     const { rows } = await connection.execute(sqlQuery, sqlParams);
 
     if (rows.length > 1) {
@@ -81,114 +203,402 @@ const getReviewById = async (id) => {
     } else if (_.isEmpty(rows)) {
       return undefined;
     } else {
-      const serializedReview = serializeReview(rows[0]);
+      const serializedReview = serializeReview(rows[0], queries);
+      if (isCacheable) {
+        reviewCache.set(String(id), serializedReview, generation);
+      }
       return serializedReview;
     }
-  } finally {
-    connection.close();
-  }
+  });
 };
 
 /**
- * @summary Create review record
+ * @summary Create review record. A gameId which does not exist is rejected by the foreign key
+ *          constraint with ORA-02291.
+ * @function
+ * @param {object} body Request body
+ * @param {object} [transaction] Connection of the caller. The insert is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the serialized review which was created
  */
-const postReview = async (body) => {
+const postReview = async (body, transaction) => {
   const { attributes } = body.data;
-  attributes.outId = { type: oracledb.NUMBER, dir: oracledb.BIND_OUT };
+  const { sqlClause, sqlParams, toRow } = reviewReturning;
+  const sqlQuery = `
+    INSERT INTO REVIEWS
+    (REVIEWER, REVIEW_TEXT, SCORE, GAME_ID)
+    VALUES (:reviewer, :reviewText, :score, :gameId)
+    ${sqlClause}
+  `;
+
+  return withConnection(transaction, async (connection) => {
+    // the review is committed together with the score of its game
+    const { outBinds } = await connection.execute(sqlQuery, _.assign({}, attributes, sqlParams));
+    const rawReview = toRow(outBinds);
+    await applyReviewScore(connection, attributes.gameId, attributes.score, 1, !transaction);
+    reviewCache.invalidate(String(rawReview.id));
+
+    return serializeReview(rawReview);
+  });
+};
+
+/**
+ * @summary Sum the scores and count the reviews of each game
+ * @function
+ * @param {object[]} reviews Reviews with gameId and score
+ * @param {number} sign 1 if the reviews are added or -1 if they are removed
+ * @returns {object[]} gameId, scoreDelta and countDelta of each game
+ */
+const reviewScoreDeltas = (reviews, sign) => _.map(
+  _.groupBy(reviews, ({ gameId }) => String(gameId)),
+  (gameReviews, gameId) => ({
+    gameId: Number(gameId),
+    scoreDelta: sign * _.sumBy(gameReviews, ({ score }) => Number(score)),
+    countDelta: sign * gameReviews.length,
+  }),
+);
+
+/**
+ * @summary Create review records in bulk. Reviews of games that do not exist are rejected and the
+ *          others are inserted by a single batch and committed together with the scores of their
+ *          games.
+ * @function
+ * @param {object[]} reviews Review resources of the request body
+ * @returns {Promise<object>} Promise object represents the serialized result of each review
+ */
+const postReviews = async (reviews) => {
+  const gameIds = _.uniq(_.map(reviews, ({ attributes }) => String(attributes.gameId)));
   const sqlQuery = `
     INSERT INTO REVIEWS
     (REVIEWER, REVIEW_TEXT, SCORE, GAME_ID)
     VALUES (:reviewer, :reviewText, :score, :gameId)
     RETURNING ID INTO :outId
   `;
+  const bindDefs = {
+    reviewer: { type: oracledb.STRING, maxSize: 255 },
+    reviewText: { type: oracledb.STRING, maxSize: 255 },
+    score: { type: oracledb.NUMBER },
+    gameId: { type: oracledb.NUMBER },
+    outId: { type: oracledb.NUMBER, dir: oracledb.BIND_OUT },
+  };
 
   const connection = await conn.getConnection();
   try {
-    const rawReviews = await connection.execute(sqlQuery, attributes, { autoCommit: true });
-    const result = await getReviewById(rawReviews.outBinds.outId[0]);
-    return result;
+    const validGameIds = await existingIds(connection, 'VIDEO_GAMES', gameIds);
+    const results = [];
+    const rows = [];
+    _.forEach(reviews, ({ attributes }, index) => {
+      if (validGameIds.has(String(attributes.gameId))) {
+        rows.push({ index, attributes });
+      } else {
+        results[index] = { index, status: '400', detail: 'A game with gameId does not exist.' };
+      }
+    });
+
+    if (!_.isEmpty(rows)) {
+      const binds = _.map(rows, ({
+        attributes: {
+          reviewer,
+          reviewText,
+          score,
+          gameId,
+        },
+      }) => ({
+        reviewer,
+        reviewText,
+        score,
+        gameId: Number(gameId),
+      }));
+      const result = await connection.executeMany(
+        sqlQuery,
+        binds,
+        { bindDefs, batchErrors: true },
+      );
+
+      const failed = failedOffsets(result);
+      const inserted = [];
+      _.forEach(rows, ({ index, attributes }, offset) => {
+        if (failed.has(offset)) {
+          results[index] = { index, status: '400', detail: 'The review could not be created.' };
+        } else {
+          results[index] = { index, status: '201', id: String(result.outBinds[offset].outId[0]) };
+          inserted.push(attributes);
+        }
+      });
+      // commits the inserted reviews together with the scores of their games
+      await applyReviewScores(connection, reviewScoreDeltas(inserted, 1));
+    }
+    return serializeReviewResults(results);
   } finally {
     connection.close();
   }
 };
 
 /**
- * @summary Delete review record
+ * @summary Delete review records in bulk with a single batch. The deletions are committed together
+ *          with the scores of the games of the reviews.
+ * @function
+ * @param {string[]} ids Unique review IDs
+ * @returns {Promise<object>} Promise object represents the serialized result of each deletion
  */
-const deleteReview = async (reviewId) => {
-  const sqlParams = { id: reviewId };
-  const sqlQuery = 'DELETE FROM REVIEWS WHERE ID = :id';
+const deleteReviews = async (ids) => {
+  const sqlQuery = `
+    DELETE FROM REVIEWS
+    WHERE ID = :id
+    RETURNING GAME_ID, SCORE INTO :gameId, :score
+  `;
+  const bindDefs = {
+    id: { type: oracledb.NUMBER },
+    gameId: { type: oracledb.NUMBER, dir: oracledb.BIND_OUT },
+    score: { type: oracledb.NUMBER, dir: oracledb.BIND_OUT },
+  };
+  const binds = _.map(ids, id => ({ id: Number(id) }));
 
   const connection = await conn.getConnection();
   try {
-    const response = await connection.execute(sqlQuery, sqlParams, { autoCommit: true });
-    return response;
+    const result = await connection.executeMany(
+      sqlQuery,
+      binds,
+      { bindDefs, dmlRowCounts: true },
+    );
+
+    const deleted = [];
+    const results = _.map(ids, (id, index) => {
+      if (result.dmlRowCounts[index] < 1) {
+        return {
+          index,
+          status: '404',
+          id: String(id),
+          detail: 'A review with the specified ID was not found.',
+        };
+      }
+      const { gameId: [gameId], score: [score] } = result.outBinds[index];
+      deleted.push({ gameId, score });
+      return { index, status: '204', id: String(id) };
+    });
+    // commits the deletions together with the scores of the games of the reviews
+    await applyReviewScores(connection, reviewScoreDeltas(deleted, -1));
+    _.forEach(ids, id => reviewCache.invalidate(String(id)));
+
+    return serializeReviewResults(results);
   } finally {
     connection.close();
   }
 };
 
 /**
- * @summary update review record
+ * @summary Delete review record
+ * @function
+ * @param {string} reviewId Unique review ID
+ * @param {object} [transaction] Connection of the caller. The deletion is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the result of the deletion
+ */
+const deleteReview = async (reviewId, transaction) => {
+  const sqlParams = {
+    id: reviewId,
+    gameId: { type: oracledb.NUMBER, dir: oracledb.BIND_OUT },
+    score: { type: oracledb.NUMBER, dir: oracledb.BIND_OUT },
+  };
+  const sqlQuery = `
+    DELETE FROM REVIEWS
+    WHERE ID = :id
+    RETURNING GAME_ID, SCORE INTO :gameId, :score
+  `;
+
+  return withConnection(transaction, async (connection) => {
+    // the deletion is committed together with the score of the game of the review
+    const response = await connection.execute(sqlQuery, sqlParams);
+    if (response.rowsAffected > 0) {
+      const { gameId: [gameId], score: [score] } = response.outBinds;
+      await applyReviewScore(connection, gameId, -score, -1, !transaction);
+    }
+    reviewCache.invalidate(String(reviewId));
+    return response;
+  });
+};
+
+/**
+ * @summary update review record. The updated row is returned by the UPDATE itself.
+ * @function
+ * @param {string} reviewId Unique review ID
+ * @param {object} body Request body
+ * @param {object} [transaction] Connection of the caller. The update is committed by the caller.
+ * @returns {Promise<object>} Promise object represents the serialized review which was updated or
+ *                            undefined if the review is not found
  */
-const patchReview = async (reviewId, body) => {
+const patchReview = async (reviewId, body, transaction) => {
   const { attributes } = body.data;
 
-  // setup text for the SET clause in the sql query
-  const paramSet = [
-    `${attributes.reviewText ? 'REVIEW_TEXT = :reviewText' : ''}`,
-    `${attributes.score ? 'SCORE = :score' : ''}`,
-    `${attributes.reviewer ? 'REVIEWER = :reviewer' : ''}`,
-  ];
-  // filter out empty strings ('') otherwise join adds trailing commas
-  // '' is considered false
-  const filteredParamSet = paramSet.filter(element => element);
-
-  attributes.id = reviewId;
+  /*
+   * attributes which are not changed are bound as null so that every patch shares one statement.
+   * The binds are typed so that a null binds like a value and the statement keeps one cursor.
+   */
+  const { sqlClause, sqlParams, toRow } = reviewReturning;
   const sqlQuery = `
     UPDATE REVIEWS
-    SET ${filteredParamSet.join(', ')}
+    SET REVIEW_TEXT = NVL(:reviewText, REVIEW_TEXT),
+    SCORE = NVL(:score, SCORE),
+    REVIEWER = NVL(:reviewer, REVIEWER)
     WHERE ID = :id
+    ${sqlClause}
   `;
+  const patchParams = {
+    id: reviewId,
+    reviewText: {
+      type: oracledb.STRING,
+      val: _.isNil(attributes.reviewText) ? null : attributes.reviewText,
+    },
+    score: { type: oracledb.NUMBER, val: _.isNil(attributes.score) ? null : attributes.score },
+    reviewer: {
+      type: oracledb.STRING,
+      val: _.isNil(attributes.reviewer) ? null : attributes.reviewer,
+    },
+  };
 
-  const connection = await conn.getConnection();
-  try {
-    const response = await connection.execute(sqlQuery, attributes, { autoCommit: true });
-    return response;
-  } finally {
-    connection.close();
-  }
+  return withConnection(transaction, async (connection) => {
+    // lock the review to apply the change of its score to the score of its game
+    let previousReview;
+    if (!_.isNil(attributes.score)) {
+      const { rows } = await connection.execute(
+        'SELECT GAME_ID AS "gameId", SCORE AS "score" FROM REVIEWS WHERE ID = :id FOR UPDATE',
+        { id: reviewId },
+      );
+      [previousReview] = rows;
+    }
+
+    const { outBinds } = await connection.execute(
+      sqlQuery,
+      _.assign(patchParams, sqlParams),
+      { autoCommit: !transaction && !previousReview },
+    );
+    const rawReview = toRow(outBinds);
+    if (previousReview && rawReview) {
+      const scoreDelta = attributes.score - parseFloat(previousReview.score);
+      await applyReviewScore(connection, previousReview.gameId, scoreDelta, 0, !transaction);
+    }
+    reviewCache.invalidate(String(reviewId));
+
+    return rawReview && serializeReview(rawReview);
+  });
 };
 
 /**
- * @summary Checks if the id (gameId) matches a record in the database
+ * @summary Update review records in bulk with a single batch. The reviews are locked to apply the
+ *          changes of their scores to the scores of their games, which are committed together
+ *          with the reviews.
  * @function
- * @param {string} gameId Id of game to check for in database
- * @returns {boolean} true if at least one record is found, false if no records are found
+ * @param {object[]} reviews Review resources of the request body
+ * @returns {Promise<object>} Promise object represents the serialized result of each review
  */
-const isValidGame = async (gameId) => {
-  const sqlParams = { id: gameId };
+const patchReviews = async (reviews) => {
+  const ids = _.uniq(_.map(reviews, ({ id }) => String(id)));
   const sqlQuery = `
-    SELECT COUNT(ID) AS "id"
-    FROM VIDEO_GAMES
+    UPDATE REVIEWS
+    SET REVIEW_TEXT = NVL(:reviewText, REVIEW_TEXT),
+    SCORE = NVL(:score, SCORE),
+    REVIEWER = NVL(:reviewer, REVIEWER)
     WHERE ID = :id
   `;
+  const bindDefs = {
+    id: { type: oracledb.NUMBER },
+    reviewText: { type: oracledb.STRING, maxSize: 255 },
+    score: { type: oracledb.NUMBER },
+    reviewer: { type: oracledb.STRING, maxSize: 255 },
+  };
 
   const connection = await conn.getConnection();
   try {
-    const result = await connection.execute(sqlQuery, sqlParams);
+    const { sqlList, sqlParams } = bindList('id', ids);
+    const { rows: previousReviews } = await connection.execute(
+      `SELECT ID AS "id", GAME_ID AS "gameId", SCORE AS "score"
+      FROM REVIEWS
+      WHERE ID IN (${sqlList})
+      FOR UPDATE`,
+      sqlParams,
+    );
+    const previousById = _.keyBy(previousReviews, ({ id }) => String(id));
+    const results = [];
+    const rows = [];
+    _.forEach(reviews, ({ id, attributes }, index) => {
+      if (_.has(previousById, String(id))) {
+        rows.push({ index, id: String(id), attributes });
+      } else {
+        results[index] = {
+          index,
+          status: '404',
+          id: String(id),
+          detail: 'A review with the specified ID was not found.',
+        };
+      }
+    });
+
+    if (!_.isEmpty(rows)) {
+      // attributes which are not changed are bound as null so that every row shares one statement
+      const binds = _.map(rows, ({ id, attributes: { reviewText, score, reviewer } }) => ({
+        id: Number(id),
+        reviewText: _.isNil(reviewText) ? null : reviewText,
+        score: _.isNil(score) ? null : score,
+        reviewer: _.isNil(reviewer) ? null : reviewer,
+      }));
+      const result = await connection.executeMany(
+        sqlQuery,
+        binds,
+        { bindDefs, batchErrors: true },
+      );
 
-    return result.rows[0].id > 0;
+      const failed = failedOffsets(result);
+      // a review may be patched more than once, so its score is followed from row to row
+      const scores = _.mapValues(previousById, ({ score }) => parseFloat(score));
+      const scoreChanges = [];
+      _.forEach(rows, ({ index, id, attributes }, offset) => {
+        if (failed.has(offset)) {
+          results[index] = {
+            index,
+            status: '400',
+            id,
+            detail: 'The review could not be updated.',
+          };
+          return;
+        }
+        results[index] = { index, status: '200', id };
+        if (!_.isNil(attributes.score)) {
+          scoreChanges.push({
+            gameId: previousById[id].gameId,
+            scoreDelta: attributes.score - scores[id],
+          });
+          scores[id] = attributes.score;
+        }
+      });
+
+      const scoreDeltas = _.map(
+        _.groupBy(scoreChanges, ({ gameId }) => String(gameId)),
+        (gameChanges, gameId) => ({
+          gameId: Number(gameId),
+          scoreDelta: _.sumBy(gameChanges, 'scoreDelta'),
+          countDelta: 0,
+        }),
+      );
+      // commits the updated reviews together with the scores of their games
+      if (_.isEmpty(scoreDeltas)) {
+        await connection.commit();
+      } else {
+        await applyReviewScores(connection, scoreDeltas);
+      }
+      _.forEach(rows, ({ id }) => reviewCache.invalidate(id));
+    }
+    return serializeReviewResults(results);
   } finally {
     connection.close();
   }
 };
 
-module.exports = {
-  getReviews,
+module.exports = instrumentDao('reviews', {
+  getReviews: singleFlight('reviews', getReviews),
+  streamReviews,
   getReviewById,
   postReview,
-  isValidGame,
+  postReviews,
   deleteReview,
+  deleteReviews,
   patchReview,
-};
+  patchReviews,
+});
@@ -14,6 +14,9 @@ COMMENT ON COLUMN DEVELOPERS.ID IS 'Unique ID of developer';
 COMMENT ON COLUMN DEVELOPERS.NAME IS 'The name of this development studio';
 COMMENT ON COLUMN DEVELOPERS.WEBSITE IS 'URL of the developers website';
 
+-- Supports the name, name[prefix] and name[contains] filters on /developers
+CREATE INDEX DEVELOPERS_UPPER_NAME_IDX ON DEVELOPERS (UPPER(NAME), ID);
+
 INSERT INTO DEVELOPERS (NAME, WEBSITE) VALUES ('Bethesda', 'https://bethesda.net/en/dashboard');
 INSERT INTO DEVELOPERS (NAME, WEBSITE) VALUES ('Grinding Gear Games', 'http://www.grindinggear.com/');
 INSERT INTO DEVELOPERS (NAME, WEBSITE) VALUES ('Nintendo', 'https://www.nintendo.com/');
@@ -23,6 +26,8 @@ CREATE TABLE VIDEO_GAMES (
   DEVELOPER_ID NUMBER,
   NAME VARCHAR2(255) NOT NULL,
   SCORE FLOAT,
+  SCORE_SUM NUMBER DEFAULT 0 NOT NULL,
+  REVIEW_COUNT NUMBER DEFAULT 0 NOT NULL,
   RELEASE_DATE DATE NOT NULL,
   PRIMARY KEY (ID),
   FOREIGN KEY(DEVELOPER_ID) REFERENCES DEVELOPERS(ID)
@@ -33,8 +38,22 @@ COMMENT ON COLUMN VIDEO_GAMES.ID IS 'Unique ID of video game';
 COMMENT ON COLUMN VIDEO_GAMES.DEVELOPER_ID IS 'Foreign key to DEVELOPERS. ID of the developer that created this game';
 COMMENT ON COLUMN VIDEO_GAMES.NAME IS 'The name of this video game';
 COMMENT ON COLUMN VIDEO_GAMES.SCORE IS 'Aggregate score based on reviews submitted for this game';
+COMMENT ON COLUMN VIDEO_GAMES.SCORE_SUM IS 'Running sum of the scores of the reviews of this game';
+COMMENT ON COLUMN VIDEO_GAMES.REVIEW_COUNT IS 'Running number of reviews of this game';
 COMMENT ON COLUMN VIDEO_GAMES.RELEASE_DATE IS 'Original date this game was released';
 
+-- Supports sort=score and its page[after] cursor seek, and the scoreMin filter on /games
+CREATE INDEX VIDEO_GAMES_SCORE_ID_IDX ON VIDEO_GAMES (NVL(SCORE, 0), ID);
+
+-- Supports the name, name[prefix] and name[contains] filters on /games
+CREATE INDEX VIDEO_GAMES_UPPER_NAME_IDX ON VIDEO_GAMES (UPPER(NAME), ID);
+
+-- Supports the developerId filter on /games and the foreign key to DEVELOPERS
+CREATE INDEX VIDEO_GAMES_DEVELOPER_ID_IDX ON VIDEO_GAMES (DEVELOPER_ID, ID);
+
+-- Supports the releaseDate[gte] and releaseDate[lt] filters on /games
+CREATE INDEX VIDEO_GAMES_RELEASE_DATE_IDX ON VIDEO_GAMES (RELEASE_DATE, ID);
+
 INSERT INTO VIDEO_GAMES (DEVELOPER_ID, NAME, RELEASE_DATE) VALUES (1, 'Fallout 3', TO_DATE('2008/10/28', 'YYYY/MM/DD'));
 INSERT INTO VIDEO_GAMES (DEVELOPER_ID, NAME, RELEASE_DATE) VALUES (2, 'Path of Exile', TO_DATE('2013/10/15', 'YYYY/MM/DD'));
 INSERT INTO VIDEO_GAMES (DEVELOPER_ID, NAME, RELEASE_DATE) VALUES (3, 'The Legend of Zelda: Breath of the Wild', TO_DATE('2017/3/3', 'YYYY/MM/DD'));
@@ -59,6 +78,31 @@ COMMENT ON COLUMN REVIEWS.SCORE IS 'Score out of 5 given by the reviewer';
 COMMENT ON COLUMN REVIEWS.REVIEWER IS 'The author of this review';
 COMMENT ON COLUMN REVIEWS.REVIEW_DATE IS 'Auto-filled date the review was submitted to the database';
 
+-- Support sort=score and sort=reviewDate and their page[after] cursor seeks, and the scoreMin,
+-- scoreMax and reviewDate filters on /reviews
+CREATE INDEX REVIEWS_SCORE_ID_IDX ON REVIEWS (SCORE, ID);
+CREATE INDEX REVIEWS_REVIEW_DATE_ID_IDX ON REVIEWS (REVIEW_DATE, ID);
+
+-- Supports the gameIds filter on /reviews, loading the reviews of a page of games for
+-- include=reviews on /games and the foreign key to VIDEO_GAMES
+CREATE INDEX REVIEWS_GAME_ID_IDX ON REVIEWS (GAME_ID, ID);
+
+-- Supports the reviewer, reviewer[prefix] and reviewer[contains] filters on /reviews
+CREATE INDEX REVIEWS_UPPER_REVIEWER_IDX ON REVIEWS (UPPER(REVIEWER), ID);
+
 INSERT INTO REVIEWS (GAME_ID, REVIEW_TEXT, SCORE, REVIEWER) VALUES (1, 'BEST GAME EVER.', '5', 'BIG BRAIN');
 INSERT INTO REVIEWS (GAME_ID, REVIEW_TEXT, SCORE, REVIEWER) VALUES (2, 'Played for 200 hours. Beat the story and now I can play the game.', '3.5', 'BIG BRAIN');
 INSERT INTO REVIEWS (GAME_ID, REVIEW_TEXT, SCORE, REVIEWER) VALUES (3, 'Awful. Game was to hard.', '2', 'Small brain');
+
+-- Compute the aggregate scores of the seeded reviews. The API maintains them from here on.
+MERGE INTO VIDEO_GAMES g
+USING (
+  SELECT VIDEO_GAMES.ID AS ID, NVL(SUM(REVIEWS.SCORE), 0) AS SCORE_SUM, COUNT(REVIEWS.ID) AS REVIEW_COUNT
+  FROM VIDEO_GAMES
+  LEFT JOIN REVIEWS ON REVIEWS.GAME_ID = VIDEO_GAMES.ID
+  GROUP BY VIDEO_GAMES.ID
+) s
+ON (g.ID = s.ID)
+WHEN MATCHED THEN UPDATE SET g.SCORE_SUM = s.SCORE_SUM,
+  g.REVIEW_COUNT = s.REVIEW_COUNT,
+  g.SCORE = CASE WHEN s.REVIEW_COUNT = 0 THEN NULL ELSE s.SCORE_SUM / s.REVIEW_COUNT END;
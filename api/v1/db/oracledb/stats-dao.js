@@ -0,0 +1,155 @@
+const appRoot = require('app-root-path');
+const _ = require('lodash');
+
+const {
+  scoreBuckets,
+  statsConverter,
+  serializeGameStats,
+  serializeGamesStats,
+  serializeDeveloperStats,
+} = require('../../serializers/stats-serializer');
+
+const conn = appRoot.require('api/v1/db/oracledb/connection');
+const { instrumentDao } = appRoot.require('api/v1/db/oracledb/instrument');
+const { bindList } = appRoot.require('api/v1/db/oracledb/query-builder');
+const { createCache } = appRoot.require('utils/cache');
+
+/** Review statistics of games keyed by game ID */
+const gameStatsCache = createCache('gameStats');
+
+/** Review statistics of the games of developers keyed by developer ID */
+const developerStatsCache = createCache('developerStats');
+
+/**
+ * Aggregates of the reviews "r" of a group. Every score is counted in one bucket of the histogram,
+ * scores below the first bucket in the first one and scores over the last bucket in the last one.
+ */
+const reviewStatsList = _.concat(
+  [
+    'COUNT(r.ID) AS "reviewCount"',
+    'ROUND(AVG(r.SCORE), 2) AS "meanScore"',
+    'MIN(r.SCORE) AS "minScore"',
+    'MAX(r.SCORE) AS "maxScore"',
+  ],
+  _.map(scoreBuckets, bucket => (
+    `COUNT(CASE WHEN LEAST(GREATEST(FLOOR(r.SCORE), ${_.head(scoreBuckets)}), `
+    + `${_.last(scoreBuckets)}) = ${bucket} THEN 1 END) AS "histogram${bucket}"`
+  )),
+).join(', ');
+
+/**
+ * @summary Select the review statistics of games which are not cached and cache them
+ * @function
+ * @param {string[]} ids Unique game IDs
+ * @returns {Promise<object>} Promise object represents the statistics of the games which exist
+ *                            keyed by game ID
+ */
+const loadGamesStats = async (ids) => {
+  const gamesStats = {};
+  const missingIds = _.filter(ids, (id) => {
+    gamesStats[id] = gameStatsCache.get(id);
+    return !gamesStats[id];
+  });
+  if (!_.isEmpty(missingIds)) {
+    const generation = gameStatsCache.generation();
+    const { sqlList, sqlParams } = bindList('id', missingIds);
+    // games without reviews are kept by the outer join so that only unknown IDs are left out
+    const sqlQuery = `
+      SELECT g.ID AS "id", ${reviewStatsList}
+      FROM VIDEO_GAMES g
+      LEFT JOIN REVIEWS r ON r.GAME_ID = g.ID
+      WHERE g.ID IN (${sqlList})
+      GROUP BY g.ID
+    `;
+
+    const connection = await conn.getConnection();
+    try {
+      const { rows } = await connection.execute(sqlQuery, sqlParams);
+      _.forEach(rows, (row) => {
+        const stats = statsConverter(row);
+        gamesStats[stats.id] = stats;
+        gameStatsCache.set(stats.id, stats, generation);
+      });
+    } finally {
+      connection.close();
+    }
+  }
+  return _.pickBy(gamesStats);
+};
+
+/**
+ * @summary Return the review statistics of a game
+ * @function
+ * @param {string} id Unique game ID
+ * @returns {Promise<object>} Promise object represents the statistics of the game or undefined if
+ *                            the game is not found
+ */
+const getGameStats = async (id) => {
+  const stats = (await loadGamesStats([String(id)]))[String(id)];
+  return stats && serializeGameStats(stats);
+};
+
+/**
+ * @summary Return the review statistics of several games. Games which are not found are left out.
+ * @function
+ * @param {object} queries Query parameters
+ * @returns {Promise<object>} Promise object represents the statistics of the games in the order of
+ *                            the ids query parameter
+ */
+const getGamesStats = async (queries) => {
+  const ids = _.uniq(_.map(queries.ids, String));
+  const gamesStats = await loadGamesStats(ids);
+  return serializeGamesStats(_.compact(_.map(ids, id => gamesStats[id])), queries);
+};
+
+/**
+ * @summary Return the review statistics of every game of a developer
+ * @function
+ * @param {string} id Unique developer ID
+ * @returns {Promise<object>} Promise object represents the statistics of the developer or undefined
+ *                            if the developer is not found
+ */
+const getDeveloperStats = async (id) => {
+  let stats = developerStatsCache.get(String(id));
+  if (!stats) {
+    const generation = developerStatsCache.generation();
+    const sqlParams = { developerId: id };
+    const sqlQuery = `
+      SELECT d.ID AS "id", ${reviewStatsList}
+      FROM DEVELOPERS d
+      LEFT JOIN VIDEO_GAMES g ON g.DEVELOPER_ID = d.ID
+      LEFT JOIN REVIEWS r ON r.GAME_ID = g.ID
+      WHERE d.ID = :developerId
+      GROUP BY d.ID
+    `;
+
+    const connection = await conn.getConnection();
+    try {
+      const { rows } = await connection.execute(sqlQuery, sqlParams);
+      if (_.isEmpty(rows)) {
+        return undefined;
+      }
+      stats = statsConverter(rows[0]);
+      developerStatsCache.set(String(id), stats, generation);
+    } finally {
+      connection.close();
+    }
+  }
+  return serializeDeveloperStats(stats);
+};
+
+/**
+ * Drop the cached statistics which depend on the reviews of a game. The developer of the game is
+ * not known here, so the statistics of every developer are dropped.
+ *
+ * @param {string} gameId Unique game ID
+ */
+const invalidateGameStats = (gameId) => {
+  gameStatsCache.invalidate(String(gameId));
+  developerStatsCache.clear();
+};
+
+module.exports = _.assign(
+  instrumentDao('stats', { getGameStats, getGamesStats, getDeveloperStats }),
+  { invalidateGameStats },
+);
@@ -0,0 +1,35 @@
+const appRoot = require('app-root-path');
+
+const conn = appRoot.require('api/v1/db/oracledb/connection');
+
+/**
+ * Run a callback with a connection. A connection passed in by the caller is reused so that the
+ * callback runs in the caller's transaction and no second connection is checked out of the pool.
+ * Otherwise a connection is checked out for the callback and released once it settles.
+ *
+ * @param {object} [connection] Connection of the caller
+ * @param {Function} callback Async function which takes the connection
+ * @returns {Promise} Promise object represents the result of the callback
+ */
+const withConnection = async (connection, callback) => {
+  if (connection) {
+    return callback(connection);
+  }
+  const pooledConnection = await conn.getConnection();
+  try {
+    return await callback(pooledConnection);
+  } finally {
+    pooledConnection.close();
+  }
+};
+
+/**
+ * Check whether an error is ORA-02291, raised when a foreign key references a row which does not
+ * exist
+ *
+ * @param {Error} err Error thrown by oracledb
+ * @returns {boolean} Whether the parent key was not found
+ */
+const isParentKeyNotFound = err => err.errorNum === 2291;
+
+module.exports = { withConnection, isParentKeyNotFound };
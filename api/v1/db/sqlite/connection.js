@@ -0,0 +1,307 @@
+const appRoot = require('app-root-path');
+const config = require('config');
+const _ = require('lodash');
+const { Readable } = require('stream');
+
+const { createCheckoutQueue } = appRoot.require('api/v1/db/oracledb/checkout-queue');
+const { openDatabase } = appRoot.require('api/v1/db/sqlite/database');
+const { formatDate, translateSql } = appRoot.require('api/v1/db/sqlite/dialect');
+const { logger } = appRoot.require('utils/logger');
+
+const dbConfig = _.defaults({}, config.get('dataSources').sqlite, { filename: ':memory:' });
+
+/** Error number of ORA-02291, which the DAOs check for when a foreign key references no row */
+const parentKeyNotFound = 2291;
+
+/**
+ * Every connection of the pool shares a single SQLite database. Statements run synchronously, so
+ * only one runs at a time, and write transactions take turns through a lock of one slot.
+ */
+let database;
+const writeLock = createCheckoutQueue({ limit: 1, queueMax: 0, queueTimeout: 0 });
+let connectionsOpen = 0;
+
+/**
+ * Translated statements of the shared database keyed by Oracle statement text. The DAOs only
+ * build a bounded number of statement texts, so every statement stays prepared.
+ */
+const preparedStatements = new Map();
+
+/**
+ * Open the database once it is first needed
+ *
+ * @returns {object} SQLite database
+ */
+const getDatabase = () => {
+  if (!database) {
+    database = openDatabase(dbConfig);
+  }
+  return database;
+};
+
+/**
+ * Build a function which converts the rows of a statement the way oracledb fetches them with
+ * fetchAsString for DATE and NUMBER columns, so that the DAOs and serializers get the same values
+ *
+ * @param {object} statement Prepared statement which returns data
+ * @returns {Function} Function which converts a row
+ */
+const rowConverter = (statement) => {
+  const columns = _.filter(statement.columns(), ({ type }) => /^DATE$/i.test(type));
+  const dateColumns = _.map(columns, 'name');
+  return row => _.mapValues(row, (value, name) => {
+    if (_.isNil(value)) {
+      return null;
+    }
+    if (_.includes(dateColumns, name)) {
+      return formatDate(value);
+    }
+    return _.isNumber(value) ? String(value) : value;
+  });
+};
+
+/**
+ * Translate and prepare an Oracle statement
+ *
+ * @param {object} db SQLite database
+ * @param {string} sqlQuery Oracle SQL statement
+ * @returns {object} Prepared statement, the names of the out binds it returns and the converter of
+ *                   its rows
+ */
+const prepare = (db, sqlQuery) => {
+  const { sqlQuery: translatedQuery, outBindNames } = translateSql(sqlQuery);
+  const statement = db.prepare(translatedQuery);
+  return {
+    statement,
+    outBindNames,
+    convertRow: statement.reader ? rowConverter(statement) : undefined,
+  };
+};
+
+/**
+ * Translate and prepare an Oracle statement on the shared database, reusing the statement
+ * prepared by an earlier execution of the same text
+ *
+ * @param {string} sqlQuery Oracle SQL statement
+ * @returns {object} Prepared statement and the names of the out binds it returns
+ */
+const prepareCached = (sqlQuery) => {
+  if (!preparedStatements.has(sqlQuery)) {
+    preparedStatements.set(sqlQuery, prepare(getDatabase(), sqlQuery));
+  }
+  return preparedStatements.get(sqlQuery);
+};
+
+/**
+ * Get the in bind values of a statement. Out binds are returned by the statement instead, typed
+ * binds are bound by their value and undefined values are bound as null.
+ *
+ * @param {object} [binds] Bind parameters
+ * @returns {object} Bind values keyed by name
+ */
+const inBindValues = binds => _.mapValues(
+  _.omitBy(binds, bind => _.isPlainObject(bind) && _.has(bind, 'dir')),
+  (bind) => {
+    const value = _.isPlainObject(bind) ? bind.val : bind;
+    return _.isUndefined(value) ? null : value;
+  },
+);
+
+/**
+ * Give an SQLite error the error number of the Oracle error the DAOs check for
+ *
+ * @param {Error} err SQLite error
+ * @returns {Error} The same error
+ */
+const toOracleError = (err) => {
+  if (err.code === 'SQLITE_CONSTRAINT_FOREIGNKEY') {
+    err.errorNum = parentKeyNotFound;
+  }
+  return err;
+};
+
+/**
+ * Run a prepared statement with a single set of bind parameters
+ *
+ * @param {object} prepared Statement prepared by prepare
+ * @param {object} [binds] Bind parameters
+ * @returns {object} Rows of a query, or the number of changed rows and out binds of a DML
+ *                   statement
+ */
+const runStatement = ({ statement, outBindNames, convertRow }, binds) => {
+  try {
+    const values = inBindValues(binds);
+    if (!statement.reader) {
+      return { rowsAffected: statement.run(values).changes };
+    }
+    const rows = _.map(statement.all(values), convertRow);
+    if (_.isEmpty(outBindNames)) {
+      return { rows };
+    }
+    const outBinds = _.zipObject(outBindNames, _.map(outBindNames, name => _.map(rows, name)));
+    return { outBinds, rowsAffected: rows.length };
+  } catch (err) {
+    throw toOracleError(err);
+  }
+};
+
+/**
+ * Check whether a statement changes data or locks the rows it selects to change them
+ *
+ * @param {string} sqlQuery Oracle SQL statement
+ * @returns {boolean} Whether the statement starts a transaction
+ */
+const startsTransaction = sqlQuery => /^\s*(INSERT|UPDATE|DELETE|MERGE)\s/i.test(sqlQuery)
+  || /\sFOR\s+UPDATE\b/i.test(sqlQuery);
+
+/**
+ * Stream the rows of a query. A database file is read through a connection of its own, so the
+ * stream does not keep the shared database busy while it is consumed. An in-memory database has
+ * no second connection, so its rows are fetched at once.
+ *
+ * @param {string} sqlQuery Oracle SQL query
+ * @param {object} [binds] Bind parameters
+ * @returns {stream.Readable} Object mode stream of rows
+ */
+const streamRows = (sqlQuery, binds) => {
+  const streamDatabase = dbConfig.filename === ':memory:'
+    ? null
+    : openDatabase({ filename: dbConfig.filename });
+  const { statement, convertRow } = streamDatabase
+    ? prepare(streamDatabase, sqlQuery)
+    : prepareCached(sqlQuery);
+  const rows = streamDatabase
+    ? statement.iterate(inBindValues(binds))
+    : statement.all(inBindValues(binds))[Symbol.iterator]();
+
+  return new Readable({
+    objectMode: true,
+    read() {
+      try {
+        const { done, value } = rows.next();
+        this.push(done ? null : convertRow(value));
+      } catch (err) {
+        this.destroy(err);
+      }
+    },
+    destroy(err, callback) {
+      if (rows.return) {
+        rows.return();
+      }
+      if (streamDatabase) {
+        streamDatabase.close();
+      }
+      callback(err);
+    },
+  }).on('end', function destroyOnEnd() {
+    this.destroy();
+  });
+};
+
+/**
+ * Create a connection to the shared database with the part of the interface of an oracledb
+ * connection which the DAOs use. A DML statement or a SELECT FOR UPDATE starts a transaction which
+ * holds the write lock until it is committed, rolled back or the connection is closed. Queries of
+ * other connections run meanwhile and see the changes which are not committed yet.
+ *
+ * @returns {object} Connection
+ */
+const createConnection = () => {
+  let releaseWriteLock;
+
+  const beginTransaction = async () => {
+    if (!releaseWriteLock) {
+      releaseWriteLock = await writeLock.acquire();
+      getDatabase().exec('BEGIN');
+    }
+  };
+
+  const endTransaction = (sqlQuery) => {
+    if (releaseWriteLock) {
+      getDatabase().exec(sqlQuery);
+      releaseWriteLock();
+      releaseWriteLock = undefined;
+    }
+  };
+
+  const connection = {
+    execute: async (sqlQuery, binds = {}, options = {}) => {
+      const prepared = prepareCached(sqlQuery);
+      if (!startsTransaction(sqlQuery)) {
+        return runStatement(prepared, binds);
+      }
+      await beginTransaction();
+      const result = runStatement(prepared, binds);
+      if (options.autoCommit) {
+        endTransaction('COMMIT');
+      }
+      return result;
+    },
+    executeMany: async (sqlQuery, bindsList, options = {}) => {
+      const prepared = prepareCached(sqlQuery);
+      await beginTransaction();
+      const batchErrors = [];
+      const results = _.map(bindsList, (binds, offset) => {
+        try {
+          return runStatement(prepared, binds);
+        } catch (err) {
+          if (!options.batchErrors) {
+            throw err;
+          }
+          batchErrors.push(_.assign(err, { offset }));
+          return { rowsAffected: 0 };
+        }
+      });
+      if (options.autoCommit && _.isEmpty(batchErrors)) {
+        endTransaction('COMMIT');
+      }
+      return _.pickBy({
+        rowsAffected: _.sumBy(results, 'rowsAffected'),
+        dmlRowCounts: options.dmlRowCounts ? _.map(results, 'rowsAffected') : undefined,
+        outBinds: _.isEmpty(prepared.outBindNames) ? undefined : _.map(results, 'outBinds'),
+        batchErrors: options.batchErrors ? batchErrors : undefined,
+      }, _.negate(_.isUndefined));
+    },
+    queryStream: (sqlQuery, binds = {}) => streamRows(sqlQuery, binds),
+    commit: async () => endTransaction('COMMIT'),
+    rollback: async () => endTransaction('ROLLBACK'),
+    close: async () => {
+      endTransaction('ROLLBACK');
+      connectionsOpen -= 1;
+    },
+  };
+  connectionsOpen += 1;
+  return connection;
+};
+
+/**
+ * Create a pool of connections to the SQLite database, which stands in for the pool of
+ * oracledb.createPool
+ *
+ * @returns {Promise<object>} Promise object represents the pool
+ */
+const createPool = async () => {
+  getDatabase();
+  return {
+    getConnection: async () => createConnection(),
+    get connectionsOpen() {
+      return connectionsOpen;
+    },
+  };
+};
+
+/**
+ * Validate the SQLite database and throw an error if invalid
+ *
+ * @throws Throws an error if unable to open the database
+ */
+const validateSqlite = async () => {
+  try {
+    getDatabase().prepare('SELECT 1 FROM DUAL').get();
+  } catch (err) {
+    logger.error(err);
+    throw new Error('Unable to open SQLite database');
+  }
+};
+
+module.exports = { createPool, validateSqlite };
@@ -0,0 +1,88 @@
+const appRoot = require('app-root-path');
+const Database = require('better-sqlite3');
+const fs = require('fs');
+const _ = require('lodash');
+
+const { oracleFunctions } = appRoot.require('api/v1/db/sqlite/dialect');
+const { generateData } = appRoot.require('api/v1/db/sqlite/synthetic-data');
+
+/** Tables and indexes of the SQLite database */
+const schemaPath = appRoot.resolve('api/v1/db/sqlite/schema.sql');
+
+/** Oracle setup script whose seed rows are inserted into a new SQLite database */
+const setupPath = appRoot.resolve('api/v1/db/oracledb/setupDB.sql');
+
+/**
+ * Recompute the score sum, review count and aggregate score of every game from its reviews with a
+ * single pass over REVIEWS, like rebuildGameScores does with MERGE in Oracle
+ */
+const rebuildScoresQuery = `
+  UPDATE VIDEO_GAMES SET SCORE_SUM = 0, REVIEW_COUNT = 0, SCORE = NULL;
+  UPDATE VIDEO_GAMES
+  SET SCORE_SUM = s.SCORE_SUM,
+  REVIEW_COUNT = s.REVIEW_COUNT,
+  SCORE = s.SCORE_SUM / s.REVIEW_COUNT
+  FROM (
+    SELECT GAME_ID, SUM(SCORE) AS SCORE_SUM, COUNT(ID) AS REVIEW_COUNT
+    FROM REVIEWS
+    GROUP BY GAME_ID
+  ) s
+  WHERE VIDEO_GAMES.ID = s.GAME_ID;
+`;
+
+/**
+ * Get the INSERT statements of the Oracle setup script. They only call functions which are
+ * registered on the SQLite database, so they run unchanged.
+ *
+ * @returns {string[]} INSERT statements
+ */
+const setupInserts = () => _.filter(
+  _.map(fs.readFileSync(setupPath, 'utf8').split(/;\s*\n/), _.trim),
+  statement => /^INSERT\s/i.test(statement),
+);
+
+/**
+ * Recompute the aggregate score of every game of a SQLite database from its reviews
+ *
+ * @param {object} db SQLite database
+ */
+const rebuildGameScores = (db) => {
+  db.transaction(() => db.exec(rebuildScoresQuery))();
+};
+
+/**
+ * Open a SQLite database with the Oracle functions the DAOs use. A database without tables is
+ * created from schema.sql, seeded with the rows of setupDB.sql and then with synthetic data if
+ * syntheticData is configured.
+ *
+ * @param {object} dbConfig SQLite data source configuration
+ * @param {string} dbConfig.filename Path of the database file or ':memory:'
+ * @param {object} [dbConfig.syntheticData] Options of generateData
+ * @returns {object} SQLite database
+ */
+const openDatabase = ({ filename, syntheticData }) => {
+  const db = new Database(filename);
+  _.forEach(oracleFunctions, (fn, name) => {
+    db.function(name, { deterministic: true, varargs: true }, fn);
+  });
+  db.pragma('foreign_keys = ON');
+  if (filename !== ':memory:') {
+    db.pragma('journal_mode = WAL');
+  }
+
+  const tables = db.prepare("SELECT NAME FROM SQLITE_MASTER WHERE NAME = 'VIDEO_GAMES'").all();
+  if (_.isEmpty(tables)) {
+    db.transaction(() => {
+      db.exec(fs.readFileSync(schemaPath, 'utf8'));
+      _.forEach(setupInserts(), statement => db.exec(statement));
+    })();
+    if (syntheticData) {
+      generateData(db, syntheticData);
+    }
+    rebuildGameScores(db);
+    db.exec('ANALYZE');
+  }
+  return db;
+};
+
+module.exports = { openDatabase, rebuildGameScores };
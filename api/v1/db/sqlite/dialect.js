@@ -0,0 +1,113 @@
+const _ = require('lodash');
+
+/** Julian day number of the Unix epoch */
+const unixEpochJulianDay = 2440587.5;
+
+/** Number of milliseconds in a day */
+const dayLength = 86400000;
+
+/**
+ * Convert a date string to a julian day number, the way SQLite stores the DATE columns. Only the
+ * year first formats which the DAOs use, such as 'YYYY-MM-DD HH24:MI:SS', are supported. Julian
+ * day numbers compare like dates and adding 1 to one adds a day, just like Oracle dates.
+ *
+ * @param {string} value Date string
+ * @returns {number} Julian day number or null if the value is null
+ */
+const toDate = (value) => {
+  if (_.isNil(value)) {
+    return null;
+  }
+  const [year, month = 1, day = 1, hours = 0, minutes = 0, seconds = 0] = _.map(
+    String(value).match(/\d+/g),
+    Number,
+  );
+  return (Date.UTC(year, month - 1, day, hours, minutes, seconds) / dayLength)
+    + unixEpochJulianDay;
+};
+
+/**
+ * Format a julian day number as 'YYYY-MM-DD HH24:MI:SS', which is how dates are fetched as strings
+ *
+ * @param {number} julianDay Julian day number
+ * @returns {string} Formatted date
+ */
+const formatDate = julianDay => new Date(Math.round((julianDay - unixEpochJulianDay) * dayLength))
+  .toISOString()
+  .replace('T', ' ')
+  .slice(0, 19);
+
+/**
+ * Convert a value to a string. A value with a format is a date and is always formatted as
+ * 'YYYY-MM-DD HH24:MI:SS', the only date format the DAOs use.
+ *
+ * @param {*} value Number or julian day number
+ * @param {string} [format] Date format
+ * @returns {string} String or null if the value is null
+ */
+const toChar = (value, format) => {
+  if (_.isNil(value)) {
+    return null;
+  }
+  return format ? formatDate(value) : String(value);
+};
+
+/**
+ * Apply a function to its arguments unless one of them is null, which makes the result null as
+ * it does in Oracle
+ *
+ * @param {Function} fn Function
+ * @returns {Function} Function which returns null if an argument is null
+ */
+const nullIfAnyNull = fn => (...args) => (_.some(args, _.isNil) ? null : fn(...args));
+
+/**
+ * Oracle functions used by the DAOs which SQLite does not have, keyed by name. They are
+ * registered on every SQLite database as deterministic functions so that they can be indexed.
+ */
+const oracleFunctions = {
+  NVL: (value, defaultValue) => (_.isNil(value) ? defaultValue : value),
+  TO_DATE: toDate,
+  TO_CHAR: toChar,
+  TO_NUMBER: nullIfAnyNull(Number),
+  LEAST: nullIfAnyNull(Math.min),
+  GREATEST: nullIfAnyNull(Math.max),
+  FLOOR: nullIfAnyNull(Math.floor),
+};
+
+/**
+ * Translate an Oracle statement of the DAOs to SQLite. Row limiting clauses become LIMIT and
+ * OFFSET, and a RETURNING INTO clause returns its columns aliased by the names of their out binds
+ * so that the returned rows can be mapped to out binds. FOR UPDATE, which SQLite does not have, is
+ * dropped; the connection takes the write lock for the query instead.
+ *
+ * @param {string} sqlQuery Oracle SQL statement
+ * @returns {object} SQLite SQL statement and the names of the out binds it returns
+ */
+const translateSql = (sqlQuery) => {
+  let outBindNames = [];
+  const translatedQuery = sqlQuery
+    .replace(
+      /OFFSET\s+:(\w+)\s+ROWS\s+FETCH\s+NEXT\s+:(\w+)\s+ROWS\s+ONLY/gi,
+      'LIMIT :$2 OFFSET :$1',
+    )
+    .replace(/FETCH\s+FIRST\s+:(\w+)\s+ROWS\s+ONLY/gi, 'LIMIT :$1')
+    .replace(/\s+FOR\s+UPDATE\b/gi, '')
+    .replace(/RETURNING\s+([\s\S]+?)\s+INTO\s+([\s\S]+)$/i, (match, columnList, bindList) => {
+      const columns = _.map(columnList.split(','), _.trim);
+      outBindNames = _.map(bindList.match(/:\w+/g), bind => bind.slice(1));
+      const aliasedColumns = _.map(columns, (column, index) => (
+        `${column} AS "${outBindNames[index]}"`
+      ));
+      return `RETURNING ${aliasedColumns.join(', ')}`;
+    });
+
+  return { sqlQuery: translatedQuery, outBindNames };
+};
+
+module.exports = {
+  toDate,
+  formatDate,
+  oracleFunctions,
+  translateSql,
+};
@@ -0,0 +1,43 @@
+const appRoot = require('app-root-path');
+const config = require('config');
+const _ = require('lodash');
+
+const { openDatabase, rebuildGameScores } = appRoot.require('api/v1/db/sqlite/database');
+const { generateData } = appRoot.require('api/v1/db/sqlite/synthetic-data');
+const { logger } = appRoot.require('utils/logger');
+
+const { filename } = config.get('dataSources').sqlite;
+
+/**
+ * Parse the --developers, --games, --reviews, --seed and --batchSize options of the script
+ *
+ * @param {string[]} args Command line arguments
+ * @returns {object} Options of generateData
+ */
+const parseOptions = args => _.fromPairs(_.map(
+  _.chunk(args, 2),
+  ([name, value]) => [name.replace(/^--/, ''), Number(value)],
+));
+
+/**
+ * Add synthetic developers, games and reviews to the SQLite database file of the configuration,
+ * for example: npm run generate-data -- --games 100000 --reviews 5000000. A new file is created
+ * and seeded with the rows of setupDB.sql first.
+ */
+if (!filename || filename === ':memory:') {
+  logger.error('Set dataSources.sqlite.filename to the path of a database file.');
+  process.exit(1);
+}
+const options = parseOptions(process.argv.slice(2));
+try {
+  const db = openDatabase({ filename });
+  generateData(db, options);
+  rebuildGameScores(db);
+  db.exec('ANALYZE');
+  db.close();
+  logger.info(`Generated ${JSON.stringify(options)} into ${filename}`);
+  process.exit(0);
+} catch (err) {
+  logger.error(err);
+  process.exit(1);
+}
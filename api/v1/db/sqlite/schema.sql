@@ -0,0 +1,61 @@
+-- SQLite version of the tables and indexes of ../oracledb/setupDB.sql. Keep the two in sync.
+-- DATE columns hold julian day numbers, which TO_DATE returns and which compare like dates.
+
+-- Oracle's single row table, which the connection validation selects from
+CREATE TABLE DUAL (
+  DUMMY TEXT
+);
+
+INSERT INTO DUAL (DUMMY) VALUES ('X');
+
+CREATE TABLE DEVELOPERS (
+  ID INTEGER PRIMARY KEY AUTOINCREMENT,
+  NAME TEXT NOT NULL,
+  WEBSITE TEXT
+);
+
+-- Supports the name, name[prefix] and name[contains] filters on /developers
+CREATE INDEX DEVELOPERS_UPPER_NAME_IDX ON DEVELOPERS (UPPER(NAME), ID);
+
+CREATE TABLE VIDEO_GAMES (
+  ID INTEGER PRIMARY KEY AUTOINCREMENT,
+  DEVELOPER_ID INTEGER REFERENCES DEVELOPERS(ID),
+  NAME TEXT NOT NULL,
+  SCORE REAL,
+  SCORE_SUM REAL DEFAULT 0 NOT NULL,
+  REVIEW_COUNT INTEGER DEFAULT 0 NOT NULL,
+  RELEASE_DATE DATE NOT NULL
+);
+
+-- Supports sort=score and its page[after] cursor seek, and the scoreMin filter on /games
+CREATE INDEX VIDEO_GAMES_SCORE_ID_IDX ON VIDEO_GAMES (NVL(SCORE, 0), ID);
+
+-- Supports the name, name[prefix] and name[contains] filters on /games
+CREATE INDEX VIDEO_GAMES_UPPER_NAME_IDX ON VIDEO_GAMES (UPPER(NAME), ID);
+
+-- Supports the developerId filter on /games and the foreign key to DEVELOPERS
+CREATE INDEX VIDEO_GAMES_DEVELOPER_ID_IDX ON VIDEO_GAMES (DEVELOPER_ID, ID);
+
+-- Supports the releaseDate[gte] and releaseDate[lt] filters on /games
+CREATE INDEX VIDEO_GAMES_RELEASE_DATE_IDX ON VIDEO_GAMES (RELEASE_DATE, ID);
+
+CREATE TABLE REVIEWS (
+  ID INTEGER PRIMARY KEY AUTOINCREMENT,
+  GAME_ID INTEGER NOT NULL REFERENCES VIDEO_GAMES(ID),
+  REVIEW_TEXT TEXT NOT NULL,
+  SCORE REAL NOT NULL,
+  REVIEWER TEXT NOT NULL,
+  REVIEW_DATE DATE DEFAULT (JULIANDAY('now', 'localtime')) NOT NULL
+);
+
+-- Support sort=score and sort=reviewDate and their page[after] cursor seeks, and the scoreMin,
+-- scoreMax and reviewDate filters on /reviews
+CREATE INDEX REVIEWS_SCORE_ID_IDX ON REVIEWS (SCORE, ID);
+CREATE INDEX REVIEWS_REVIEW_DATE_ID_IDX ON REVIEWS (REVIEW_DATE, ID);
+
+-- Supports the gameIds filter on /reviews, loading the reviews of a page of games for
+-- include=reviews on /games and the foreign key to VIDEO_GAMES
+CREATE INDEX REVIEWS_GAME_ID_IDX ON REVIEWS (GAME_ID, ID);
+
+-- Supports the reviewer, reviewer[prefix] and reviewer[contains] filters on /reviews
+CREATE INDEX REVIEWS_UPPER_REVIEWER_IDX ON REVIEWS (UPPER(REVIEWER), ID);
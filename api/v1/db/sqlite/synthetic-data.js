@@ -0,0 +1,138 @@
+const appRoot = require('app-root-path');
+const _ = require('lodash');
+
+const { toDate } = appRoot.require('api/v1/db/sqlite/dialect');
+
+/** Range of the generated release dates and review dates as julian day numbers */
+const firstReleaseDay = toDate('1980-01-01');
+const firstReviewDay = toDate('2000-01-01');
+const lastDay = toDate('2020-01-01');
+
+/** Number of seconds in a day */
+const daySeconds = 86400;
+
+/**
+ * Create a pseudo-random number generator. The same seed always generates the same sequence, so
+ * every run with the same options generates the same data.
+ *
+ * @param {number} seed Seed
+ * @returns {Function} Function which returns the next number in [0, 1)
+ */
+const createRandom = (seed) => {
+  const modulus = 2147483647;
+  let state = (Math.abs(Math.floor(seed)) % (modulus - 1)) + 1;
+  return () => {
+    state = (state * 48271) % modulus;
+    return (state - 1) / (modulus - 1);
+  };
+};
+
+/**
+ * Insert rows with a prepared statement in transactions of batchSize rows
+ *
+ * @param {object} db SQLite database
+ * @param {string} sqlQuery INSERT statement
+ * @param {number} count Number of rows
+ * @param {number} batchSize Number of rows per transaction
+ * @param {Function} buildRow Function which builds the bind parameters of the row at an index
+ */
+const insertRows = (db, sqlQuery, count, batchSize, buildRow) => {
+  const statement = db.prepare(sqlQuery);
+  const insertBatch = db.transaction((start, end) => {
+    _.times(end - start, offset => statement.run(buildRow(start + offset)));
+  });
+  for (let start = 0; start < count; start += batchSize) {
+    insertBatch(start, Math.min(start + batchSize, count));
+  }
+};
+
+/**
+ * Get the largest ID of a table
+ *
+ * @param {object} db SQLite database
+ * @param {string} tableName Name of the table
+ * @returns {number} Largest ID or 0 if the table is empty
+ */
+const maxId = (db, tableName) => db.prepare(`SELECT MAX(ID) AS id FROM ${tableName}`).get().id || 0;
+
+/**
+ * Generate synthetic developers, games and reviews in addition to the rows a database already
+ * has. Reviews favor the games with low IDs, so a few games have most of the reviews like popular
+ * games do. The scores of the games are not updated.
+ *
+ * @param {object} db SQLite database
+ * @param {object} options Options
+ * @param {number} [options.developers] Number of developers to generate
+ * @param {number} [options.games] Number of games to generate
+ * @param {number} [options.reviews] Number of reviews to generate
+ * @param {number} [options.seed] Seed of the pseudo-random data
+ * @param {number} [options.batchSize] Number of rows inserted per transaction
+ */
+const generateData = (db, options) => {
+  const {
+    developers,
+    games,
+    reviews,
+    seed,
+    batchSize,
+  } = _.defaults({}, options, {
+    developers: 0,
+    games: 0,
+    reviews: 0,
+    seed: 1,
+    batchSize: 10000,
+  });
+  const random = createRandom(seed);
+  const randomInt = (min, max) => min + Math.floor(random() * (max - min + 1));
+
+  const firstDeveloper = maxId(db, 'DEVELOPERS') + 1;
+  insertRows(
+    db,
+    'INSERT INTO DEVELOPERS (NAME, WEBSITE) VALUES (:name, :website)',
+    developers,
+    batchSize,
+    index => ({
+      name: `Developer ${firstDeveloper + index}`,
+      website: `https://developer-${firstDeveloper + index}.example.com/`,
+    }),
+  );
+
+  const developerCount = maxId(db, 'DEVELOPERS');
+  const firstGame = maxId(db, 'VIDEO_GAMES') + 1;
+  insertRows(
+    db,
+    `INSERT INTO VIDEO_GAMES (DEVELOPER_ID, NAME, RELEASE_DATE)
+    VALUES (:developerId, :name, :releaseDate)`,
+    games,
+    batchSize,
+    index => ({
+      developerId: developerCount ? randomInt(1, developerCount) : null,
+      name: `Game ${firstGame + index}`,
+      releaseDate: firstReleaseDay + randomInt(0, lastDay - firstReleaseDay),
+    }),
+  );
+
+  const gameCount = maxId(db, 'VIDEO_GAMES');
+  const reviewerCount = Math.max(Math.ceil(reviews / 20), 1);
+  const firstReview = maxId(db, 'REVIEWS') + 1;
+  if (reviews > 0 && gameCount === 0) {
+    throw new Error('Reviews cannot be generated without games.');
+  }
+  insertRows(
+    db,
+    `INSERT INTO REVIEWS (GAME_ID, REVIEW_TEXT, SCORE, REVIEWER, REVIEW_DATE)
+    VALUES (:gameId, :reviewText, :score, :reviewer, :reviewDate)`,
+    reviews,
+    batchSize,
+    index => ({
+      gameId: 1 + Math.floor((random() ** 2) * gameCount),
+      reviewText: `Synthetic review ${firstReview + index}`,
+      score: randomInt(0, 10) / 2,
+      reviewer: `Reviewer ${randomInt(1, reviewerCount)}`,
+      reviewDate: firstReviewDay
+        + (randomInt(0, (lastDay - firstReviewDay) * daySeconds) / daySeconds),
+    }),
+  );
+};
+
+module.exports = { generateData };
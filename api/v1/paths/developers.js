@@ -4,6 +4,8 @@ const _ = require('lodash');
 const developersDao = require('../db/oracledb/developers-dao');
 
 const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
+const { isUnpaginated, sendDocumentStream } = appRoot.require('utils/document-stream');
 const { openapi: { paths } } = appRoot.require('utils/load-openapi');
 
 /**
@@ -11,8 +13,11 @@ const { openapi: { paths } } = appRoot.require('utils/load-openapi');
  */
 const get = async (req, res) => {
   try {
+    if (isUnpaginated(req.query)) {
+      return sendDocumentStream(req, res, await developersDao.streamDevelopers(req.query));
+    }
     const result = await developersDao.getDevelopers(req.query);
-    return res.send(result);
+    return sendDocument(req, res, result);
   } catch (err) {
     return errorHandler(res, err);
   }
@@ -3,6 +3,7 @@ const appRoot = require('app-root-path');
 const developersDao = require('../../db/oracledb/developers-dao');
 
 const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
 const { openapi: { paths } } = appRoot.require('utils/load-openapi');
 
 /**
@@ -11,11 +12,11 @@ const { openapi: { paths } } = appRoot.require('utils/load-openapi');
 const get = async (req, res) => {
   try {
     const { developerId } = req.params;
-    const result = await developersDao.getDeveloperById(developerId);
+    const result = await developersDao.getDeveloperById(developerId, req.query);
     if (!result) {
       errorBuilder(res, 404, 'A developer with the specified ID was not found.');
     } else {
-      res.send(result);
+      sendDocument(req, res, result);
     }
   } catch (err) {
     errorHandler(res, err);
@@ -50,11 +51,10 @@ const patch = async (req, res) => {
       errorBuilder(res, 400, ['Developer id in path does not match id in body.']);
     } else {
       const result = await developersDao.patchDeveloper(developerId, req.body);
-      if (result.rowsAffected < 1) {
+      if (!result) {
         errorBuilder(res, 404, 'A developer with the specified ID was not found.');
       } else {
-        const updatedResult = await developersDao.getDeveloperById(developerId);
-        res.send(updatedResult);
+        res.send(result);
       }
     }
   } catch (err) {
@@ -0,0 +1,28 @@
+const appRoot = require('app-root-path');
+
+const statsDao = require('../../../db/oracledb/stats-dao');
+
+const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
+const { openapi: { paths } } = appRoot.require('utils/load-openapi');
+
+/**
+ * @summary Get the review statistics of the games of a developer
+ */
+const get = async (req, res) => {
+  try {
+    const { developerId } = req.params;
+    const result = await statsDao.getDeveloperStats(developerId);
+    if (!result) {
+      errorBuilder(res, 404, 'A developer with the specified ID was not found.');
+    } else {
+      sendDocument(req, res, result);
+    }
+  } catch (err) {
+    errorHandler(res, err);
+  }
+};
+
+get.apiDoc = paths['/developers/{developerId}/stats'].get;
+
+module.exports = { get };
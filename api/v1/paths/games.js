@@ -2,16 +2,30 @@ const appRoot = require('app-root-path');
 
 const gamesDao = require('../db/oracledb/games-dao');
 
+const { isParentKeyNotFound } = appRoot.require('api/v1/db/oracledb/with-connection');
 const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
+const { isUnpaginated, sendDocumentStream } = appRoot.require('utils/document-stream');
 const { openapi: { paths } } = appRoot.require('utils/load-openapi');
+const { isValidCursor } = appRoot.require('utils/paginator');
 
 /**
  * @summary Get games
  */
 const get = async (req, res) => {
   try {
+    if (isUnpaginated(req.query)) {
+      if (req.query.include) {
+        return errorBuilder(res, 400, ['include is not supported when page[size] is 0.']);
+      }
+      return sendDocumentStream(req, res, await gamesDao.streamGames(req.query));
+    }
+    const cursor = req.query['page[after]'];
+    if (cursor !== undefined && !isValidCursor(cursor, req.query.sort)) {
+      return errorBuilder(res, 400, ['page[after] is not a valid cursor for the requested sort.']);
+    }
     const result = await gamesDao.getGames(req.query);
-    return res.send(result);
+    return sendDocument(req, res, result);
   } catch (err) {
     return errorHandler(res, err);
   }
@@ -22,14 +36,14 @@ const get = async (req, res) => {
  */
 const post = async (req, res) => {
   try {
-    if (!await gamesDao.isValidDeveloper(req.body.data.attributes.developerId)) {
+    const result = await gamesDao.postGame(req.body);
+    res.status(201).send(result);
+  } catch (err) {
+    if (isParentKeyNotFound(err)) {
       errorBuilder(res, 400, ['A developer with developerId does not exist.']);
     } else {
-      const result = await gamesDao.postGame(req.body);
-      res.status(201).send(result);
+      errorHandler(res, err);
     }
-  } catch (err) {
-    errorHandler(res, err);
   }
 };
 
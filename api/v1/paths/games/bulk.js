@@ -0,0 +1,35 @@
+const appRoot = require('app-root-path');
+
+const gamesDao = require('../../db/oracledb/games-dao');
+
+const { errorHandler } = appRoot.require('errors/errors');
+const { openapi: { paths } } = appRoot.require('utils/load-openapi');
+
+/**
+ * @summary Create games in bulk
+ */
+const post = async (req, res) => {
+  try {
+    const result = await gamesDao.postGames(req.body.data);
+    res.send(result);
+  } catch (err) {
+    errorHandler(res, err);
+  }
+};
+
+/**
+ * @summary Update games in bulk
+ */
+const patch = async (req, res) => {
+  try {
+    const result = await gamesDao.patchGames(req.body.data);
+    res.send(result);
+  } catch (err) {
+    errorHandler(res, err);
+  }
+};
+
+post.apiDoc = paths['/games/bulk'].post;
+patch.apiDoc = paths['/games/bulk'].patch;
+
+module.exports = { post, patch };
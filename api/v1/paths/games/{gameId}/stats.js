@@ -0,0 +1,28 @@
+const appRoot = require('app-root-path');
+
+const statsDao = require('../../../db/oracledb/stats-dao');
+
+const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
+const { openapi: { paths } } = appRoot.require('utils/load-openapi');
+
+/**
+ * @summary Get the review statistics of a game
+ */
+const get = async (req, res) => {
+  try {
+    const { gameId } = req.params;
+    const result = await statsDao.getGameStats(gameId);
+    if (!result) {
+      errorBuilder(res, 404, 'A game with the specified ID was not found.');
+    } else {
+      sendDocument(req, res, result);
+    }
+  } catch (err) {
+    errorHandler(res, err);
+  }
+};
+
+get.apiDoc = paths['/games/{gameId}/stats'].get;
+
+module.exports = { get };
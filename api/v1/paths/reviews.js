@@ -2,16 +2,27 @@ const appRoot = require('app-root-path');
 
 const reviewsDao = require('../db/oracledb/reviews-dao');
 
+const { isParentKeyNotFound } = appRoot.require('api/v1/db/oracledb/with-connection');
 const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
+const { isUnpaginated, sendDocumentStream } = appRoot.require('utils/document-stream');
 const { openapi: { paths } } = appRoot.require('utils/load-openapi');
+const { isValidCursor } = appRoot.require('utils/paginator');
 
 /**
  * @summary Get reviews
  */
 const get = async (req, res) => {
   try {
+    if (isUnpaginated(req.query)) {
+      return sendDocumentStream(req, res, await reviewsDao.streamReviews(req.query));
+    }
+    const cursor = req.query['page[after]'];
+    if (cursor !== undefined && !isValidCursor(cursor, req.query.sort)) {
+      return errorBuilder(res, 400, ['page[after] is not a valid cursor for the requested sort.']);
+    }
     const result = await reviewsDao.getReviews(req.query);
-    return res.send(result);
+    return sendDocument(req, res, result);
   } catch (err) {
     return errorHandler(res, err);
   }
@@ -22,12 +33,24 @@ const get = async (req, res) => {
  */
 const post = async (req, res) => {
   try {
-    if (!await reviewsDao.isValidGame(req.body.data.attributes.gameId)) {
+    const result = await reviewsDao.postReview(req.body);
+    res.status(201).send(result);
+  } catch (err) {
+    if (isParentKeyNotFound(err)) {
       errorBuilder(res, 400, ['A game with gameId does not exist.']);
     } else {
-      const result = await reviewsDao.postReview(req.body);
-      res.status(201).send(result);
+      errorHandler(res, err);
     }
+  }
+};
+
+/**
+ * @summary Delete reviews in bulk
+ */
+const del = async (req, res) => {
+  try {
+    const result = await reviewsDao.deleteReviews(req.query.ids);
+    res.send(result);
   } catch (err) {
     errorHandler(res, err);
   }
@@ -35,5 +58,6 @@ const post = async (req, res) => {
 
 get.apiDoc = paths['/reviews'].get;
 post.apiDoc = paths['/reviews'].post;
+del.apiDoc = paths['/reviews'].delete;
 
-module.exports = { get, post };
+module.exports = { get, post, delete: del };
@@ -0,0 +1,35 @@
+const appRoot = require('app-root-path');
+
+const reviewsDao = require('../../db/oracledb/reviews-dao');
+
+const { errorHandler } = appRoot.require('errors/errors');
+const { openapi: { paths } } = appRoot.require('utils/load-openapi');
+
+/**
+ * @summary Create reviews in bulk
+ */
+const post = async (req, res) => {
+  try {
+    const result = await reviewsDao.postReviews(req.body.data);
+    res.send(result);
+  } catch (err) {
+    errorHandler(res, err);
+  }
+};
+
+/**
+ * @summary Update reviews in bulk
+ */
+const patch = async (req, res) => {
+  try {
+    const result = await reviewsDao.patchReviews(req.body.data);
+    res.send(result);
+  } catch (err) {
+    errorHandler(res, err);
+  }
+};
+
+post.apiDoc = paths['/reviews/bulk'].post;
+patch.apiDoc = paths['/reviews/bulk'].patch;
+
+module.exports = { post, patch };
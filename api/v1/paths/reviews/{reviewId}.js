@@ -3,6 +3,7 @@ const appRoot = require('app-root-path');
 const reviewsDao = require('../../db/oracledb/reviews-dao');
 
 const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
 const { openapi: { paths } } = appRoot.require('utils/load-openapi');
 
 /**
@@ -11,11 +12,11 @@ const { openapi: { paths } } = appRoot.require('utils/load-openapi');
 const get = async (req, res) => {
   try {
     const { reviewId } = req.params;
-    const result = await reviewsDao.getReviewById(reviewId);
+    const result = await reviewsDao.getReviewById(reviewId, req.query);
     if (!result) {
       errorBuilder(res, 404, 'A review with the specified ID was not found.');
     } else {
-      res.send(result);
+      sendDocument(req, res, result);
     }
   } catch (err) {
     errorHandler(res, err);
@@ -49,11 +50,10 @@ const patch = async (req, res) => {
     if (reviewId !== req.body.data.id) {
       errorBuilder(res, 400, ['Review id in path does not match id in body.']);
     } else {
-      const response = await reviewsDao.patchReview(reviewId, req.body);
-      if (response.rowsAffected < 1) {
+      const result = await reviewsDao.patchReview(reviewId, req.body);
+      if (!result) {
         errorBuilder(res, 404, 'A review with the specified ID was not found.');
       } else {
-        const result = await reviewsDao.getReviewById(reviewId);
         res.send(result);
       }
     }
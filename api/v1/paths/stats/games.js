@@ -0,0 +1,23 @@
+const appRoot = require('app-root-path');
+
+const statsDao = require('../../db/oracledb/stats-dao');
+
+const { errorHandler } = appRoot.require('errors/errors');
+const { sendDocument } = appRoot.require('utils/conditional-get');
+const { openapi: { paths } } = appRoot.require('utils/load-openapi');
+
+/**
+ * @summary Get the review statistics of several games
+ */
+const get = async (req, res) => {
+  try {
+    const result = await statsDao.getGamesStats(req.query);
+    sendDocument(req, res, result);
+  } catch (err) {
+    errorHandler(res, err);
+  }
+};
+
+get.apiDoc = paths['/stats/games'].get;
+
+module.exports = { get };
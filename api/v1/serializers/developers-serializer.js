@@ -1,26 +1,28 @@
 const appRoot = require('app-root-path');
-const JsonApiSerializer = require('jsonapi-serializer').Serializer;
 const _ = require('lodash');
 
-const { serializerOptions } = appRoot.require('utils/jsonapi');
+const { documentStream } = appRoot.require('utils/document-stream');
+const { serializerOptions, compileSerializer, sparseFieldset } = appRoot.require('utils/jsonapi');
 const { openapi } = appRoot.require('utils/load-openapi');
 const { paginate } = appRoot.require('utils/paginator');
+const { timeStages } = appRoot.require('utils/request-timing');
 const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
 
 const developerResourceProp = openapi.definitions.DeveloperResource.properties;
-const developerResourceType = developerResourceProp.type.enum[0];
 const developerResourceKeys = _.keys(developerResourceProp.attributes.properties);
 const developerResourcePath = 'developers';
 const developerResourceUrl = resourcePathLink(apiBaseUrl, developerResourcePath);
+const developerSerializer = compileSerializer(developerResourceProp, developerResourcePath);
 
 /**
  * @summary Serialize developerResources to JSON API
  * @function
  * @param {[object]} rawdevelopers Raw data rows from data source
  * @param {object} query Query parameters
+ * @param {object} [pageResult] Page result if the rows are already paginated by the data source
  * @returns {object} Serialized developerResources object
  */
-const serializeDevelopers = (rawDevelopers, query) => {
+const serializeDevelopers = (rawDevelopers, query, pageResult) => {
   /**
    * Add pagination links and meta information to options if pagination is enabled
    */
@@ -29,14 +31,13 @@ const serializeDevelopers = (rawDevelopers, query) => {
     number: query['page[number]'],
   };
 
-  const pagination = paginate(rawDevelopers, pageQuery);
-  pagination.totalResults = rawDevelopers.length;
+  const pagination = paginate(rawDevelopers, pageQuery, pageResult);
   rawDevelopers = pagination.paginatedRows;
 
   const topLevelSelfLink = paramsLink(developerResourceUrl, query);
   const serializerArgs = {
     identifierField: 'id',
-    resourceKeys: developerResourceKeys,
+    resourceKeys: sparseFieldset(developerResourceKeys, query['fields[developer]']),
     pagination,
     resourcePath: developerResourcePath,
     topLevelSelfLink,
@@ -44,31 +45,62 @@ const serializeDevelopers = (rawDevelopers, query) => {
     enableDataLinks: true,
   };
 
-  return new JsonApiSerializer(
-    developerResourceType,
-    serializerOptions(serializerArgs),
-  ).serialize(rawDevelopers);
+  return developerSerializer(rawDevelopers, serializerOptions(serializerArgs));
 };
 
 /**
  * @summary Serialize developerResource to JSON API
  * @function
  * @param {object} rawDeveloper Raw data row from data source
+ * @param {object} [query] Query parameters
  * @returns {object} Serialized developerResource object
  */
-const serializeDeveloper = (rawDeveloper) => {
+const serializeDeveloper = (rawDeveloper, query = {}) => {
   const topLevelSelfLink = resourcePathLink(developerResourceUrl, rawDeveloper.id);
   const serializerArgs = {
     identifierField: 'id',
-    resourceKeys: developerResourceKeys,
+    resourceKeys: sparseFieldset(developerResourceKeys, query['fields[developer]']),
     resourcePath: developerResourcePath,
     topLevelSelfLink,
     enableDataLinks: true,
   };
 
-  return new JsonApiSerializer(
-    developerResourceType,
-    serializerOptions(serializerArgs),
-  ).serialize(rawDeveloper);
+  return developerSerializer(rawDeveloper, serializerOptions(serializerArgs));
 };
-module.exports = { serializeDevelopers, serializeDeveloper };
+
+/**
+ * @summary Create a stream which serializes developerResources to JSON API row by row
+ * @function
+ * @param {object} query Query parameters
+ * @returns {stream.Transform} Stream of the serialized developerResources document
+ */
+const serializeDevelopersStream = (query) => {
+  const topLevelSelfLink = paramsLink(developerResourceUrl, query);
+  const serializerArgs = {
+    identifierField: 'id',
+    resourceKeys: sparseFieldset(developerResourceKeys, query['fields[developer]']),
+    resourcePath: developerResourcePath,
+    topLevelSelfLink,
+    enableDataLinks: true,
+  };
+
+  return documentStream(developerSerializer, serializerOptions(serializerArgs));
+};
+
+/**
+ * @summary Serialize a developer into a resource object to include in a compound document
+ * @function
+ * @param {object} rawDeveloper Raw data row from data source
+ * @param {string[]} [fields] Fields requested by fields[developer]
+ * @returns {object} Serialized developerResource
+ */
+const serializeDeveloperResource = (rawDeveloper, fields) => developerSerializer.serializeRecord(
+  rawDeveloper,
+  { id: 'id', attributes: sparseFieldset(developerResourceKeys, fields), enableDataLinks: true },
+);
+module.exports = timeStages('serialize', {
+  serializeDevelopers,
+  serializeDevelopersStream,
+  serializeDeveloper,
+  serializeDeveloperResource,
+});
@@ -1,30 +1,95 @@
 const appRoot = require('app-root-path');
-const JsonApiSerializer = require('jsonapi-serializer').Serializer;
 const _ = require('lodash');
 
-const { serializerOptions } = appRoot.require('utils/jsonapi');
+const { documentStream } = appRoot.require('utils/document-stream');
+const {
+  serializerOptions,
+  compileSerializer,
+  sparseFieldset,
+  bulkResultsDocument,
+} = appRoot.require('utils/jsonapi');
 const { openapi } = appRoot.require('utils/load-openapi');
 const { paginate } = appRoot.require('utils/paginator');
+const { timeStage, timeStages } = appRoot.require('utils/request-timing');
 const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
+const { serializeDeveloperResource } = require('./developers-serializer');
+const { serializeReviewResource } = require('./reviews-serializer');
 
 const gameResourceProp = openapi.definitions.GameResource.properties;
-const gameResourceType = gameResourceProp.type.enum[0];
 const gameResourceKeys = _.keys(gameResourceProp.attributes.properties);
 const gameResourcePath = 'games';
 const gameResourceUrl = resourcePathLink(apiBaseUrl, gameResourcePath);
+const gameSerializer = compileSerializer(gameResourceProp, gameResourcePath);
+const developerResourceType = openapi.definitions.DeveloperType.enum[0];
+const reviewResourceType = openapi.definitions.ReviewType.enum[0];
 
 /**
  * @summary Converts raw game data from db into types defined by the openapi
  */
-const gameConverter = (games) => {
+const gameConverter = timeStage('convert', (games) => {
   _.forEach(games, (game) => {
-    // convert score to float
-    game.score = parseFloat(game.score);
+    // fields left out by a sparse fieldset are not selected
+    if (_.has(game, 'score')) {
+      // convert score to float
+      game.score = parseFloat(game.score);
+    }
 
-    // convert db date format to mm/dd/yyyy format specified in openapi
-    const date = new Date(game.releaseDate);
-    game.releaseDate = `${date.getFullYear()}-${date.getMonth() + 1}-${date.getDate()}`;
+    if (_.has(game, 'reviewCount')) {
+      game.reviewCount = parseInt(game.reviewCount, 10);
+    }
+
+    if (_.has(game, 'releaseDate')) {
+      // convert db date format to mm/dd/yyyy format specified in openapi
+      const date = new Date(game.releaseDate);
+      game.releaseDate = `${date.getFullYear()}-${date.getMonth() + 1}-${date.getDate()}`;
+    }
+  });
+});
+
+/**
+ * @summary Add the relationships of each game and the related resources requested by include to
+ *          a serialized document
+ * @function
+ * @param {object} document Serialized gameResource or gameResources document
+ * @param {object[]} rawGames Raw data rows of the serialized games in the same order
+ * @param {object} [related] Raw data rows of related resources keyed by relationship name
+ * @param {object} query Query parameters
+ * @returns {object} Compound document
+ */
+const includeRelated = (document, rawGames, related, query) => {
+  if (_.isEmpty(related)) {
+    return document;
+  }
+  const { developer: developers, reviews } = related;
+  const reviewsByGame = _.groupBy(reviews, ({ gameId }) => String(gameId));
+
+  _.forEach(_.castArray(document.data), (resource, index) => {
+    const { developerId } = rawGames[index];
+    resource.relationships = {};
+    if (developers) {
+      resource.relationships.developer = {
+        data: _.isNil(developerId)
+          ? null
+          : { type: developerResourceType, id: String(developerId) },
+      };
+    }
+    if (reviews) {
+      resource.relationships.reviews = {
+        data: _.map(reviewsByGame[resource.id], ({ id }) => ({
+          type: reviewResourceType,
+          id: String(id),
+        })),
+      };
+    }
   });
+
+  document.included = _.concat(
+    _.map(developers, developer => (
+      serializeDeveloperResource(developer, query['fields[developer]'])
+    )),
+    _.map(reviews, review => serializeReviewResource(review, query['fields[review]'])),
+  );
+  return document;
 };
 
 /**
@@ -32,9 +97,11 @@ const gameConverter = (games) => {
  * @function
  * @param {[object]} rawGames Raw data rows from data source
  * @param {object} query Query parameters
+ * @param {object} [pageResult] Page result if the rows are already paginated by the data source
+ * @param {object} [related] Raw data rows of related resources keyed by relationship name
  * @returns {object} Serialized gameResources object
  */
-const serializeGames = (rawGames, query) => {
+const serializeGames = (rawGames, query, pageResult, related) => {
   gameConverter(rawGames);
 
   /**
@@ -45,48 +112,83 @@ const serializeGames = (rawGames, query) => {
     number: query['page[number]'],
   };
 
-  const pagination = paginate(rawGames, pageQuery);
-  pagination.totalResults = rawGames.length;
+  const pagination = paginate(rawGames, pageQuery, pageResult);
   rawGames = pagination.paginatedRows;
 
   const topLevelSelfLink = paramsLink(gameResourceUrl, query);
   const serializerArgs = {
     identifierField: 'id',
-    resourceKeys: gameResourceKeys,
+    resourceKeys: sparseFieldset(gameResourceKeys, query['fields[game]']),
     pagination,
     resourcePath: gameResourcePath,
     topLevelSelfLink,
-    query: _.omit(query, 'page[size]', 'page[number]'),
+    query: _.omit(query, 'page[size]', 'page[number]', 'page[after]'),
     enableDataLinks: true,
   };
 
-  return new JsonApiSerializer(
-    gameResourceType,
-    serializerOptions(serializerArgs),
-  ).serialize(rawGames);
+  const document = gameSerializer(rawGames, serializerOptions(serializerArgs));
+  return includeRelated(document, rawGames, related, query);
 };
 
 /**
  * @summary Serialize gameResource to JSON API
  * @function
  * @param {object} rawGame Raw data row from data source
+ * @param {object} [query] Query parameters
+ * @param {object} [related] Raw data rows of related resources keyed by relationship name
  * @returns {object} Serialized gameResource object
  */
-const serializeGame = (rawGame) => {
+const serializeGame = (rawGame, query = {}, related) => {
   gameConverter([rawGame]);
 
   const topLevelSelfLink = resourcePathLink(gameResourceUrl, rawGame.id);
   const serializerArgs = {
     identifierField: 'id',
-    resourceKeys: gameResourceKeys,
+    resourceKeys: sparseFieldset(gameResourceKeys, query['fields[game]']),
+    resourcePath: gameResourcePath,
+    topLevelSelfLink,
+    enableDataLinks: true,
+  };
+
+  const document = gameSerializer(rawGame, serializerOptions(serializerArgs));
+  return includeRelated(document, [rawGame], related, query);
+};
+
+/**
+ * @summary Create a stream which serializes gameResources to JSON API row by row
+ * @function
+ * @param {object} query Query parameters
+ * @returns {stream.Transform} Stream of the serialized gameResources document
+ */
+const serializeGamesStream = (query) => {
+  const topLevelSelfLink = paramsLink(gameResourceUrl, query);
+  const serializerArgs = {
+    identifierField: 'id',
+    resourceKeys: sparseFieldset(gameResourceKeys, query['fields[game]']),
     resourcePath: gameResourcePath,
     topLevelSelfLink,
     enableDataLinks: true,
   };
 
-  return new JsonApiSerializer(
-    gameResourceType,
+  return documentStream(
+    gameSerializer,
     serializerOptions(serializerArgs),
-  ).serialize(rawGame);
+    game => gameConverter([game]),
+  );
 };
-module.exports = { serializeGames, serializeGame, gameConverter };
+
+/**
+ * @summary Serialize the results of a bulk operation on gameResources to JSON API
+ * @function
+ * @param {object[]} results Result of each game in the order of the request
+ * @returns {object} Serialized bulk results object
+ */
+const serializeGameResults = results => bulkResultsDocument(gameSerializer, results);
+module.exports = _.assign(timeStages('serialize', {
+  serializeGames,
+  serializeGamesStream,
+  serializeGameResults,
+  serializeGame,
+}), {
+  gameConverter,
+});
@@ -1,37 +1,49 @@
 const appRoot = require('app-root-path');
-const JsonApiSerializer = require('jsonapi-serializer').Serializer;
 const _ = require('lodash');
 
-const { serializerOptions } = appRoot.require('utils/jsonapi');
+const { documentStream } = appRoot.require('utils/document-stream');
+const {
+  serializerOptions,
+  compileSerializer,
+  sparseFieldset,
+  bulkResultsDocument,
+} = appRoot.require('utils/jsonapi');
 const { openapi } = appRoot.require('utils/load-openapi');
 const { paginate } = appRoot.require('utils/paginator');
+const { timeStage, timeStages } = appRoot.require('utils/request-timing');
 const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
 
 const reviewResourceProp = openapi.definitions.ReviewResource.properties;
-const reviewResourceType = reviewResourceProp.type.enum[0];
 const reviewResourceKeys = _.keys(reviewResourceProp.attributes.properties);
 const reviewResourcePath = 'reviews';
 const reviewResourceUrl = resourcePathLink(apiBaseUrl, reviewResourcePath);
+const reviewSerializer = compileSerializer(reviewResourceProp, reviewResourcePath);
 
 /**
  * @summary Converts raw review data from db into types defined by the openapi
  */
-const reviewConverter = (reviews) => {
+const reviewConverter = timeStage('convert', (reviews) => {
   _.forEach(reviews, (review) => {
-    review.score = parseFloat(review.score);
-    const date = new Date(review.reviewDate);
-    review.reviewDate = `${date.getFullYear()}-${date.getMonth() + 1}-${date.getDate()}`;
+    // fields left out by a sparse fieldset are not selected
+    if (_.has(review, 'score')) {
+      review.score = parseFloat(review.score);
+    }
+    if (_.has(review, 'reviewDate')) {
+      const date = new Date(review.reviewDate);
+      review.reviewDate = `${date.getFullYear()}-${date.getMonth() + 1}-${date.getDate()}`;
+    }
   });
-};
+});
 
 /**
  * @summary Serialize reviewResources to JSON API
  * @function
  * @param {object[]} rawReviews Raw data rows from data source
  * @param {object} query Query parameters
+ * @param {object} [pageResult] Page result if the rows are already paginated by the data source
  * @returns {object} Serialized reviewResources object
  */
-const serializeReviews = (rawReviews, query) => {
+const serializeReviews = (rawReviews, query, pageResult) => {
   reviewConverter(rawReviews);
 
   /**
@@ -42,48 +54,96 @@ const serializeReviews = (rawReviews, query) => {
     number: query['page[number]'],
   };
 
-  const pagination = paginate(rawReviews, pageQuery);
-  pagination.totalResults = rawReviews.length;
+  const pagination = paginate(rawReviews, pageQuery, pageResult);
   rawReviews = pagination.paginatedRows;
 
   const topLevelSelfLink = paramsLink(reviewResourceUrl, query);
   const serializerArgs = {
     identifierField: 'id',
-    resourceKeys: reviewResourceKeys,
+    resourceKeys: sparseFieldset(reviewResourceKeys, query['fields[review]']),
     pagination,
     resourcePath: reviewResourcePath,
     topLevelSelfLink,
-    query: _.omit(query, 'page[size]', 'page[number]'),
+    query: _.omit(query, 'page[size]', 'page[number]', 'page[after]'),
     enableDataLinks: true,
   };
 
-  return new JsonApiSerializer(
-    reviewResourceType,
-    serializerOptions(serializerArgs),
-  ).serialize(rawReviews);
+  return reviewSerializer(rawReviews, serializerOptions(serializerArgs));
 };
 
 /**
  * @summary Serialize reviewResource to JSON API
  * @function
  * @param {object} rawReview Raw data row from data source
+ * @param {object} [query] Query parameters
  * @returns {object} Serialized reviewResource object
  */
-const serializeReview = (rawReview) => {
+const serializeReview = (rawReview, query = {}) => {
   reviewConverter([rawReview]);
 
   const topLevelSelfLink = resourcePathLink(reviewResourceUrl, rawReview.id);
   const serializerArgs = {
     identifierField: 'id',
-    resourceKeys: reviewResourceKeys,
+    resourceKeys: sparseFieldset(reviewResourceKeys, query['fields[review]']),
     resourcePath: reviewResourcePath,
     topLevelSelfLink,
     enableDataLinks: true,
   };
 
-  return new JsonApiSerializer(
-    reviewResourceType,
+  return reviewSerializer(rawReview, serializerOptions(serializerArgs));
+};
+
+/**
+ * @summary Create a stream which serializes reviewResources to JSON API row by row
+ * @function
+ * @param {object} query Query parameters
+ * @returns {stream.Transform} Stream of the serialized reviewResources document
+ */
+const serializeReviewsStream = (query) => {
+  const topLevelSelfLink = paramsLink(reviewResourceUrl, query);
+  const serializerArgs = {
+    identifierField: 'id',
+    resourceKeys: sparseFieldset(reviewResourceKeys, query['fields[review]']),
+    resourcePath: reviewResourcePath,
+    topLevelSelfLink,
+    enableDataLinks: true,
+  };
+
+  return documentStream(
+    reviewSerializer,
     serializerOptions(serializerArgs),
-  ).serialize(rawReview);
+    review => reviewConverter([review]),
+  );
 };
-module.exports = { serializeReviews, serializeReview, reviewConverter };
+
+/**
+ * @summary Serialize a review into a resource object to include in a compound document
+ * @function
+ * @param {object} rawReview Raw data row from data source
+ * @param {string[]} [fields] Fields requested by fields[review]
+ * @returns {object} Serialized reviewResource
+ */
+const serializeReviewResource = (rawReview, fields) => {
+  reviewConverter([rawReview]);
+  return reviewSerializer.serializeRecord(
+    rawReview,
+    { id: 'id', attributes: sparseFieldset(reviewResourceKeys, fields), enableDataLinks: true },
+  );
+};
+
+/**
+ * @summary Serialize the results of a bulk operation on reviewResources to JSON API
+ * @function
+ * @param {object[]} results Result of each review in the order of the request
+ * @returns {object} Serialized bulk results object
+ */
+const serializeReviewResults = results => bulkResultsDocument(reviewSerializer, results);
+module.exports = _.assign(timeStages('serialize', {
+  serializeReviews,
+  serializeReviewsStream,
+  serializeReviewResults,
+  serializeReview,
+  serializeReviewResource,
+}), {
+  reviewConverter,
+});
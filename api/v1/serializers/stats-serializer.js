@@ -0,0 +1,100 @@
+const appRoot = require('app-root-path');
+const _ = require('lodash');
+
+const { serializerOptions, compileSerializer } = appRoot.require('utils/jsonapi');
+const { openapi } = appRoot.require('utils/load-openapi');
+const { timeStage, timeStages } = appRoot.require('utils/request-timing');
+const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
+
+const gameStatsResourceProp = openapi.definitions.GameStatsResource.properties;
+const developerStatsResourceProp = openapi.definitions.DeveloperStatsResource.properties;
+const statsResourceKeys = _.keys(gameStatsResourceProp.attributes.properties);
+const gameStatsSerializer = compileSerializer(gameStatsResourceProp, 'games', 'stats');
+const developerStatsSerializer = compileSerializer(
+  developerStatsResourceProp,
+  'developers',
+  'stats',
+);
+const statsGamesUrl = resourcePathLink(resourcePathLink(apiBaseUrl, 'stats'), 'games');
+
+/** Scores of the buckets of the score histogram. A bucket counts the scores below the next one. */
+const scoreBuckets = _.range(1, 6);
+
+/**
+ * @summary Converts raw review statistics from db into types defined by the openapi
+ * @function
+ * @param {object} rawStats Raw data row with a histogramN column for each bucket of scores
+ * @returns {object} Review statistics
+ */
+const statsConverter = timeStage('convert', rawStats => ({
+  id: rawStats.id,
+  reviewCount: parseInt(rawStats.reviewCount, 10),
+  meanScore: _.isNil(rawStats.meanScore) ? null : parseFloat(rawStats.meanScore),
+  minScore: _.isNil(rawStats.minScore) ? null : parseFloat(rawStats.minScore),
+  maxScore: _.isNil(rawStats.maxScore) ? null : parseFloat(rawStats.maxScore),
+  scoreHistogram: _.map(scoreBuckets, bucket => parseInt(rawStats[`histogram${bucket}`], 10)),
+}));
+
+/**
+ * @summary Build the serializer options of statistics resources
+ * @function
+ * @param {string} resourcePath resource path
+ * @param {string} topLevelSelfLink self link of the document
+ * @returns {object} JSON API serializer options
+ */
+const statsOptions = (resourcePath, topLevelSelfLink) => serializerOptions({
+  identifierField: 'id',
+  resourceKeys: statsResourceKeys,
+  resourcePath,
+  topLevelSelfLink,
+  enableDataLinks: true,
+});
+
+/**
+ * @summary Serialize the review statistics of a game to JSON API
+ * @function
+ * @param {object} stats Review statistics of the game converted by statsConverter
+ * @returns {object} Serialized gameStatsResource object
+ */
+const serializeGameStats = (stats) => {
+  const topLevelSelfLink = resourcePathLink(
+    resourcePathLink(resourcePathLink(apiBaseUrl, 'games'), stats.id),
+    'stats',
+  );
+  return gameStatsSerializer(stats, statsOptions('games', topLevelSelfLink));
+};
+
+/**
+ * @summary Serialize the review statistics of several games to JSON API
+ * @function
+ * @param {object[]} stats Review statistics of each game converted by statsConverter
+ * @param {object} query Query parameters
+ * @returns {object} Serialized gameStatsResources object
+ */
+const serializeGamesStats = (stats, query) => gameStatsSerializer(
+  stats,
+  statsOptions('games', paramsLink(statsGamesUrl, query)),
+);
+
+/**
+ * @summary Serialize the review statistics of the games of a developer to JSON API
+ * @function
+ * @param {object} stats Review statistics of the developer converted by statsConverter
+ * @returns {object} Serialized developerStatsResource object
+ */
+const serializeDeveloperStats = (stats) => {
+  const topLevelSelfLink = resourcePathLink(
+    resourcePathLink(resourcePathLink(apiBaseUrl, 'developers'), stats.id),
+    'stats',
+  );
+  return developerStatsSerializer(stats, statsOptions('developers', topLevelSelfLink));
+};
+
+module.exports = _.assign(timeStages('serialize', {
+  serializeGameStats,
+  serializeGamesStats,
+  serializeDeveloperStats,
+}), {
+  scoreBuckets,
+  statsConverter,
+});
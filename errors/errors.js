@@ -101,6 +101,19 @@ const internalServerError = detail => new JsonApiError(error(
   detail,
 ));
 
+/**
+ * [503] Return a Service Unavailable error object
+ *
+ * @param {string} detail A human-readable explanation
+ * @returns {object} Service Unavailable error object
+ */
+const serviceUnavailable = detail => new JsonApiError(error(
+  '503',
+  'Service Unavailable',
+  '1503',
+  detail,
+));
+
 /**
  * Function to build an error response
  *
@@ -115,6 +128,7 @@ const errorBuilder = (res, status, detail) => {
     403: forbidden(detail),
     404: notFound(detail),
     409: conflict(detail),
+    503: serviceUnavailable(detail),
   };
   res.status(status).send(errorDictionary[status]);
 };
@@ -126,6 +140,12 @@ const errorBuilder = (res, status, detail) => {
  * @param {object} err Error
  */
 const errorHandler = (res, err) => {
+  // errors raised when the database is overloaded ask the client to retry shortly
+  if (err.status === 503) {
+    res.set('Retry-After', '1');
+    errorBuilder(res, 503, err.message);
+    return;
+  }
   const detail = 'The application encountered an unexpected condition.';
   // Not all errors will have a stack associated with it
   let message = err.stack || err;
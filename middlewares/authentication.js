@@ -1,15 +1,99 @@
 const appRoot = require('app-root-path');
 const config = require('config');
-const basicAuth = require('express-basic-auth');
+const crypto = require('crypto');
+const _ = require('lodash');
 
 const { unauthorized } = appRoot.require('errors/errors');
+const { createCache } = appRoot.require('utils/cache');
+const { hashPassword, verifyPassword } = appRoot.require('utils/password-hash');
+const { singleFlight } = appRoot.require('utils/single-flight');
 
-const { username, password } = config.authentication;
+const { username, password, users } = config.get('authentication');
 
-/** The middleware for basicAuth */
-const authentication = basicAuth({
-  users: { [username]: password },
-  unauthorizedResponse: unauthorized,
+/**
+ * Password hashes keyed by username. The service accounts of users are configured with hashes and
+ * the plain password of the single configured user is hashed once at start up.
+ */
+const passwordHashes = new Map(_.toPairs(users));
+if (username) {
+  passwordHashes.set(username, hashPassword(password));
+}
+
+/** Hash which unknown usernames are checked against so that they take as long as known ones */
+const unknownUserHash = hashPassword('');
+
+/**
+ * Digests of Authorization headers which were verified recently keyed by username. A client which
+ * sends the same header again is authenticated without hashing its password.
+ */
+const verifiedHeaders = createCache('authentication');
+
+/**
+ * Parse the username and password of a Basic Authorization header
+ *
+ * @param {string} [authorization] Authorization header
+ * @returns {object} Username and password or undefined if the header is not a Basic header
+ */
+const parseCredentials = (authorization) => {
+  const match = /^Basic +([A-Za-z0-9+/=]+) *$/i.exec(authorization || '');
+  if (!match) {
+    return undefined;
+  }
+  const decoded = Buffer.from(match[1], 'base64').toString();
+  const separatorIndex = decoded.indexOf(':');
+  return separatorIndex < 0
+    ? undefined
+    : { name: decoded.slice(0, separatorIndex), pass: decoded.slice(separatorIndex + 1) };
+};
+
+/**
+ * Check the credentials of an Authorization header against the password hash of their user.
+ * Concurrent checks of the same header share a single hash computation.
+ *
+ * @param {object} args Arguments
+ * @param {string} args.authorization Authorization header
+ * @returns {Promise<boolean>} Promise object represents whether the credentials are valid
+ */
+const verifyCredentials = singleFlight('authentication', async ({ authorization }) => {
+  const { name, pass } = parseCredentials(authorization);
+  const passwordHash = passwordHashes.get(name);
+  const isValid = await verifyPassword(pass, passwordHash || unknownUserHash);
+  return isValid && passwordHash !== undefined;
 });
 
+/**
+ * Authenticate requests with HTTP Basic credentials. The digest of a verified Authorization header
+ * is cached for the TTL of the caches, so repeated requests cost a map lookup and a constant time
+ * comparison. Failed attempts are never cached and do not evict the header of a valid client. The
+ * username of an authenticated request is set as req.username.
+ *
+ * @param {Request} req Request
+ * @param {Response} res Response
+ * @param {Function} next Next middleware
+ */
+const authentication = async (req, res, next) => {
+  try {
+    const authorization = req.get('Authorization');
+    const credentials = parseCredentials(authorization);
+    if (credentials) {
+      const digest = crypto.createHash('sha256').update(authorization).digest();
+      const verifiedDigest = verifiedHeaders.get(credentials.name);
+      if (verifiedDigest && crypto.timingSafeEqual(digest, verifiedDigest)) {
+        req.username = credentials.name;
+        return next();
+      }
+
+      const generation = verifiedHeaders.generation();
+      if (await verifyCredentials({ authorization })) {
+        verifiedHeaders.set(credentials.name, digest, generation);
+        req.username = credentials.name;
+        return next();
+      }
+    }
+    return res.status(401).send(unauthorized());
+  } catch (err) {
+    return next(err);
+  }
+};
+
 module.exports = { authentication };
@@ -1,17 +1,67 @@
+const appRoot = require('app-root-path');
+const config = require('config');
 const expressWinston = require('express-winston');
+const _ = require('lodash');
 
 const { logger } = require('../utils/logger');
 
-// log the request body
-expressWinston.requestWhitelist.push('body');
+const { mode, sampleRate } = _.defaults(
+  {},
+  config.has('accessLog') ? config.get('accessLog') : {},
+  { mode: 'express', sampleRate: 1 },
+);
 
-/** The logger middleware for API requests/responses */
-const loggerMiddleware = expressWinston.logger({
-  winstonInstance: logger,
-  // The logging level that API messages will be logged to
-  level: 'api',
-  expressFormat: true,
-  colorize: true,
-});
+/**
+ * Log every request with express-winston through the logger
+ *
+ * @returns {RequestHandler} The logger middleware for API requests/responses
+ */
+const expressLoggerMiddleware = () => {
+  // log the request body
+  expressWinston.requestWhitelist.push('body');
 
-module.exports = { loggerMiddleware };
+  return expressWinston.logger({
+    winstonInstance: logger,
+    // The logging level that API messages will be logged to
+    level: 'api',
+    expressFormat: true,
+    colorize: true,
+  });
+};
+
+/**
+ * Buffer a structured record of each request once its response is finished. Successful requests
+ * are sampled at sampleRate while failed requests are always logged.
+ *
+ * @returns {RequestHandler} The logger middleware for API requests/responses
+ */
+const batchedLoggerMiddleware = () => {
+  const { logAccess } = appRoot.require('utils/access-log');
+  const { startTimer } = appRoot.require('utils/histogram');
+
+  return (req, res, next) => {
+    const timestamp = Date.now();
+    const elapsed = startTimer();
+    res.once('finish', () => {
+      const { statusCode } = res;
+      if (statusCode < 400 && Math.random() >= sampleRate) {
+        return;
+      }
+      logAccess({
+        timestamp,
+        method: req.method,
+        url: req.originalUrl,
+        statusCode,
+        responseTime: Math.round(elapsed() * 1000) / 1000,
+        contentLength: res.get('Content-Length'),
+        body: _.isEmpty(req.body) ? undefined : req.body,
+      });
+    });
+    next();
+  };
+};
+
+/** The logger middleware for API requests/responses of the configured access log mode */
+const loggerMiddleware = mode === 'batched' ? batchedLoggerMiddleware() : expressLoggerMiddleware();
+
+module.exports = { loggerMiddleware, expressLoggerMiddleware, batchedLoggerMiddleware };
@@ -0,0 +1,34 @@
+const _ = require('lodash');
+
+const { registerMetrics } = require('../utils/metrics');
+
+/** Number of responses keyed by status class */
+const stats = {
+  total: 0,
+  '2xx': 0,
+  '3xx': 0,
+  '4xx': 0,
+  '5xx': 0,
+};
+
+registerMetrics('requests', () => _.clone(stats));
+
+/**
+ * The middleware which counts API responses by status class
+ *
+ * @param {object} req Request
+ * @param {object} res Response
+ * @param {Function} next Next middleware
+ */
+const requestMetrics = (req, res, next) => {
+  res.on('finish', () => {
+    const statusClass = `${Math.floor(res.statusCode / 100)}xx`;
+    stats.total += 1;
+    if (_.has(stats, statusClass)) {
+      stats[statusClass] += 1;
+    }
+  });
+  next();
+};
+
+module.exports = { requestMetrics };
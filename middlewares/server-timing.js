@@ -0,0 +1,85 @@
+const config = require('config');
+const _ = require('lodash');
+
+const { createRollingHistogram, startTimer } = require('../utils/histogram');
+const { registerMetrics } = require('../utils/metrics');
+const { runWithTimings } = require('../utils/request-timing');
+
+const { enabled, window } = _.defaults(
+  {},
+  config.has('serverTiming') ? config.get('serverTiming') : {},
+  { enabled: true, window: 60 },
+);
+
+/** Rolling histograms of the stages of every route keyed by route and stage */
+const routeHistograms = {};
+
+/**
+ * Get the route a request was routed to. Requests which no route matched, such as requests which
+ * failed authentication, share a single route.
+ *
+ * @param {Request} req Request
+ * @returns {string} Method and path of the route
+ */
+const routeName = req => (
+  req.route ? `${req.method} ${req.baseUrl}${req.route.path}` : 'unmatched'
+);
+
+/**
+ * Record the stage durations of a request in the rolling histograms of its route
+ *
+ * @param {string} route Method and path of the route
+ * @param {object} timings Stage durations in milliseconds keyed by stage name
+ */
+const observeRoute = (route, timings) => {
+  _.forEach(timings, (duration, stage) => {
+    const key = `${route}.${stage}`;
+    if (!routeHistograms[key]) {
+      routeHistograms[key] = createRollingHistogram(window);
+      registerMetrics(`timing.${key}`, routeHistograms[key].snapshot);
+    }
+    routeHistograms[key].observe(duration);
+  });
+};
+
+/**
+ * Format stage durations as a Server-Timing header
+ *
+ * @param {object} timings Stage durations in milliseconds keyed by stage name
+ * @returns {string} Server-Timing header
+ */
+const serverTimingHeader = timings => _.map(
+  timings,
+  (duration, stage) => `${stage};dur=${_.round(duration, 1)}`,
+).join(', ');
+
+/**
+ * The middleware which times the stages of each request. The durations of the stages so far and
+ * the total duration are sent in a Server-Timing header just before the response headers are
+ * written. Once the response is finished, the stages and the total duration including the write
+ * of the response are recorded in the rolling histograms of the route.
+ *
+ * @param {Request} req Request
+ * @param {Response} res Response
+ * @param {Function} next Next middleware
+ */
+const serverTiming = (req, res, next) => {
+  if (!enabled) {
+    return next();
+  }
+  const elapsed = startTimer();
+  const timings = {};
+
+  const { writeHead } = res;
+  res.writeHead = (...args) => {
+    res.setHeader('Server-Timing', serverTimingHeader(_.assign({}, timings, { total: elapsed() })));
+    return writeHead.apply(res, args);
+  };
+  res.once('finish', () => {
+    observeRoute(routeName(req), _.assign({}, timings, { total: elapsed() }));
+  });
+
+  return runWithTimings(timings, next);
+};
+
+module.exports = { serverTiming };
@@ -0,0 +1,216 @@
+const appRoot = require('app-root-path');
+const bodyParser = require('body-parser');
+const { compose } = require('compose-middleware');
+const config = require('config');
+const express = require('express');
+const { initialize } = require('express-openapi');
+const fs = require('fs');
+const https = require('https');
+const _ = require('lodash');
+const moment = require('moment');
+const git = require('simple-git/promise');
+
+const { errorBuilder, errorHandler } = appRoot.require('errors/errors');
+const { authentication } = appRoot.require('middlewares/authentication');
+const { bodyParserError } = appRoot.require('middlewares/body-parser-error');
+const { loggerMiddleware } = appRoot.require('middlewares/logger');
+const { requestMetrics } = appRoot.require('middlewares/request-metrics');
+const { runtimeErrors } = appRoot.require('middlewares/runtime-errors');
+const { serverTiming } = appRoot.require('middlewares/server-timing');
+const { openapi } = appRoot.require('utils/load-openapi');
+const { closeConnectionsOnRetire, notifyReady } = appRoot.require('utils/cluster');
+const { aggregateMetrics } = appRoot.require('utils/metrics');
+const { captureProfile, profileExtensions } = appRoot.require('utils/profiler');
+const { sessionTicketKeys } = appRoot.require('utils/tls');
+const { validateDataSource } = appRoot.require('utils/validate-data-source');
+
+const serverConfig = _.defaults({}, config.get('server'), {
+  keepAliveTimeout: 65000,
+  headersTimeout: 66000,
+  sessionTimeout: 300,
+});
+
+const profilingConfig = _.defaults(
+  {},
+  config.has('profiling') ? config.get('profiling') : {},
+  { enabled: false, heapSnapshots: false },
+);
+
+/**
+ * Types of profile which the admin app captures. A heap snapshot holds every secret in memory,
+ * such as the database password and the credentials of the API, so it has to be enabled on its own.
+ */
+const profileTypes = _.keys(profilingConfig.heapSnapshots
+  ? profileExtensions
+  : _.omit(profileExtensions, 'snapshot'));
+
+validateDataSource();
+
+// Initialize Express applications and routers
+const app = express();
+const appRouter = express.Router();
+const adminApp = express();
+const adminAppRouter = express.Router();
+
+/*
+ * Use the simple query parser to prevent the parameters which contain square brackets be parsed as
+ * a nested object
+ */
+app.set('query parser', 'simple');
+
+// Create and start HTTPS servers
+const httpsOptions = {
+  key: fs.readFileSync(serverConfig.keyPath),
+  cert: fs.readFileSync(serverConfig.certPath),
+  secureProtocol: serverConfig.secureProtocol,
+  sessionTimeout: serverConfig.sessionTimeout,
+  ticketKeys: sessionTicketKeys(),
+};
+const httpsServer = https.createServer(httpsOptions, app);
+const adminHttpsServer = https.createServer(httpsOptions, adminApp);
+
+/*
+ * Keep idle connections open longer than the load balancer does, so that the load balancer closes
+ * them first and never sends a request on a connection the server is closing
+ */
+_.forEach([httpsServer, adminHttpsServer], (server) => {
+  server.keepAliveTimeout = serverConfig.keepAliveTimeout;
+  server.headersTimeout = serverConfig.headersTimeout;
+});
+closeConnectionsOnRetire([httpsServer, adminHttpsServer]);
+
+// Middlewares for routers, logger and authentication
+const baseEndpoint = `${serverConfig.basePathPrefix}`;
+app.use(baseEndpoint, appRouter);
+adminApp.use(baseEndpoint, adminAppRouter);
+
+appRouter.use(serverTiming);
+appRouter.use(loggerMiddleware);
+appRouter.use(requestMetrics);
+appRouter.use(authentication);
+adminAppRouter.use(authentication);
+
+/**
+ * Function that transforms OpenAPI errors. The behavior is to apply all properties from the Ajv
+ * error to the OpenAPI error.
+ *
+ * @param {object} openapiError OpenAPI error
+ * @param {object} ajvError Ajv error
+ * @returns {object} Transformed error
+ */
+const errorTransformer = (openapiError, ajvError) => {
+  /**
+   * express-openapi will add a leading '[' and closing ']' to the 'path' field if the parameter
+   * name contains '[' or ']'. This regex is used to remove them to keep the path name consistent.
+   *
+   * @type {RegExp}
+   */
+  const pathQueryRegex = /\['(.*)']/g;
+
+  const error = Object.assign({}, openapiError, ajvError);
+
+  const regexResult = pathQueryRegex.exec(error.path);
+  error.path = regexResult ? regexResult[1] : error.path;
+  return error;
+};
+
+// Return API meta information at admin endpoint
+adminAppRouter.get(`${openapi.basePath}`, async (req, res) => {
+  try {
+    const commit = await git().revparse(['--short', 'HEAD']);
+    const now = moment();
+    const info = {
+      meta: {
+        name: openapi.info.title,
+        time: now.format('YYYY-MM-DD HH:mm:ssZZ'),
+        unixTime: now.unix(),
+        commit: commit.trim(),
+        documentation: 'openapi.yaml',
+      },
+    };
+    res.send(info);
+  } catch (err) {
+    errorHandler(res, err);
+  }
+});
+
+/*
+ * Return runtime metrics such as cache hit rates at admin endpoint. In cluster mode the metrics of
+ * every worker are summed and the health of each worker is listed.
+ */
+adminAppRouter.get(`${openapi.basePath}/metrics`, async (req, res) => {
+  try {
+    res.send({ meta: await aggregateMetrics() });
+  } catch (err) {
+    errorHandler(res, err);
+  }
+});
+
+/*
+ * Capture a CPU profile, a sampling heap profile or a heap snapshot of the process which serves the
+ * request at admin endpoint. Only the admin credential may capture profiles and the endpoint only
+ * exists when profiling is enabled. In cluster mode each request profiles a single worker, whose
+ * pid is part of the file name.
+ */
+if (profilingConfig.enabled) {
+  adminAppRouter.get(`${openapi.basePath}/profile`, async (req, res) => {
+    try {
+      if (req.username !== config.get('authentication').username) {
+        errorBuilder(res, 403, 'Only the admin credential may capture profiles.');
+        return;
+      }
+      const type = req.query.type || 'cpu';
+      const seconds = req.query.seconds === undefined ? 10 : Number(req.query.seconds);
+      if (!_.includes(profileTypes, type)) {
+        errorBuilder(res, 400, [`type must be one of ${profileTypes.join(', ')}.`]);
+        return;
+      }
+      if (!_.isInteger(seconds) || seconds < 1 || seconds > 60) {
+        errorBuilder(res, 400, ['seconds must be an integer from 1 to 60.']);
+        return;
+      }
+      const profile = await captureProfile(type, seconds);
+      if (!profile) {
+        errorBuilder(res, 409, 'Another profile is being captured.');
+        return;
+      }
+      res.attachment(profile.filename).send(profile.content);
+    } catch (err) {
+      errorHandler(res, err);
+    }
+  });
+}
+
+// Initialize API with OpenAPI specification
+initialize({
+  app: appRouter,
+  apiDoc: openapi,
+  paths: `${appRoot}/api${openapi.basePath}/paths`,
+  consumesMiddleware: {
+    // bulk endpoints accept up to 1000 resources per request
+    'application/json': compose([bodyParser.json({ limit: '1mb' }), bodyParserError]),
+  },
+  errorMiddleware: runtimeErrors,
+  errorTransformer,
+  promiseMode: true,
+});
+
+// Return a 404 error if resource not found
+appRouter.use((req, res) => errorBuilder(res, 404, 'Resource not found.'));
+
+/**
+ * Start a server and listen on a port
+ *
+ * @param {object} server HTTPS server
+ * @param {number} port Port
+ * @returns {Promise} Promise object which resolves once the server listens
+ */
+const listen = (server, port) => new Promise((resolve) => {
+  server.listen(port, resolve);
+});
+
+// Start servers and listen on ports
+Promise.all([
+  listen(httpsServer, serverConfig.port),
+  listen(adminHttpsServer, serverConfig.adminPort),
+]).then(notifyReady);
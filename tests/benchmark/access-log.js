@@ -0,0 +1,94 @@
+const appRoot = require('app-root-path');
+const bodyParser = require('body-parser');
+const express = require('express');
+const http = require('http');
+const _ = require('lodash');
+
+const {
+  expressLoggerMiddleware,
+  batchedLoggerMiddleware,
+} = appRoot.require('middlewares/logger');
+const { startTimer } = appRoot.require('utils/histogram');
+
+/** Number of requests sent to each middleware and number of requests in flight at once */
+const requestCount = 20000;
+const concurrency = 50;
+
+/** Body of each request, large enough to show the cost of logging bodies */
+const body = JSON.stringify({
+  data: _.times(100, index => ({ type: 'review', attributes: { reviewText: `Review ${index}` } })),
+});
+
+/**
+ * Send a POST request with the benchmark body
+ *
+ * @param {http.Agent} agent Keep-alive agent
+ * @param {number} port Port of the server
+ * @returns {Promise} Promise object which resolves once the response is read
+ */
+const post = (agent, port) => new Promise((resolve, reject) => {
+  const req = http.request({
+    agent,
+    port,
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(body) },
+  }, (res) => {
+    res.resume();
+    res.on('end', resolve);
+  });
+  req.on('error', reject);
+  req.end(body);
+});
+
+/**
+ * Measure the throughput of a server which logs its requests with a middleware
+ *
+ * @param {RequestHandler} middleware Logger middleware
+ * @returns {Promise<number>} Promise object represents the number of requests per second
+ */
+const measure = async (middleware) => {
+  const app = express();
+  app.use(middleware);
+  app.use(bodyParser.json({ limit: '1mb' }));
+  app.post('/', (req, res) => res.status(201).send({ data: { id: '1' } }));
+  const server = app.listen(0);
+  const { port } = server.address();
+  const agent = new http.Agent({ keepAlive: true, maxSockets: concurrency });
+
+  let sent = 0;
+  const elapsed = startTimer();
+  const worker = async () => {
+    while (sent < requestCount) {
+      sent += 1;
+      // eslint-disable-next-line no-await-in-loop
+      await post(agent, port);
+    }
+  };
+  await Promise.all(_.times(concurrency, worker));
+  const requestsPerSecond = requestCount / (elapsed() / 1000);
+
+  agent.destroy();
+  server.close();
+  return requestsPerSecond;
+};
+
+/**
+ * Compare the throughput of a server which logs with express-winston with one which logs batched
+ * records. The express-winston middleware writes every request to the console as well, so run it
+ * with `npm run benchmark-access-log > /dev/null`. The results are written to stderr.
+ */
+const benchmark = async () => {
+  const results = {
+    'express-winston': await measure(expressLoggerMiddleware()),
+    batched: await measure(batchedLoggerMiddleware()),
+  };
+  _.forEach(results, (requestsPerSecond, name) => {
+    const throughput = `${requestsPerSecond.toFixed(0)} requests per second`;
+    process.stderr.write(`${_.padEnd(name, 20)}${throughput}\n`);
+  });
+};
+
+benchmark().catch((err) => {
+  process.stderr.write(`${err.stack}\n`);
+  process.exit(1);
+});
@@ -0,0 +1,59 @@
+const appRoot = require('app-root-path');
+const config = require('config');
+const basicAuth = require('express-basic-auth');
+const _ = require('lodash');
+
+const { authentication } = appRoot.require('middlewares/authentication');
+
+/** Number of requests each middleware authenticates */
+const iterations = 100000;
+
+const { username, password } = config.get('authentication');
+const authorization = `Basic ${Buffer.from(`${username}:${password}`).toString('base64')}`;
+const req = {
+  headers: { authorization },
+  get: name => req.headers[name.toLowerCase()],
+};
+const res = {
+  status: () => res,
+  set: () => res,
+  send: () => { throw new Error('The benchmark request was not authenticated.'); },
+};
+
+/**
+ * Measure the mean number of microseconds a middleware takes to authenticate the benchmark request
+ *
+ * @param {Function} middleware Authentication middleware
+ * @returns {Promise<number>} Promise object represents the mean duration
+ */
+const measure = async (middleware) => {
+  // the first request verifies the password hash and caches the header
+  await new Promise(next => middleware(req, res, next));
+
+  const start = process.hrtime();
+  for (let i = 0; i < iterations; i += 1) {
+    // eslint-disable-next-line no-await-in-loop
+    await new Promise(next => middleware(req, res, next));
+  }
+  const [seconds, nanoseconds] = process.hrtime(start);
+  return ((seconds * 1e9) + nanoseconds) / iterations / 1000;
+};
+
+/**
+ * Compare the cost of authenticating a request of a hot client with express-basic-auth and with
+ * the authentication middleware. Run it with `node tests/benchmark/authentication.js`.
+ */
+const benchmark = async () => {
+  const results = {
+    'express-basic-auth': await measure(basicAuth({ users: { [username]: password } })),
+    authentication: await measure(authentication),
+  };
+  _.forEach(results, (mean, name) => {
+    process.stdout.write(`${_.padEnd(name, 20)}${mean.toFixed(3)} µs per request\n`);
+  });
+};
+
+benchmark().catch((err) => {
+  process.stderr.write(`${err.stack}\n`);
+  process.exit(1);
+});
@@ -0,0 +1,56 @@
+const appRoot = require('app-root-path');
+const { spawnSync } = require('child_process');
+const fs = require('fs');
+const _ = require('lodash');
+
+/** Number of times each start up is measured */
+const iterations = 10;
+
+/** Artifact of the validated OpenAPI document written by utils/load-openapi */
+const artifactPath = appRoot.resolve('build/openapi.json');
+
+/** Script which loads the OpenAPI document and everything which reads it at require time */
+const startupScript = `
+  const start = process.hrtime();
+  require('./utils/load-openapi');
+  require('./api/v1/serializers/games-serializer');
+  require('./api/v1/serializers/reviews-serializer');
+  require('./api/v1/serializers/developers-serializer');
+  const [seconds, nanoseconds] = process.hrtime(start);
+  process.stdout.write(String((seconds * 1e3) + (nanoseconds / 1e6)));
+`;
+
+/**
+ * Measure the mean number of milliseconds a new process takes to load the OpenAPI document
+ *
+ * @param {boolean} cold Whether to remove the artifact before each start
+ * @returns {number} Mean duration
+ */
+const measure = (cold) => {
+  const durations = _.times(iterations, () => {
+    if (cold && fs.existsSync(artifactPath)) {
+      fs.unlinkSync(artifactPath);
+    }
+    const { stdout, status, stderr } = spawnSync(process.execPath, ['-e', startupScript], {
+      cwd: appRoot.path,
+      encoding: 'utf8',
+    });
+    if (status !== 0) {
+      throw new Error(stderr);
+    }
+    return Number(stdout);
+  });
+  return _.mean(durations);
+};
+
+/**
+ * Compare the start up time of a process which validates openapi.yaml with one which reads the
+ * artifact of a previous validation. Run it with `npm run benchmark-startup`.
+ */
+const results = {
+  'validate openapi.yaml': measure(true),
+  'read build/openapi.json': measure(false),
+};
+_.forEach(results, (mean, name) => {
+  process.stdout.write(`${_.padEnd(name, 25)}${mean.toFixed(1)} ms\n`);
+});
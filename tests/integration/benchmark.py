@@ -0,0 +1,268 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import itertools
+import json
+import logging
+import math
+import sys
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+import utils
+
+
+# Handler for parsing command-line arguments
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description='Measure the throughput and latency of each endpoint')
+    parser.add_argument(
+        '--config',
+        dest='config_path',
+        help='Path to json formatted config file containing API credentials',
+        required=True)
+    parser.add_argument(
+        '--concurrency',
+        dest='concurrency',
+        type=int,
+        help='Number of requests in flight at the same time')
+    parser.add_argument(
+        '--requests',
+        dest='requests',
+        type=int,
+        help='Number of requests sent to each endpoint')
+    parser.add_argument(
+        '--writes',
+        dest='writes',
+        help='Also benchmark POST and PATCH. Created games are deleted after',
+        action='store_true')
+    parser.add_argument(
+        '--output',
+        dest='output_path',
+        help='Path to write the JSON report to instead of stdout')
+    parser.add_argument(
+        '--baseline',
+        dest='baseline_path',
+        help='Path to the JSON report of a previous run to compare with')
+    parser.add_argument(
+        '--max-regression',
+        dest='max_regression',
+        type=float,
+        help='Fraction by which p95 latency may grow and throughput may drop '
+             'compared with the baseline')
+    parser.add_argument(
+        '--debug',
+        dest='debug',
+        help='Enable debug logging mode',
+        action='store_true')
+    return parser.parse_args()
+
+
+# Get the benchmark settings from the configuration file and the arguments
+def benchmark_settings(config, arguments):
+    settings = {'concurrency': 10, 'requests': 200, 'max_regression': 0.2}
+    settings.update(config.get('benchmark', {}))
+    for key in settings:
+        if getattr(arguments, key) is not None:
+            settings[key] = getattr(arguments, key)
+    return settings
+
+
+# Share one pool of keep-alive connections between the worker threads
+def setup_pooled_session(config, concurrency):
+    session = utils.setup_session(config)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Get the value of a percentile of sorted values by the nearest-rank method
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+# Summarize the latencies in milliseconds and the failures of an endpoint
+def summarize(latencies, failures, elapsed_seconds):
+    sorted_latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'failures': failures,
+        'throughput': round(len(latencies) / elapsed_seconds, 2),
+        'p50': percentile(sorted_latencies, 50),
+        'p95': percentile(sorted_latencies, 95),
+        'p99': percentile(sorted_latencies, 99),
+        'max': sorted_latencies[-1] if sorted_latencies else None
+    }
+
+
+# Send the requests of an endpoint from a pool of threads
+def run_scenario(session, base_url, scenario, settings):
+    method, expected_status_code, next_request = scenario
+    request_count = settings['requests']
+    lock = threading.Lock()
+    latencies = []
+    failures = []
+
+    def send(index):
+        endpoint, body = next_request(index)
+        start = time.perf_counter()
+        response = session.request(method, f'{base_url}{endpoint}',
+                                   json=body)
+        latency = round((time.perf_counter() - start) * 1000, 2)
+        with lock:
+            latencies.append(latency)
+            if response.status_code != expected_status_code:
+                failures.append(response.status_code)
+                logging.debug(f'{method} {endpoint} returned '
+                              f'{response.status_code}: {response.text}')
+        return response
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=settings['concurrency']) as executor:
+        responses = list(executor.map(send, range(request_count)))
+    elapsed_seconds = time.perf_counter() - start
+
+    return summarize(latencies, len(failures), elapsed_seconds), responses
+
+
+# Build a request which cycles through test cases
+def cycle(values, build_request):
+    values = list(values)
+    return lambda index: build_request(values[index % len(values)])
+
+
+# Build the scenarios which only read data keyed by endpoint
+def read_scenarios(test_cases):
+    return {
+        'GET /games': ('GET', 200, lambda index: (
+            '/games?page[size]=25', None)),
+        'GET /games/{gameId}': ('GET', 200, cycle(
+            test_cases['valid_game_ids'],
+            lambda game_id: (f'/games/{game_id}', None))),
+        'GET /reviews?gameIds=': ('GET', 200, cycle(
+            test_cases['review_game_ids'],
+            lambda game_ids: (f'/reviews?gameIds={",".join(game_ids)}',
+                              None))),
+        'GET /reviews/{reviewId}': ('GET', 200, cycle(
+            test_cases['valid_review_ids'],
+            lambda review_id: (f'/reviews/{review_id}', None))),
+        'GET /developers/{developerId}': ('GET', 200, cycle(
+            test_cases['valid_developer_ids'],
+            lambda developer_id: (f'/developers/{developer_id}', None)))
+    }
+
+
+# Build the body of a game
+def game_body(index, developer_id=None, game_id=None):
+    data = {
+        'type': 'game',
+        'attributes': {
+            'name': f'Benchmark game {index}',
+            'releaseDate': datetime.now().strftime('%Y-%m-%d')
+        }
+    }
+    if developer_id is not None:
+        data['attributes']['developerId'] = developer_id
+    if game_id is not None:
+        data['id'] = game_id
+    return {'data': data}
+
+
+# Run the write scenarios. Games created by POST are patched and then deleted.
+def run_write_scenarios(session, base_url, test_cases, settings):
+    developer_ids = itertools.cycle(test_cases['game_developer_ids'])
+    post_scenario = ('POST', 201, lambda index: (
+        '/games', game_body(index, developer_id=next(developer_ids))))
+    post_summary, responses = run_scenario(session, base_url, post_scenario,
+                                           settings)
+    game_ids = [response.json()['data']['id'] for response in responses
+                if response.status_code == 201]
+
+    summaries = {'POST /games': post_summary}
+    try:
+        if game_ids:
+            patch_scenario = ('PATCH', 200, cycle(
+                game_ids,
+                lambda game_id: (f'/games/{game_id}',
+                                 game_body(game_id, game_id=game_id))))
+            summaries['PATCH /games/{gameId}'], _ = run_scenario(
+                session, base_url, patch_scenario, settings)
+    finally:
+        for game_id in game_ids:
+            session.delete(f'{base_url}/games/{game_id}')
+    return summaries
+
+
+# Compare a report with a baseline and list the regressions over the limit
+def find_regressions(report, baseline, max_regression):
+    regressions = []
+    for endpoint, summary in report['endpoints'].items():
+        previous = baseline['endpoints'].get(endpoint)
+        if not previous:
+            continue
+        if summary['p95'] > previous['p95'] * (1 + max_regression):
+            regressions.append(f'{endpoint}: p95 {summary["p95"]} ms, '
+                               f'baseline {previous["p95"]} ms')
+        min_throughput = previous['throughput'] * (1 - max_regression)
+        if summary['throughput'] < min_throughput:
+            regressions.append(f'{endpoint}: throughput '
+                               f'{summary["throughput"]}/s, '
+                               f'baseline {previous["throughput"]}/s')
+    return regressions
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    logging.basicConfig(
+        level=logging.DEBUG if arguments.debug else logging.INFO)
+
+    with open(arguments.config_path) as config_file:
+        config = json.load(config_file)
+    settings = benchmark_settings(config, arguments)
+    base_url = utils.setup_base_url(config)
+    session = setup_pooled_session(config, settings['concurrency'])
+    test_cases = config['test_cases']
+
+    endpoints = {}
+    for endpoint, scenario in read_scenarios(test_cases).items():
+        logging.info(f'Benchmarking {endpoint}')
+        endpoints[endpoint], _ = run_scenario(session, base_url, scenario,
+                                              settings)
+    if arguments.writes:
+        logging.info('Benchmarking POST /games and PATCH /games/{gameId}')
+        endpoints.update(run_write_scenarios(session, base_url, test_cases,
+                                             settings))
+
+    report = {
+        'time': datetime.now().isoformat(),
+        'baseUrl': base_url,
+        'concurrency': settings['concurrency'],
+        'requests': settings['requests'],
+        'endpoints': endpoints
+    }
+    report_json = json.dumps(report, indent=2)
+    if arguments.output_path:
+        with open(arguments.output_path, 'w') as output_file:
+            output_file.write(f'{report_json}\n')
+    else:
+        print(report_json)
+
+    failed = [endpoint for endpoint, summary in endpoints.items()
+              if summary['failures']]
+    if failed:
+        sys.exit(f'Error: requests failed on {", ".join(failed)}')
+
+    if arguments.baseline_path:
+        with open(arguments.baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = find_regressions(report, baseline,
+                                       settings['max_regression'])
+        if regressions:
+            sys.exit('Error: performance regressed compared with the '
+                     'baseline\n' + '\n'.join(regressions))
@@ -0,0 +1,54 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const fs = require('fs');
+const _ = require('lodash');
+const os = require('os');
+const path = require('path');
+const proxyquire = require('proxyquire');
+
+const { collectMetrics } = appRoot.require('utils/metrics');
+
+describe('Test access-log', () => {
+  let accessLog;
+  let dirname;
+
+  beforeEach(() => {
+    dirname = fs.mkdtempSync(path.join(os.tmpdir(), 'access-log-'));
+    const accessLogConfig = {
+      flushInterval: 60000,
+      batchSize: 10,
+      maxBuffered: 2,
+      dirname,
+    };
+    accessLog = proxyquire(`${appRoot}/utils/access-log`, {
+      config: { has: () => true, get: () => accessLogConfig },
+    });
+  });
+  afterEach(async () => {
+    await accessLog.closeAccessLog();
+    fs.rmdirSync(dirname, { recursive: true });
+  });
+
+  it('logAccess should drop and count records once maxBuffered records are waiting', () => {
+    const { logAccess } = accessLog;
+    const record = { timestamp: Date.now(), method: 'GET', url: '/games' };
+    logAccess(record);
+    logAccess(record);
+    logAccess(record);
+
+    assert.deepEqual(collectMetrics().accessLog, { buffered: 2, written: 0, dropped: 1 });
+  });
+
+  it('closeAccessLog should write the buffered records and drop later ones', async () => {
+    const { logAccess, closeAccessLog } = accessLog;
+    logAccess({ timestamp: Date.now(), method: 'GET', url: '/games' });
+    logAccess({ timestamp: Date.now(), method: 'GET', url: '/reviews' });
+    await closeAccessLog();
+    logAccess({ timestamp: Date.now(), method: 'GET', url: '/developers' });
+
+    const [file] = fs.readdirSync(dirname);
+    const lines = fs.readFileSync(path.join(dirname, file), 'utf8').trim().split('\n');
+    assert.deepEqual(_.map(lines, line => JSON.parse(line).url), ['/games', '/reviews']);
+    assert.deepEqual(collectMetrics().accessLog, { buffered: 0, written: 2, dropped: 1 });
+  });
+});
@@ -0,0 +1,61 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const proxyquire = require('proxyquire');
+const sinon = require('sinon');
+
+const passwordHash = appRoot.require('utils/password-hash');
+
+let authentication; // proxyquire is later used to import the middleware with fake users
+
+/**
+ * Build a Basic Authorization header
+ *
+ * @param {string} name Username
+ * @param {string} pass Password
+ * @returns {string} Authorization header
+ */
+const basicHeader = (name, pass) => `Basic ${Buffer.from(`${name}:${pass}`).toString('base64')}`;
+
+/**
+ * Run the middleware on a request with an Authorization header
+ *
+ * @param {string} authorization Authorization header
+ * @returns {Promise<number>} Promise object represents 200 if the request was authenticated or the
+ *                            status of the response otherwise
+ */
+const authenticate = authorization => new Promise((resolve) => {
+  const req = { get: () => authorization };
+  const res = { status: status => ({ send: () => resolve(status) }) };
+  authentication(req, res, () => resolve(200));
+});
+
+describe('Test authentication', () => {
+  const serviceHash = passwordHash.hashPassword('secret', 1024);
+
+  beforeEach(() => {
+    sinon.spy(passwordHash, 'verifyPassword');
+    ({ authentication } = proxyquire(`${appRoot}/middlewares/authentication`, {
+      config: { get: () => ({ users: { service: serviceHash } }) },
+    }));
+  });
+  afterEach(() => sinon.restore());
+
+  it('a verified header should be authenticated without hashing the password again', async () => {
+    assert.equal(await authenticate(basicHeader('service', 'secret')), 200);
+    assert.equal(await authenticate(basicHeader('service', 'secret')), 200);
+    sinon.assert.calledOnce(passwordHash.verifyPassword);
+  });
+
+  it('a wrong password should be rejected without evicting the verified header', async () => {
+    assert.equal(await authenticate(basicHeader('service', 'secret')), 200);
+    assert.equal(await authenticate(basicHeader('service', 'wrong')), 401);
+    assert.equal(await authenticate(basicHeader('service', 'secret')), 200);
+    sinon.assert.calledTwice(passwordHash.verifyPassword);
+  });
+
+  it('unknown users and malformed headers should be rejected', async () => {
+    assert.equal(await authenticate(basicHeader('unknown', 'secret')), 401);
+    assert.equal(await authenticate('Bearer token'), 401);
+    assert.equal(await authenticate(undefined), 401);
+  });
+});
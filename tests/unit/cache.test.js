@@ -0,0 +1,73 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const _ = require('lodash');
+const proxyquire = require('proxyquire');
+const sinon = require('sinon');
+
+const { createCache } = appRoot.require('utils/cache');
+const { collectMetrics } = appRoot.require('utils/metrics');
+
+describe('Test cache', () => {
+  afterEach(() => sinon.restore());
+
+  it('cached values should be returned until they expire', (done) => {
+    const clock = sinon.useFakeTimers();
+    const cache = createCache('ttlTest');
+    const { ttl } = collectMetrics().caches.ttlTest;
+
+    cache.set('1', 'value');
+    assert.equal(cache.get('1'), 'value');
+    clock.tick(ttl * 1000);
+    assert.isUndefined(cache.get('1'));
+    done();
+  });
+
+  it('the least recently used entry should be evicted when the cache is full', (done) => {
+    const cache = createCache('lruTest');
+    const { maxEntries } = collectMetrics().caches.lruTest;
+
+    _.times(maxEntries, key => cache.set(`${key}`, key));
+    // reading the oldest key makes the second oldest key the least recently used one
+    assert.equal(cache.get('0'), 0);
+    cache.set('new', 'value');
+
+    assert.equal(cache.get('0'), 0);
+    assert.isUndefined(cache.get('1'));
+    assert.include(collectMetrics().caches.lruTest, {
+      size: maxEntries,
+      hits: 2,
+      misses: 1,
+      evictions: 1,
+    });
+    done();
+  });
+
+  it('invalidations of other workers should be applied to the cache of the same name', () => {
+    const { createCache: createWorkerCache } = proxyquire(`${appRoot}/utils/cache`, {
+      cluster: { isWorker: true },
+    });
+    const cache = createWorkerCache('clusterTest');
+
+    cache.set('1', 'value');
+    cache.set('2', 'value');
+    process.emit('message', {
+      type: 'cache:invalidate',
+      invalidations: [{ name: 'clusterTest', key: '1' }, { name: 'otherCache' }],
+    });
+    assert.isUndefined(cache.get('1'));
+    assert.equal(cache.get('2'), 'value');
+
+    process.emit('message', { type: 'cache:invalidate', invalidations: [{ name: 'clusterTest' }] });
+    assert.isUndefined(cache.get('2'));
+  });
+
+  it('values read before an invalidation should not be cached', (done) => {
+    const cache = createCache('invalidationTest');
+
+    const generation = cache.generation();
+    cache.invalidate('1');
+    cache.set('1', 'stale value', generation);
+    assert.isUndefined(cache.get('1'));
+    done();
+  });
+});
@@ -0,0 +1,74 @@
+const appRoot = require('app-root-path');
+const chai = require('chai');
+const chaiAsPromised = require('chai-as-promised');
+const sinon = require('sinon');
+
+const { createCheckoutQueue } = appRoot.require('api/v1/db/oracledb/checkout-queue');
+const { createHistogram } = appRoot.require('utils/histogram');
+
+chai.should();
+chai.use(chaiAsPromised);
+const { assert } = chai;
+
+describe('Test checkout-queue', () => {
+  afterEach(() => sinon.restore());
+
+  it('checkouts over the limit should wait until a connection is released', async () => {
+    const queue = createCheckoutQueue({ limit: 1, queueMax: 0, queueTimeout: 0 });
+
+    const release = await queue.acquire();
+    const waiting = queue.acquire();
+    assert.include(queue.stats(), { inUse: 1, queued: 1 });
+
+    release();
+    await waiting;
+    assert.include(queue.stats(), { inUse: 1, queued: 0 });
+  });
+
+  it('checkouts should be rejected with a 503 when the queue is full', async () => {
+    const queue = createCheckoutQueue({ limit: 1, queueMax: 1, queueTimeout: 0 });
+
+    await queue.acquire();
+    queue.acquire();
+    const err = await queue.acquire().should.be.rejectedWith(Error);
+    assert.equal(err.status, 503);
+    assert.deepEqual(queue.stats().rejected, { queueFull: 1, queueTimeout: 0 });
+  });
+
+  it('checkouts should be rejected with a 503 once they waited queueTimeout', async () => {
+    const clock = sinon.useFakeTimers();
+    const queue = createCheckoutQueue({ limit: 1, queueMax: 0, queueTimeout: 100 });
+
+    await queue.acquire();
+    const waiting = queue.acquire();
+    clock.tick(100);
+    const err = await waiting.should.be.rejectedWith(Error);
+    assert.equal(err.status, 503);
+    assert.include(queue.stats(), { queued: 0 });
+  });
+
+  it('raising the limit should hand the new slots to waiting checkouts', async () => {
+    const queue = createCheckoutQueue({ limit: 1, queueMax: 0, queueTimeout: 0 });
+
+    await queue.acquire();
+    const waiting = queue.acquire();
+    queue.setLimit(2);
+    await waiting;
+    assert.include(queue.stats(), { limit: 2, inUse: 2, queued: 0 });
+  });
+
+  it('histograms should count every observation in each bucket at least as large', () => {
+    const histogram = createHistogram([10, 100]);
+    histogram.observe(5);
+    histogram.observe(50);
+    histogram.observe(500);
+
+    assert.deepEqual(histogram.snapshot(), {
+      count: 3,
+      sum: 555,
+      le10: 1,
+      le100: 2,
+      leInf: 3,
+    });
+  });
+});
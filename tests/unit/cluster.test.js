@@ -0,0 +1,52 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const http = require('http');
+const _ = require('lodash');
+const proxyquire = require('proxyquire');
+
+describe('Test cluster', () => {
+  let server;
+  let agent;
+
+  /**
+   * Send a request on a keep-alive connection of the agent
+   *
+   * @returns {Promise<object>} Promise object represents the response once it is read
+   */
+  const request = () => new Promise((resolve, reject) => {
+    http.get({ port: server.address().port, agent }, (res) => {
+      res.resume();
+      res.once('end', () => resolve(res));
+    }).once('error', reject);
+  });
+
+  beforeEach(async () => {
+    const { closeConnectionsOnRetire } = proxyquire(`${appRoot}/utils/cluster`, {
+      cluster: { isWorker: true, worker: { on: _.noop } },
+    });
+    server = http.createServer((req, res) => setTimeout(() => res.end('ok'), 50));
+    closeConnectionsOnRetire([server]);
+    agent = new http.Agent({ keepAlive: true });
+    await new Promise(resolve => server.listen(0, resolve));
+  });
+  afterEach(() => agent.destroy());
+
+  it('a retiring worker should not wait for its idle keep-alive connections', async () => {
+    await request();
+    const closed = new Promise(resolve => server.close(resolve));
+    process.emit('message', { type: 'worker:retire' });
+
+    // the server only closes once its connections have ended
+    await closed;
+  });
+
+  it('a retiring worker should finish its requests and then close their connections', async () => {
+    const response = request();
+    await new Promise(resolve => server.once('request', resolve));
+    const closed = new Promise(resolve => server.close(resolve));
+    process.emit('message', { type: 'worker:retire' });
+
+    assert.equal((await response).statusCode, 200);
+    await closed;
+  });
+});
@@ -0,0 +1,75 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const _ = require('lodash');
+const sinon = require('sinon');
+const zlib = require('zlib');
+
+const { sendDocument } = appRoot.require('utils/conditional-get');
+
+/**
+ * Create a fake response which records the ETag and how the response was ended
+ *
+ * @returns {object} Fake response
+ */
+const fakeResponse = () => {
+  const res = {
+    headers: {},
+    set: (name, value) => {
+      res.headers[name] = value;
+      return res;
+    },
+  };
+  res.status = sinon.stub().returns(res);
+  res.type = sinon.stub().returns(res);
+  res.vary = sinon.stub().returns(res);
+  res.end = sinon.stub();
+  res.send = sinon.stub();
+  return res;
+};
+
+describe('Test conditional-get', () => {
+  const document = { data: { id: '1', type: 'game' } };
+
+  it('sendDocument should send the JSON body with a strong ETag', (done) => {
+    const res = fakeResponse();
+    sendDocument({ fresh: false }, res, document);
+
+    assert.match(res.headers.ETag, /^"[^"]+"$/);
+    sinon.assert.calledWith(res.send, JSON.stringify(document));
+    done();
+  });
+
+  it('sendDocument should send 304 without a body when the ETag is still fresh', (done) => {
+    const res = fakeResponse();
+    sendDocument({ fresh: true }, res, document);
+
+    sinon.assert.calledWith(res.status, 304);
+    sinon.assert.calledOnce(res.end);
+    sinon.assert.notCalled(res.send);
+    done();
+  });
+
+  it('identical documents should have identical ETags', (done) => {
+    const firstRes = fakeResponse();
+    const secondRes = fakeResponse();
+    sendDocument({ fresh: false }, firstRes, document);
+    sendDocument({ fresh: false }, secondRes, JSON.parse(JSON.stringify(document)));
+
+    assert.equal(firstRes.headers.ETag, secondRes.headers.ETag);
+    done();
+  });
+
+  it('large documents should be compressed with an ETag of their own coding', async () => {
+    const res = fakeResponse();
+    const sent = new Promise(resolve => res.send.callsFake(resolve));
+    const largeDocument = { data: _.times(1000, id => ({ id: String(id), type: 'game' })) };
+    const req = { fresh: false, acceptsEncodings: () => 'gzip' };
+    sendDocument(req, res, largeDocument);
+
+    const body = await sent;
+    assert.equal(zlib.gunzipSync(body).toString(), JSON.stringify(largeDocument));
+    assert.equal(res.headers['Content-Encoding'], 'gzip');
+    assert.match(res.headers.ETag, /^"[^"]+-gzip"$/);
+    sinon.assert.calledWith(res.vary, 'Accept-Encoding');
+  });
+});
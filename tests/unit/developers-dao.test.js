@@ -90,9 +90,11 @@ describe('Test developers-dao', () => {
         .and.be.an.instanceOf(TypeError);
     });
 
-    it('postDeveloper should be fulfilled with singleResult', () => {
-      const expectedResult = {};
-      createConnStub({ rows: [{}], outBinds: { outId: 1 } });
+    it('postDeveloper should be fulfilled with the row returned by the insert', () => {
+      const expectedResult = { id: '1', name: 'test', website: 'http://www.example.com' };
+      createConnStub({
+        outBinds: { outId: ['1'], outName: ['test'], outWebsite: ['http://www.example.com'] },
+      });
       const result = developersDao.postDeveloper(fakeBody);
       return result.should
         .eventually.be.fulfilled
@@ -102,13 +104,13 @@ describe('Test developers-dao', () => {
     const testCases = [
       {
         testCase: [],
-        expectedError: 'Cannot read property \'outId\' of undefined',
-        testDescription: 'outId is not returned',
+        expectedError: 'Cannot read property \'id\' of undefined',
+        testDescription: 'outBinds are not returned',
       },
       {
-        testCase: { outBinds: { outId: fakeId } },
-        expectedError: 'Cannot read property \'length\' of undefined',
-        testDescription: 'outId is returned without an additional response',
+        testCase: { outBinds: { outId: [] } },
+        expectedError: 'Cannot read property \'id\' of undefined',
+        testDescription: 'no row is returned',
       },
     ];
     _.forEach(testCases, ({ testCase, expectedError, testDescription }) => {
@@ -148,18 +150,18 @@ describe('Test developers-dao', () => {
         .and.be.an.instanceOf(Error);
     });
 
-    const testCases = [
-      { testCase: [{}], description: 'a single result' },
-      { testCase: { rowsAffected: 0 }, description: '0 rowsAffected' },
-    ];
-    _.forEach(testCases, ({ testCase, description }) => {
-      it(`patchDeveloper should be fulfilled with ${description}`, () => {
-        createConnStub({ rows: testCase });
-        const result = developersDao.patchDeveloper(fakeId, fakeBody);
-        return result.should
-          .eventually.be.fulfilled
-          .and.has.property('rows').deep.equal(testCase);
-      });
+    it('patchDeveloper should be fulfilled with the updated row', () => {
+      createConnStub({ rowsAffected: 1, outBinds: { outId: [fakeId], outName: ['test'] } });
+      const result = developersDao.patchDeveloper(fakeId, fakeBody);
+      return result.should
+        .eventually.be.fulfilled
+        .and.include({ id: fakeId, name: 'test' });
+    });
+
+    it('patchDeveloper should be fulfilled with undefined when no row is updated', () => {
+      createConnStub({ rowsAffected: 0, outBinds: { outId: [] } });
+      const result = developersDao.patchDeveloper(fakeId, fakeBody);
+      return result.should.eventually.be.fulfilled.and.equal(undefined);
     });
   });
 });
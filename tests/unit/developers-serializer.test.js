@@ -4,9 +4,17 @@ const chaiAsPromised = require('chai-as-promised');
 const chaiSubset = require('chai-subset');
 const _ = require('lodash');
 
-const { getDefinitionProps, testSingleResource, testMultipleResources } = require('./test-helpers.js');
+const {
+  getDefinitionProps,
+  testSingleResource,
+  testMultipleResources,
+  jsonApiSerializerDocument,
+} = require('./test-helpers.js');
 const testData = require('./test-data');
 
+const { paginate } = appRoot.require('utils/paginator');
+const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
+
 const developersSerializer = appRoot.require('api/v1/serializers/developers-serializer');
 
 chai.should();
@@ -17,6 +25,8 @@ const { expect } = chai;
 describe('Test developers-serializer', () => {
   const { rawDevelopers } = testData;
   const resourceType = 'developer';
+  const resourceKeys = _.keys(getDefinitionProps('DeveloperResource').attributes.properties);
+  const resourceUrl = resourcePathLink(apiBaseUrl, 'developers');
 
   it('serializeDeveloper should form a single JSON result as defined in openapi', () => {
     const { serializeDeveloper } = developersSerializer;
@@ -34,6 +44,43 @@ describe('Test developers-serializer', () => {
     expect(serializedDevelopers).to.have.all.keys(_.keys(getDefinitionProps('DeveloperResults')));
   });
 
+  it('serializeDeveloper should match the document of jsonapi-serializer', () => {
+    const { serializeDeveloper } = developersSerializer;
+    const expectedRow = _.cloneDeep(rawDevelopers[0]);
+    const expected = jsonApiSerializerDocument(resourceType, {
+      identifierField: 'id',
+      resourceKeys,
+      resourcePath: 'developers',
+      topLevelSelfLink: resourcePathLink(resourceUrl, expectedRow.id),
+      enableDataLinks: true,
+    }, expectedRow);
+
+    expect(JSON.stringify(serializeDeveloper(_.cloneDeep(rawDevelopers[0]))))
+      .to.equal(JSON.stringify(expected));
+  });
+
+  it('serializeDevelopers should match the document of jsonapi-serializer', () => {
+    const { serializeDevelopers } = developersSerializer;
+    const query = testData.paginationQueries;
+    const expectedRows = _.cloneDeep(rawDevelopers);
+    const pagination = paginate(expectedRows, {
+      size: query['page[size]'],
+      number: query['page[number]'],
+    });
+    const expected = jsonApiSerializerDocument(resourceType, {
+      identifierField: 'id',
+      resourceKeys,
+      pagination,
+      resourcePath: 'developers',
+      topLevelSelfLink: paramsLink(resourceUrl, query),
+      query: _.omit(query, 'page[size]', 'page[number]'),
+      enableDataLinks: true,
+    }, pagination.paginatedRows);
+
+    expect(JSON.stringify(serializeDevelopers(_.cloneDeep(rawDevelopers), query)))
+      .to.equal(JSON.stringify(expected));
+  });
+
   const rejectedCases = testData.serializerRejectedCases(rawDevelopers);
   _.forEach(rejectedCases, ({
     rawData,
@@ -0,0 +1,60 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+
+const { documentStream, isUnpaginated } = appRoot.require('utils/document-stream');
+const { compileSerializer } = appRoot.require('utils/jsonapi');
+
+/**
+ * Stream records through a document stream and resolve the parsed document
+ *
+ * @param {object[]} records Records to stream
+ * @returns {Promise<object>} Parsed JSON API document
+ */
+const streamDocument = (records) => {
+  const serializer = compileSerializer({
+    type: { enum: ['game'] },
+    attributes: { properties: { name: { type: 'string' } } },
+  }, 'games');
+  const options = {
+    id: 'id',
+    attributes: ['name'],
+    enableDataLinks: true,
+    topLevelLinks: { self: 'http://localhost/api/v1/games?page%5Bsize%5D=0' },
+  };
+  const stream = documentStream(serializer, options);
+  const chunks = [];
+  const parsed = new Promise((resolve, reject) => {
+    stream
+      .on('data', chunk => chunks.push(chunk))
+      .on('end', () => resolve(JSON.parse(chunks.join(''))))
+      .on('error', reject);
+  });
+  records.forEach(record => stream.write(record));
+  stream.end();
+  return parsed;
+};
+
+describe('Test document-stream', () => {
+  it('documentStream should write links, every resource and the total number of results', async () => {
+    const document = await streamDocument([{ id: 1, name: 'a' }, { id: 2, name: 'b' }]);
+
+    assert.deepEqual(Object.keys(document), ['links', 'data', 'meta']);
+    assert.deepEqual(document.data.map(({ id }) => id), ['1', '2']);
+    assert.deepEqual(document.data[1].attributes, { name: 'b' });
+    assert.deepEqual(document.meta, { totalResults: 2 });
+  });
+
+  it('documentStream should write an empty document when there are no records', async () => {
+    const document = await streamDocument([]);
+
+    assert.deepEqual(document.data, []);
+    assert.deepEqual(document.meta, { totalResults: 0 });
+  });
+
+  it('isUnpaginated should only be true when page[size] is 0', () => {
+    assert.isTrue(isUnpaginated({ 'page[size]': 0 }));
+    assert.isTrue(isUnpaginated({ 'page[size]': '0' }));
+    assert.isFalse(isUnpaginated({ 'page[size]': 25 }));
+    assert.isFalse(isUnpaginated({}));
+  });
+});
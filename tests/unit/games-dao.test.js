@@ -8,6 +8,7 @@ const sinon = require('sinon');
 const testData = require('./test-data');
 const { createConnStub } = require('./test-helpers');
 
+const conn = appRoot.require('api/v1/db/oracledb/connection');
 const gamesSerializer = appRoot.require('api/v1/serializers/games-serializer');
 
 chai.should();
@@ -50,6 +51,40 @@ describe('Test games-dao', () => {
       });
     });
 
+    it('getGames should strip the window count from rows when paginated by the database', () => {
+      createConnStub({ rows: [{ id: fakeId, totalResults: '1' }] });
+
+      const result = gamesDao.getGames(testData.paginationQueries);
+      return result.should
+        .eventually.be.fulfilled
+        .and.deep.equals([{ id: fakeId }]);
+    });
+
+    it('getGames should load each included relationship with a single query', async () => {
+      const execute = sinon.stub().resolves({ rows: [{ id: fakeId, developerId: fakeId }] });
+      sinon.stub(conn, 'getConnection').resolves({ execute, close: () => null });
+
+      await gamesDao.getGames({ include: ['developer', 'reviews'] });
+      sinon.assert.calledThrice(execute);
+      sinon.assert.calledWithMatch(
+        gamesSerializer.serializeGames,
+        sinon.match.array,
+        sinon.match.object,
+        undefined,
+        { developer: sinon.match.array, reviews: sinon.match.array },
+      );
+    });
+
+    it('getGames should only select the requested fields and the sort key', async () => {
+      const execute = sinon.stub().resolves({ rows: [] });
+      sinon.stub(conn, 'getConnection').resolves({ execute, close: () => null });
+
+      await gamesDao.getGames({ 'fields[game]': ['name'], sort: 'score' });
+      const [sqlQuery] = execute.firstCall.args;
+      sqlQuery.should.include('SELECT ID AS "id", NAME AS "name", SCORE AS "score"');
+      sqlQuery.should.not.include('RELEASE_DATE');
+    });
+
     it('getGames should be rejected when improper query params are passed in', () => {
       createConnStub();
 
@@ -81,6 +116,18 @@ describe('Test games-dao', () => {
       return Promise.all(fulfilledPromises);
     });
 
+    it('getGameById should be served from the cache until patchGame invalidates it', async () => {
+      const connStub = createConnStub({ rows: [{ id: fakeId }] });
+
+      await gamesDao.getGameById(fakeId);
+      await gamesDao.getGameById(fakeId);
+      sinon.assert.calledOnce(connStub);
+
+      await gamesDao.patchGame(fakeId, _.cloneDeep(fakeBody));
+      await gamesDao.getGameById(fakeId);
+      sinon.assert.calledThrice(connStub);
+    });
+
     it('getGameById should be rejected when multiple results are returned', () => {
       const testCases = [
         { testCase: { rows: [{}, {}] }, error: 'Expect a single object but got multiple results.' },
@@ -100,13 +147,23 @@ describe('Test games-dao', () => {
   });
 
   describe('Test postGame', () => {
-    it('postGame should be fulfilled with a single result', () => {
-      const testCase = [{}];
-      createConnStub({ rows: testCase, outBinds: { outId: [1] } });
+    it('postGame should be fulfilled with the row returned by the insert', () => {
+      createConnStub({ outBinds: { outId: ['1'], outName: ['test'] } });
       const result = gamesDao.postGame(fakeBody);
       return result.should
         .eventually.be.fulfilled
-        .and.deep.equal(testCase[0]);
+        .and.include({ id: '1', name: 'test' });
+    });
+
+    it('postGame should not commit or release the connection of the caller', async () => {
+      const execute = sinon.stub().resolves({ outBinds: { outId: ['1'] } });
+      const transaction = { execute, close: sinon.spy() };
+      const getConnection = sinon.stub(conn, 'getConnection');
+
+      await gamesDao.postGame(_.cloneDeep(fakeBody), transaction);
+      sinon.assert.notCalled(getConnection);
+      sinon.assert.notCalled(transaction.close);
+      execute.firstCall.args[2].should.deep.equal({ autoCommit: false });
     });
 
     const testCases = [
@@ -151,17 +208,27 @@ describe('Test games-dao', () => {
 
   describe('Test patchGame', () => {
     let testCases = [
-      { testCase: [{}], description: 'a single result' },
-      { testCase: { rowsAffected: 0 }, description: '0 rowsAffected' },
+      {
+        testCase: { rowsAffected: 1, outBinds: { outId: [fakeId], outName: ['test'] } },
+        expectedResult: { id: fakeId, name: 'test' },
+        description: 'the updated row',
+      },
+      {
+        testCase: { rowsAffected: 0, outBinds: { outId: [] } },
+        expectedResult: undefined,
+        description: 'undefined when no row is updated',
+      },
     ];
-    _.forEach(testCases, ({ testCase, description }) => {
-      it(`patchGame should be fulfilled with ${description}`, () => {
+    _.forEach(testCases, ({ testCase, expectedResult, description }) => {
+      it(`patchGame should be fulfilled with ${description}`, async () => {
         createConnStub(testCase);
 
-        const result = gamesDao.patchGame(fakeId, fakeBody);
-        return result.should
-          .eventually.be.fulfilled
-          .and.deep.equal(testCase);
+        const result = await gamesDao.patchGame(fakeId, fakeBody);
+        if (expectedResult) {
+          result.should.include(expectedResult);
+        } else {
+          chai.expect(result).to.equal(undefined);
+        }
       });
     });
 
@@ -186,34 +253,4 @@ describe('Test games-dao', () => {
       });
     });
   });
-
-  describe('Test isValidDeveloper', () => {
-    const testCases = [
-      {
-        testCase: { rows: [{ id: 1 }] },
-        expectedResult: true,
-        description: 'true when the id field returned is 1',
-      },
-      {
-        testCase: { rows: [{ id: 0 }] },
-        expectedResult: false,
-        description: 'false when the id field returned is 0',
-      },
-    ];
-    _.forEach(testCases, ({ testCase, expectedResult, description }) => {
-      it(`isValidDeveloper should be fulfilled return ${description}`, () => {
-        createConnStub(testCase);
-        const result = gamesDao.isValidDeveloper();
-        return result.should
-          .eventually.be.fulfilled
-          .and.deep.equal(expectedResult);
-      });
-    });
-
-    it('isValidDeveloper should be rejected when a single response is returned', () => {
-      createConnStub([{}]);
-      const result = gamesDao.isValidDeveloper(fakeId);
-      return result.should.be.rejectedWith(Error, 'Cannot read property \'0\' of undefined');
-    });
-  });
 });
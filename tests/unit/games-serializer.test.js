@@ -5,9 +5,17 @@ const chaiMatch = require('chai-match');
 const chaiSubset = require('chai-subset');
 const _ = require('lodash');
 
-const { getDefinitionProps, testSingleResource, testMultipleResources } = require('./test-helpers.js');
+const {
+  getDefinitionProps,
+  testSingleResource,
+  testMultipleResources,
+  jsonApiSerializerDocument,
+} = require('./test-helpers.js');
 const testData = require('./test-data');
 
+const { paginate } = appRoot.require('utils/paginator');
+const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
+
 const gamesSerializer = appRoot.require('api/v1/serializers/games-serializer');
 
 chai.should();
@@ -17,8 +25,10 @@ chai.use(chaiSubset);
 const { expect } = chai;
 
 describe('Test games-serializer', () => {
-  const { rawGames } = testData;
+  const { rawGames, fakeId } = testData;
   const resourceType = 'game';
+  const resourceKeys = _.keys(getDefinitionProps('GameResource').attributes.properties);
+  const resourceUrl = resourcePathLink(apiBaseUrl, 'games');
 
   it('serializeGame should form a single JSON result as defined in openapi', () => {
     const { serializeGame } = gamesSerializer;
@@ -33,7 +43,83 @@ describe('Test games-serializer', () => {
     const serializedGames = serializeGames(rawGames, testData.paginationQueries);
     testMultipleResources(serializedGames);
 
-    expect(serializedGames).to.have.all.keys(_.keys(getDefinitionProps('GameResults')));
+    // included is only present when related resources are requested
+    const resultsKeys = _.without(_.keys(getDefinitionProps('GameResults')), 'included');
+    expect(serializedGames).to.have.all.keys(resultsKeys);
+  });
+
+  it('serializeGames should form a compound document when related resources are included', () => {
+    const { serializeGames } = gamesSerializer;
+    const { rawDevelopers, rawReviews } = testData;
+    const related = {
+      developer: _.cloneDeep(rawDevelopers.slice(0, 1)),
+      reviews: _.cloneDeep(rawReviews.slice(0, 1)),
+    };
+
+    const serializedGames = serializeGames(
+      _.cloneDeep(rawGames), testData.paginationQueries, undefined, related,
+    );
+    const [firstGame, secondGame] = testMultipleResources(_.omit(serializedGames, 'included'));
+
+    expect(firstGame.relationships).to.deep.equal({
+      developer: { data: { type: 'developer', id: fakeId } },
+      reviews: { data: [{ type: 'review', id: fakeId }] },
+    });
+    expect(secondGame.relationships.reviews.data).to.deep.equal([]);
+    expect(_.map(serializedGames.included, ({ type, id }) => ({ type, id }))).to.deep.equal([
+      { type: 'developer', id: fakeId },
+      { type: 'review', id: fakeId },
+    ]);
+  });
+
+  it('serializeGames should link the next cursor page when cursor paginated', () => {
+    const { serializeGames } = gamesSerializer;
+    const query = _.assign({}, testData.paginationQueries, { 'page[after]': '' });
+
+    const serializedGames = serializeGames(rawGames, query, { nextCursor: 'nextCursor' });
+    testMultipleResources(serializedGames);
+
+    expect(serializedGames.links.next).to.include('page[after]=nextCursor');
+    expect(serializedGames.meta).to.not.have.property('totalResults');
+  });
+
+  it('serializeGame should match the document of jsonapi-serializer', () => {
+    const { serializeGame, gameConverter } = gamesSerializer;
+    const expectedRow = _.cloneDeep(rawGames[0]);
+    gameConverter([expectedRow]);
+    const expected = jsonApiSerializerDocument(resourceType, {
+      identifierField: 'id',
+      resourceKeys,
+      resourcePath: 'games',
+      topLevelSelfLink: resourcePathLink(resourceUrl, expectedRow.id),
+      enableDataLinks: true,
+    }, expectedRow);
+
+    expect(JSON.stringify(serializeGame(_.cloneDeep(rawGames[0]))))
+      .to.equal(JSON.stringify(expected));
+  });
+
+  it('serializeGames should match the document of jsonapi-serializer', () => {
+    const { serializeGames, gameConverter } = gamesSerializer;
+    const query = testData.paginationQueries;
+    const expectedRows = _.cloneDeep(rawGames);
+    gameConverter(expectedRows);
+    const pagination = paginate(expectedRows, {
+      size: query['page[size]'],
+      number: query['page[number]'],
+    });
+    const expected = jsonApiSerializerDocument(resourceType, {
+      identifierField: 'id',
+      resourceKeys,
+      pagination,
+      resourcePath: 'games',
+      topLevelSelfLink: paramsLink(resourceUrl, query),
+      query: _.omit(query, 'page[size]', 'page[number]', 'page[after]'),
+      enableDataLinks: true,
+    }, pagination.paginatedRows);
+
+    expect(JSON.stringify(serializeGames(_.cloneDeep(rawGames), query)))
+      .to.equal(JSON.stringify(expected));
   });
 
   const rejectedCases = testData.serializerRejectedCases(rawGames);
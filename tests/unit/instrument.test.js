@@ -0,0 +1,31 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+
+const { instrumentDao, startStatementTimer } = appRoot.require('api/v1/db/oracledb/instrument');
+const { collectMetrics } = appRoot.require('utils/metrics');
+
+describe('Test instrument', () => {
+  it('statements should be timed into the histogram of their DAO function', async () => {
+    const execute = async () => startStatementTimer()();
+    const { applyChange } = instrumentDao('innerTest', { applyChange: execute });
+    const { getCached, write } = instrumentDao('outerTest', {
+      getCached: async () => 'cached',
+      write: async () => {
+        await execute();
+        await applyChange();
+        await execute();
+      },
+    });
+
+    assert.equal(await getCached(), 'cached');
+    await write();
+    const { innerTest, outerTest } = collectMetrics().dao;
+    assert.equal(outerTest.getCached.count, 0);
+    assert.equal(outerTest.write.count, 2);
+    assert.equal(innerTest.applyChange.count, 1);
+  });
+
+  it('statements outside of a DAO function should not be timed', () => {
+    assert.doesNotThrow(() => startStatementTimer()());
+  });
+});
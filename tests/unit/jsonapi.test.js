@@ -0,0 +1,87 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const _ = require('lodash');
+
+const { jsonApiSerializerDocument } = require('./test-helpers');
+const testData = require('./test-data');
+
+const {
+  serializerOptions,
+  compileSerializer,
+  sparseFieldset,
+} = appRoot.require('utils/jsonapi');
+const { openapi } = appRoot.require('utils/load-openapi');
+const { paginate } = appRoot.require('utils/paginator');
+
+describe('Test jsonapi', () => {
+  const resources = [
+    { definition: 'GameResource', resourcePath: 'games', rawRows: testData.rawGames },
+    { definition: 'ReviewResource', resourcePath: 'reviews', rawRows: testData.rawReviews },
+    {
+      definition: 'DeveloperResource',
+      resourcePath: 'developers',
+      rawRows: testData.rawDevelopers,
+    },
+  ];
+
+  _.forEach(resources, ({ definition, resourcePath, rawRows }) => {
+    const resourceProp = openapi.definitions[definition].properties;
+    const resourceType = resourceProp.type.enum[0];
+    const serializer = compileSerializer(resourceProp, resourcePath);
+    const baseArgs = {
+      identifierField: 'id',
+      resourceKeys: _.keys(resourceProp.attributes.properties),
+      resourcePath,
+      topLevelSelfLink: `/v1/${resourcePath}`,
+      enableDataLinks: true,
+    };
+
+    it(`compiled ${resourceType} serializer should match jsonapi-serializer for a single resource`, () => {
+      const rawRow = _.cloneDeep(rawRows[0]);
+
+      assert.equal(
+        JSON.stringify(serializer(rawRow, serializerOptions(baseArgs))),
+        JSON.stringify(jsonApiSerializerDocument(resourceType, baseArgs, rawRow)),
+      );
+    });
+
+    it(`compiled ${resourceType} serializer should only link resources with enableDataLinks`, () => {
+      const args = _.assign({}, baseArgs, { enableDataLinks: false });
+      const rawRow = _.cloneDeep(rawRows[0]);
+      const document = serializer(rawRow, serializerOptions(args));
+
+      assert.isNull(document.data.links.self);
+      assert.equal(
+        JSON.stringify(document),
+        JSON.stringify(jsonApiSerializerDocument(resourceType, args, rawRow)),
+      );
+    });
+
+    it(`compiled ${resourceType} serializer should match jsonapi-serializer for a page of resources`, () => {
+      const pagination = paginate(rawRows, { size: 1, number: 2 });
+      const args = _.assign({}, baseArgs, { pagination, query: { name: 'test' } });
+
+      assert.equal(
+        JSON.stringify(serializer(pagination.paginatedRows, serializerOptions(args))),
+        JSON.stringify(jsonApiSerializerDocument(resourceType, args, pagination.paginatedRows)),
+      );
+    });
+
+    it(`fields[${resourceType}] should allow every attribute of ${definition}`, () => {
+      const fieldsParameter = _.find(openapi.parameters, { name: `fields[${resourceType}]` });
+
+      assert.sameMembers(fieldsParameter.items.enum, baseArgs.resourceKeys);
+    });
+  });
+
+  it('sparseFieldset should keep the requested attribute keys in resource order', () => {
+    const resourceKeys = ['name', 'score', 'releaseDate'];
+
+    assert.deepEqual(
+      sparseFieldset(resourceKeys, ['releaseDate', 'name']),
+      ['name', 'releaseDate'],
+    );
+    assert.deepEqual(sparseFieldset(resourceKeys, []), []);
+    assert.deepEqual(sparseFieldset(resourceKeys, undefined), resourceKeys);
+  });
+});
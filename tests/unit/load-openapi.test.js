@@ -0,0 +1,30 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const crypto = require('crypto');
+const fs = require('fs');
+const _ = require('lodash');
+
+const { openapi, parameterNames } = appRoot.require('utils/load-openapi');
+
+describe('Test load-openapi', () => {
+  it('parameterNames should list the query parameters of every operation', () => {
+    const { parameters, get } = openapi.paths['/games'];
+    assert.deepEqual(
+      parameterNames['/games'].get,
+      _.map(_.filter(_.concat(parameters, get.parameters), { in: 'query' }), 'name'),
+    );
+    assert.notInclude(parameterNames['/games'].get, 'Authorization');
+    assert.include(parameterNames['/reviews'].get, 'scoreMin');
+    assert.notInclude(parameterNames['/games/{gameId}'].get, 'gameId');
+  });
+
+  it('the artifact should be keyed by the hash of openapi.yaml', () => {
+    const hash = crypto.createHash('sha256')
+      .update(fs.readFileSync(appRoot.resolve('openapi.yaml')))
+      .digest('hex');
+    const artifact = JSON.parse(fs.readFileSync(appRoot.resolve('build/openapi.json'), 'utf8'));
+
+    assert.equal(artifact.hash, hash);
+    assert.deepEqual(artifact.openapi.paths['/games'], openapi.paths['/games']);
+  });
+});
@@ -0,0 +1,26 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+
+const { registerMetrics, sumMetrics, aggregateMetrics } = appRoot.require('utils/metrics');
+
+describe('Test metrics', () => {
+  it('sumMetrics should sum the counters of every worker and keep their settings', () => {
+    const worker = hits => ({
+      caches: { games: { hits, maxEntries: 1000, ttl: 60 } },
+      requests: { total: hits * 2 },
+    });
+
+    assert.deepEqual(sumMetrics([worker(1), worker(2), worker(3)]), {
+      caches: { games: { hits: 6, maxEntries: 1000, ttl: 60 } },
+      requests: { total: 12 },
+    });
+  });
+
+  it('aggregateMetrics should return the metrics of this process without a cluster', async () => {
+    registerMetrics('aggregateTest', () => ({ count: 1 }));
+
+    const metrics = await aggregateMetrics();
+    assert.deepEqual(metrics.aggregateTest, { count: 1 });
+    assert.notProperty(metrics, 'cluster');
+  });
+});
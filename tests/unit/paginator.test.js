@@ -1,7 +1,12 @@
 const appRoot = require('app-root-path');
 const { assert } = require('chai');
 
-const { paginate } = appRoot.require('/utils/paginator');
+const {
+  paginate,
+  encodeCursor,
+  decodeCursor,
+  isValidCursor,
+} = appRoot.require('/utils/paginator');
 const rows = appRoot.require('/tests/unit/mock-data.json').pets;
 
 describe('Test paginator', () => {
@@ -11,4 +16,47 @@ describe('Test paginator', () => {
     assert.isAtMost(paginatedRows.length, page.size);
     done();
   });
+
+  it('rows paginated by the data source should not be sliced again', (done) => {
+    const page = { size: 2, number: 2 };
+    const totalResults = 50;
+    const pageRows = rows.slice(0, 2);
+    const pagination = paginate(pageRows, page, { totalResults });
+    assert.deepEqual(pagination.paginatedRows, pageRows);
+    assert.equal(pagination.totalResults, totalResults);
+    assert.equal(pagination.totalPages, 25);
+    assert.equal(pagination.nextPage, 3);
+    assert.equal(pagination.prevPage, 1);
+    done();
+  });
+
+  it('cursor paginated rows should carry the next cursor', (done) => {
+    const page = { size: 2 };
+    const pageRows = rows.slice(0, 2);
+    const pagination = paginate(pageRows, page, { nextCursor: 'cursor' });
+    assert.deepEqual(pagination.paginatedRows, pageRows);
+    assert.equal(pagination.nextCursor, 'cursor');
+    assert.equal(pagination.pageSize, 2);
+    done();
+  });
+
+  it('cursors should be URL safe and decode to the encoded position', (done) => {
+    const cursor = encodeCursor('reviewDate', '2019-07-16 10:30:00', '1234');
+    assert.match(cursor, /^[\w-]+$/);
+    assert.deepEqual(decodeCursor(cursor), {
+      sort: 'reviewDate',
+      value: '2019-07-16 10:30:00',
+      id: '1234',
+    });
+    done();
+  });
+
+  it('cursors should only be valid for the sort they were issued for', (done) => {
+    const cursor = encodeCursor('score', '4.5', '12');
+    assert.isTrue(isValidCursor(cursor, 'score'));
+    assert.isFalse(isValidCursor(cursor, 'id'));
+    assert.isTrue(isValidCursor(''));
+    assert.isFalse(isValidCursor('not a cursor'));
+    done();
+  });
 });
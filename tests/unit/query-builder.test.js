@@ -0,0 +1,67 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const _ = require('lodash');
+
+const {
+  bindList,
+  whereClause,
+  searchConditions,
+  searchParams,
+  rangeConditions,
+  rangeParams,
+} = appRoot.require('api/v1/db/oracledb/query-builder');
+
+describe('Test query-builder', () => {
+  it('bindList should pad lists to a bounded number of sizes with their last value', () => {
+    const { sqlList, sqlParams } = bindList('id', ['a', 'b', 'c']);
+
+    assert.equal(sqlList, ':id0, :id1, :id2, :id3');
+    assert.deepEqual(sqlParams, {
+      id0: 'a',
+      id1: 'b',
+      id2: 'c',
+      id3: 'c',
+    });
+    assert.equal(_.size(bindList('id', _.range(513)).sqlParams), 1000);
+    assert.throws(() => bindList('id', _.range(1001)), Error);
+  });
+
+  it('whereClause should join the conditions of set filters in their defined order', () => {
+    const conditions = { name: 'NAME = :name', score: 'SCORE >= :score' };
+
+    assert.equal(
+      whereClause(conditions, { score: 1, name: 'a' }),
+      'WHERE NAME = :name AND SCORE >= :score',
+    );
+    assert.equal(whereClause(conditions, { score: 1 }), 'WHERE SCORE >= :score');
+    assert.equal(whereClause(conditions, {}), '');
+  });
+
+  it('searchParams should build case insensitive patterns with escaped wildcards', () => {
+    const queries = { name: 'Zelda', 'name[prefix]': 'the_', 'name[contains]': '100%' };
+
+    assert.deepEqual(searchParams('name', queries), {
+      name: 'Zelda',
+      namePrefix: 'THE\\_%',
+      nameContains: '%100\\%%',
+    });
+    assert.deepEqual(searchParams('name', {}), {});
+    assert.include(searchConditions('name', 'NAME').namePrefix, 'UPPER(NAME) LIKE :namePrefix');
+  });
+
+  it('rangeParams should bind the requested bounds of a half open date range', () => {
+    const queries = { 'reviewDate[gte]': '2019-01-01', 'reviewDate[lt]': '2019-02-01' };
+
+    assert.deepEqual(rangeParams('reviewDate', queries), {
+      reviewDateGte: '2019-01-01',
+      reviewDateLt: '2019-02-01',
+    });
+    assert.deepEqual(rangeParams('reviewDate', { 'reviewDate[lt]': '2019-02-01' }), {
+      reviewDateLt: '2019-02-01',
+    });
+    assert.equal(
+      rangeConditions('reviewDate', 'REVIEW_DATE').reviewDateLt,
+      'REVIEW_DATE < TO_DATE(:reviewDateLt, \'YYYY-MM-DD\')',
+    );
+  });
+});
@@ -0,0 +1,42 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const sinon = require('sinon');
+
+const { createRollingHistogram } = appRoot.require('utils/histogram');
+const { runWithTimings, timeStage } = appRoot.require('utils/request-timing');
+
+describe('Test request-timing', () => {
+  afterEach(() => sinon.restore());
+
+  it('rolling histograms should drop observations older than the window', () => {
+    const clock = sinon.useFakeTimers();
+    const histogram = createRollingHistogram(60, 6, [10]);
+
+    histogram.observe(5);
+    clock.tick(30000);
+    histogram.observe(50);
+    assert.include(histogram.snapshot(), { count: 2, sum: 55, le10: 1 });
+
+    clock.tick(30000);
+    assert.include(histogram.snapshot(), { count: 1, sum: 50, le10: 0 });
+    clock.tick(30000);
+    assert.include(histogram.snapshot(), { count: 0, sum: 0, le10: 0 });
+  });
+
+  it('stages should be recorded in the timings of the current request', async () => {
+    const timings = {};
+    const serialize = timeStage('serialize', value => value);
+    const nestedSerialize = timeStage('serialize', value => serialize(value));
+    const query = timeStage('db', async value => value);
+
+    await runWithTimings(timings, async () => {
+      assert.equal(nestedSerialize('value'), 'value');
+      assert.equal(await query('value'), 'value');
+    });
+    assert.hasAllKeys(timings, ['serialize', 'db']);
+
+    // calls outside of a request are not timed
+    assert.equal(serialize('value'), 'value');
+    assert.hasAllKeys(timings, ['serialize', 'db']);
+  });
+});
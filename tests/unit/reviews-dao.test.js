@@ -2,12 +2,14 @@ const appRoot = require('app-root-path');
 const chai = require('chai');
 const chaiAsPromised = require('chai-as-promised');
 const _ = require('lodash');
+const oracledb = require('oracledb');
 const proxyquire = require('proxyquire');
 const sinon = require('sinon');
 
 const testData = require('./test-data');
 const { createConnStub } = require('./test-helpers');
 
+const conn = appRoot.require('api/v1/db/oracledb/connection');
 const reviewsSerializer = appRoot.require('api/v1/serializers/reviews-serializer');
 
 chai.should();
@@ -50,6 +52,16 @@ describe('Test reviews-dao', () => {
       });
     });
 
+    it('getReviews should bind gameIds instead of splicing them into the SQL', async () => {
+      const execute = sinon.stub().resolves({ rows: [] });
+      sinon.stub(conn, 'getConnection').resolves({ execute, close: () => null });
+
+      await reviewsDao.getReviews({ gameIds: [1, 2, 3] });
+      const [sqlQuery, sqlParams] = execute.firstCall.args;
+      sqlQuery.should.include('GAME_ID IN (:gameId0, :gameId1, :gameId2, :gameId3)');
+      sqlParams.should.deep.equal({ gameId0: 1, gameId1: 2, gameId2: 3, gameId3: 3 });
+    });
+
     it('getReviews should be rejected when an undefined or improper queries are passed in', () => {
       createConnStub();
 
@@ -99,14 +111,27 @@ describe('Test reviews-dao', () => {
   });
 
   describe('Test postReview', () => {
-    it('postReview should be fulfilled with a single result', () => {
-      const testCase = [{}];
-      createConnStub({ rows: testCase, outBinds: { outId: [1] } });
+    it('postReview should be fulfilled with the row returned by the insert', () => {
+      createConnStub({ outBinds: { outId: ['1'], outReviewer: ['test'] } });
 
       const result = reviewsDao.postReview(fakeBody);
       return result.should
         .eventually.be.fulfilled
-        .and.deep.equal(testCase[0]);
+        .and.include({ id: '1', reviewer: 'test' });
+    });
+
+    it('postReview should commit the review together with the score of its game', async () => {
+      const execute = sinon.stub().resolves({ rows: [{}], outBinds: { outId: [1] } });
+      sinon.stub(conn, 'getConnection').resolves({ execute, close: () => null });
+      const body = { data: { attributes: { gameId: fakeId, score: 4 } } };
+
+      await reviewsDao.postReview(body);
+      const [insert, updateGame] = execute.getCalls();
+      insert.args[0].should.include('INSERT INTO REVIEWS');
+      insert.args.should.have.lengthOf(2);
+      updateGame.args[0].should.include('UPDATE VIDEO_GAMES');
+      updateGame.args[1].should.deep.equal({ gameId: fakeId, scoreDelta: 4, countDelta: 1 });
+      updateGame.args[2].should.deep.equal({ autoCommit: true });
     });
 
     const testCases = [
@@ -132,6 +157,67 @@ describe('Test reviews-dao', () => {
     });
   });
 
+  describe('Test postReviews', () => {
+    it('postReviews should batch the reviews of existing games and commit once', async () => {
+      const execute = sinon.stub().resolves({ rows: [{ id: '1' }] });
+      const executeMany = sinon.stub();
+      executeMany.onFirstCall().resolves({ outBinds: [{ outId: [10] }, { outId: [11] }] });
+      executeMany.onSecondCall().resolves({});
+      sinon.stub(conn, 'getConnection').resolves({ execute, executeMany, close: () => null });
+      const review = (gameId, score) => ({ attributes: { gameId, score } });
+
+      const result = await reviewsDao.postReviews([review('1', 4), review('2', 3), review('1', 2)]);
+      result.meta.results.should.deep.equal([
+        { index: 0, status: '201', id: '10' },
+        { index: 1, status: '400', detail: 'A game with gameId does not exist.' },
+        { index: 2, status: '201', id: '11' },
+      ]);
+      result.data.should.have.lengthOf(2);
+      sinon.assert.calledOnce(execute);
+      sinon.assert.calledTwice(executeMany);
+      executeMany.secondCall.args[1].should.deep.equal([
+        { gameId: 1, scoreDelta: 6, countDelta: 2 },
+      ]);
+      executeMany.secondCall.args[2].should.include({ autoCommit: true });
+    });
+  });
+
+  describe('Test patchReviews', () => {
+    it('patchReviews should batch the existing reviews and commit their scores', async () => {
+      const execute = sinon.stub().resolves({ rows: [{ id: '1', gameId: '5', score: '2' }] });
+      const executeMany = sinon.stub().resolves({});
+      sinon.stub(conn, 'getConnection').resolves({ execute, executeMany, close: () => null });
+      const review = (id, attributes) => ({ type: 'review', id, attributes });
+
+      const result = await reviewsDao.patchReviews([
+        review('1', { score: 4 }),
+        review('2', { reviewer: 'test' }),
+        review('1', { score: 3 }),
+      ]);
+      result.meta.results.should.deep.equal([
+        { index: 0, status: '200', id: '1' },
+        {
+          index: 1,
+          status: '404',
+          id: '2',
+          detail: 'A review with the specified ID was not found.',
+        },
+        { index: 2, status: '200', id: '1' },
+      ]);
+      result.data.should.have.lengthOf(2);
+      execute.firstCall.args[0].should.include('FOR UPDATE');
+      sinon.assert.calledTwice(executeMany);
+      executeMany.firstCall.args[1].should.deep.equal([
+        { id: 1, reviewText: null, score: 4, reviewer: null },
+        { id: 1, reviewText: null, score: 3, reviewer: null },
+      ]);
+      executeMany.secondCall.args[1].should.deep.equal([
+        { gameId: 5, scoreDelta: 1, countDelta: 0 },
+      ]);
+      executeMany.secondCall.args[2].should.include({ autoCommit: true });
+    });
+  });
+
   describe('Test deleteReview', () => {
     const testCases = [
       { testCase: [{}], description: 'a single result' },
@@ -151,17 +237,57 @@ describe('Test reviews-dao', () => {
 
   describe('Test patchReview', () => {
     let testCases = [
-      { testCase: [{}], description: 'a single result' },
-      { testCase: { rowsAffected: 0 }, description: '0 rowsAffected' },
+      {
+        testCase: { rowsAffected: 1, outBinds: { outId: [fakeId], outReviewer: ['test'] } },
+        expectedResult: { id: fakeId, reviewer: 'test' },
+        description: 'the updated row',
+      },
+      {
+        testCase: { rowsAffected: 0, outBinds: { outId: [] } },
+        expectedResult: undefined,
+        description: 'undefined when no row is updated',
+      },
     ];
-    _.forEach(testCases, ({ testCase, description }) => {
-      it(`patchReview should be fulfilled with ${description}`, () => {
+    _.forEach(testCases, ({ testCase, expectedResult, description }) => {
+      it(`patchReview should be fulfilled with ${description}`, async () => {
         createConnStub(testCase);
 
-        const result = reviewsDao.patchReview(fakeId, fakeBody);
-        return result.should
-          .eventually.be.fulfilled
-          .and.deep.equal(testCase);
+        const result = await reviewsDao.patchReview(fakeId, fakeBody);
+        if (expectedResult) {
+          result.should.include(expectedResult);
+        } else {
+          chai.expect(result).to.equal(undefined);
+        }
+      });
+    });
+
+    it('patchReview should leave the score change to the transaction of the caller', async () => {
+      const execute = sinon.stub();
+      execute.onFirstCall().resolves({ rows: [{ gameId: fakeId, score: '2' }] });
+      execute.onSecondCall().resolves({ outBinds: { outId: [fakeId] } });
+      execute.onThirdCall().resolves({});
+      const body = { data: { attributes: { score: 5 } } };
+
+      await reviewsDao.patchReview(fakeId, body, { execute });
+      sinon.assert.calledThrice(execute);
+      execute.secondCall.args[2].should.deep.equal({ autoCommit: false });
+      execute.thirdCall.args[1].should.deep.equal({ gameId: fakeId, scoreDelta: 3, countDelta: 0 });
+      execute.thirdCall.args[2].should.deep.equal({ autoCommit: false });
+    });
+
+    it('patchReview should bind typed nulls and keep a score of 0', async () => {
+      const execute = sinon.stub();
+      execute.onFirstCall().resolves({ rows: [{ gameId: fakeId, score: '2' }] });
+      execute.onSecondCall().resolves({ outBinds: { outId: [fakeId] } });
+      execute.onThirdCall().resolves({});
+      const body = { data: { attributes: { score: 0 } } };
+
+      await reviewsDao.patchReview(fakeId, body, { execute });
+      const { reviewText, score } = execute.secondCall.args[1];
+      reviewText.should.deep.equal({ type: oracledb.STRING, val: null });
+      score.should.deep.equal({ type: oracledb.NUMBER, val: 0 });
+      execute.thirdCall.args[1].should.deep.equal({
+        gameId: fakeId, scoreDelta: -2, countDelta: 0,
       });
     });
 
@@ -187,35 +313,4 @@ describe('Test reviews-dao', () => {
       });
     });
   });
-
-  describe('Test isValidGame', () => {
-    const testCases = [
-      {
-        testCase: { rows: [{ id: 1 }] },
-        expectedResult: true,
-        description: 'true when the id field returned is 1',
-      },
-      {
-        testCase: { rows: [{ id: 0 }] },
-        expectedResult: false,
-        description: 'false when id field returned is 0',
-      },
-    ];
-    _.forEach(testCases, ({ testCase, expectedResult, description }) => {
-      it(`isValidGame should be fulfilled ${description}`, () => {
-        createConnStub(testCase);
-
-        const result = reviewsDao.isValidGame();
-        return result.should
-          .eventually.be.fulfilled
-          .and.deep.equal(expectedResult);
-      });
-    });
-
-    it('isValidGame should be rejected when a single response is returned', () => {
-      createConnStub({});
-      const result = reviewsDao.isValidGame(fakeId);
-      return result.should.be.rejectedWith(Error, 'Cannot read property \'0\' of undefined');
-    });
-  });
 });
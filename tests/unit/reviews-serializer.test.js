@@ -5,9 +5,17 @@ const chaiMatch = require('chai-match');
 const chaiSubset = require('chai-subset');
 const _ = require('lodash');
 
-const { getDefinitionProps, testSingleResource, testMultipleResources } = require('./test-helpers.js');
+const {
+  getDefinitionProps,
+  testSingleResource,
+  testMultipleResources,
+  jsonApiSerializerDocument,
+} = require('./test-helpers.js');
 const testData = require('./test-data');
 
+const { paginate } = appRoot.require('utils/paginator');
+const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
+
 const reviewsSerializer = appRoot.require('api/v1/serializers/reviews-serializer');
 
 chai.should();
@@ -19,6 +27,8 @@ const { expect } = chai;
 describe('Test reviews-serializer', () => {
   const { rawReviews } = testData;
   const resourceType = 'review';
+  const resourceKeys = _.keys(getDefinitionProps('ReviewResource').attributes.properties);
+  const resourceUrl = resourcePathLink(apiBaseUrl, 'reviews');
 
   it('serializeReview should form a single JSON result as defined in openapi', () => {
     const { serializeReview } = reviewsSerializer;
@@ -36,6 +46,45 @@ describe('Test reviews-serializer', () => {
     expect(serializedReviews).to.have.all.keys(_.keys(getDefinitionProps('ReviewResults')));
   });
 
+  it('serializeReview should match the document of jsonapi-serializer', () => {
+    const { serializeReview, reviewConverter } = reviewsSerializer;
+    const expectedRow = _.cloneDeep(rawReviews[0]);
+    reviewConverter([expectedRow]);
+    const expected = jsonApiSerializerDocument(resourceType, {
+      identifierField: 'id',
+      resourceKeys,
+      resourcePath: 'reviews',
+      topLevelSelfLink: resourcePathLink(resourceUrl, expectedRow.id),
+      enableDataLinks: true,
+    }, expectedRow);
+
+    expect(JSON.stringify(serializeReview(_.cloneDeep(rawReviews[0]))))
+      .to.equal(JSON.stringify(expected));
+  });
+
+  it('serializeReviews should match the document of jsonapi-serializer', () => {
+    const { serializeReviews, reviewConverter } = reviewsSerializer;
+    const query = testData.paginationQueries;
+    const expectedRows = _.cloneDeep(rawReviews);
+    reviewConverter(expectedRows);
+    const pagination = paginate(expectedRows, {
+      size: query['page[size]'],
+      number: query['page[number]'],
+    });
+    const expected = jsonApiSerializerDocument(resourceType, {
+      identifierField: 'id',
+      resourceKeys,
+      pagination,
+      resourcePath: 'reviews',
+      topLevelSelfLink: paramsLink(resourceUrl, query),
+      query: _.omit(query, 'page[size]', 'page[number]', 'page[after]'),
+      enableDataLinks: true,
+    }, pagination.paginatedRows);
+
+    expect(JSON.stringify(serializeReviews(_.cloneDeep(rawReviews), query)))
+      .to.equal(JSON.stringify(expected));
+  });
+
   const rejectedCases = testData.serializerRejectedCases(rawReviews);
   _.forEach(rejectedCases, ({
     rawData,
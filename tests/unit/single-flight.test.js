@@ -0,0 +1,50 @@
+const appRoot = require('app-root-path');
+const chai = require('chai');
+const chaiAsPromised = require('chai-as-promised');
+const sinon = require('sinon');
+
+const { singleFlight } = appRoot.require('utils/single-flight');
+const { collectMetrics } = appRoot.require('utils/metrics');
+
+chai.should();
+chai.use(chaiAsPromised);
+const { assert } = chai;
+
+describe('Test single-flight', () => {
+  it('concurrent calls with identical queries should share one execution', async () => {
+    const fn = sinon.stub().resolves('result');
+    const getResources = singleFlight('identicalTest', fn);
+
+    const results = await Promise.all([
+      getResources({ name: 'test', 'page[size]': 25 }),
+      getResources({ 'page[size]': 25, name: 'test' }),
+    ]);
+
+    assert.deepEqual(results, ['result', 'result']);
+    sinon.assert.calledOnce(fn);
+    assert.include(collectMetrics().singleFlight.identicalTest, { executions: 1, coalesced: 1 });
+  });
+
+  it('calls with different queries or after completion should not be coalesced', async () => {
+    const fn = sinon.stub().resolves('result');
+    const getResources = singleFlight('distinctTest', fn);
+
+    await Promise.all([getResources({ name: 'a' }), getResources({ name: 'b' })]);
+    await getResources({ name: 'a' });
+
+    sinon.assert.calledThrice(fn);
+  });
+
+  it('rejections should be shared and should not stay in flight', async () => {
+    const fn = sinon.stub().rejects(new Error('failed'));
+    const getResources = singleFlight('rejectionTest', fn);
+
+    await Promise.all([
+      getResources({}).should.be.rejectedWith(Error, 'failed'),
+      getResources({}).should.be.rejectedWith(Error, 'failed'),
+    ]);
+    await getResources({}).should.be.rejectedWith(Error, 'failed');
+
+    sinon.assert.calledTwice(fn);
+  });
+});
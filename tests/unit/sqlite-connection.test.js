@@ -0,0 +1,38 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+const proxyquire = require('proxyquire');
+
+describe('Test sqlite connection', () => {
+  let connection;
+  let reviewsDao;
+
+  before(async function openSqlite() {
+    try {
+      require.resolve('better-sqlite3');
+    } catch (err) {
+      // better-sqlite3 is an optional dependency
+      this.skip();
+    }
+    const sqliteConnection = proxyquire(`${appRoot}/api/v1/db/sqlite/connection`, {
+      config: { get: () => ({ sqlite: { filename: ':memory:' } }) },
+    });
+    reviewsDao = proxyquire(`${appRoot}/api/v1/db/oracledb/reviews-dao`, {
+      '../../serializers/reviews-serializer': { serializeReview: review => review },
+    });
+    const pool = await sqliteConnection.createPool();
+    connection = await pool.getConnection();
+  });
+  after(() => connection && connection.close());
+
+  it('patchReview should lock the review and apply its score to its game', async () => {
+    const body = { data: { attributes: { score: 3 } } };
+
+    const review = await reviewsDao.patchReview('1', body, connection);
+    await connection.commit();
+    assert.include(review, { id: '1', score: '3' });
+    const { rows } = await connection.execute(
+      'SELECT SCORE_SUM AS "scoreSum", REVIEW_COUNT AS "reviewCount" FROM VIDEO_GAMES WHERE ID = 1',
+    );
+    assert.deepEqual(rows, [{ scoreSum: '3', reviewCount: '1' }]);
+  });
+});
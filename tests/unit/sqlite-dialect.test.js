@@ -0,0 +1,52 @@
+const appRoot = require('app-root-path');
+const { assert } = require('chai');
+
+const {
+  toDate,
+  formatDate,
+  oracleFunctions,
+  translateSql,
+} = appRoot.require('api/v1/db/sqlite/dialect');
+
+describe('Test sqlite dialect', () => {
+  it('translateSql should translate row limiting clauses to LIMIT and OFFSET', () => {
+    const { sqlQuery } = translateSql(`
+      SELECT ID FROM VIDEO_GAMES ORDER BY ID
+      OFFSET :pageOffset ROWS FETCH NEXT :pageSize ROWS ONLY
+    `);
+    assert.match(sqlQuery, /ORDER BY ID\s+LIMIT :pageSize OFFSET :pageOffset/);
+    assert.match(
+      translateSql('SELECT ID FROM REVIEWS FETCH FIRST :pageSize ROWS ONLY').sqlQuery,
+      /REVIEWS LIMIT :pageSize$/,
+    );
+  });
+
+  it('translateSql should alias the RETURNING columns by their out binds', () => {
+    const { sqlQuery, outBindNames } = translateSql(`
+      DELETE FROM REVIEWS WHERE ID = :id
+      RETURNING GAME_ID, SCORE INTO :gameId, :score
+    `);
+    assert.match(sqlQuery, /RETURNING GAME_ID AS "gameId", SCORE AS "score"$/);
+    assert.deepEqual(outBindNames, ['gameId', 'score']);
+  });
+
+  it('translateSql should drop FOR UPDATE', () => {
+    const { sqlQuery } = translateSql(`
+      SELECT GAME_ID AS "gameId" FROM REVIEWS WHERE ID = :id FOR UPDATE
+    `);
+    assert.match(sqlQuery, /WHERE ID = :id\s*$/);
+  });
+
+  it('TO_DATE and TO_CHAR should round trip dates through julian day numbers', () => {
+    const { TO_DATE: toDateFn, TO_CHAR: toChar, NVL: nvl } = oracleFunctions;
+    const julianDay = toDateFn('2017/3/3', 'YYYY/MM/DD');
+
+    assert.equal(julianDay, toDate('2017-03-03'));
+    assert.equal(toDateFn('2017-03-03', 'YYYY-MM-DD') + 1, toDate('2017-03-04'));
+    assert.equal(toChar(julianDay, 'YYYY-MM-DD HH24:MI:SS'), '2017-03-03 00:00:00');
+    assert.equal(formatDate(toDate('2019-12-31 23:59:58')), '2019-12-31 23:59:58');
+    assert.isNull(toDateFn(null, 'YYYY/MM/DD'));
+    assert.equal(toChar(4.5), '4.5');
+    assert.equal(nvl(null, 0), 0);
+  });
+});
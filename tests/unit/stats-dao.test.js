@@ -0,0 +1,77 @@
+const appRoot = require('app-root-path');
+const chai = require('chai');
+const chaiAsPromised = require('chai-as-promised');
+const _ = require('lodash');
+const proxyquire = require('proxyquire');
+const sinon = require('sinon');
+
+const conn = appRoot.require('api/v1/db/oracledb/connection');
+
+chai.should();
+chai.use(chaiAsPromised);
+
+let statsDao; // proxyquire is later used to import stats-dao with empty caches
+
+/**
+ * Build a raw statistics row as it is selected by the GROUP BY queries
+ *
+ * @param {string} id ID of the game or developer
+ * @returns {object} Raw statistics row
+ */
+const rawStats = id => _.assign(
+  {
+    id,
+    reviewCount: '2',
+    meanScore: '3.5',
+    minScore: '2',
+    maxScore: '5',
+  },
+  _.zipObject(_.map(_.range(1, 6), bucket => `histogram${bucket}`), ['0', '1', '0', '0', '1']),
+);
+
+describe('Test stats-dao', () => {
+  beforeEach(() => {
+    statsDao = proxyquire(`${appRoot}/api/v1/db/oracledb/stats-dao`, {});
+  });
+  afterEach(() => sinon.restore());
+
+  it('getGameStats should be fulfilled with undefined when the game is not found', async () => {
+    sinon.stub(conn, 'getConnection').resolves({ execute: () => ({ rows: [] }), close: _.noop });
+
+    const result = await statsDao.getGameStats('1');
+    chai.expect(result).to.equal(undefined);
+  });
+
+  it('getGamesStats should only select games which are not cached', async () => {
+    const execute = sinon.stub();
+    execute.onFirstCall().resolves({ rows: [rawStats('1')] });
+    execute.onSecondCall().resolves({ rows: [rawStats('2')] });
+    sinon.stub(conn, 'getConnection').resolves({ execute, close: _.noop });
+
+    await statsDao.getGameStats('1');
+    const result = await statsDao.getGamesStats({ ids: [2, 3, 1] });
+
+    execute.secondCall.args[1].should.deep.equal({ id0: '2', id1: '3' });
+    _.map(result.data, 'id').should.deep.equal(['2', '1']);
+    result.data[0].attributes.should.deep.equal({
+      reviewCount: 2,
+      meanScore: 3.5,
+      minScore: 2,
+      maxScore: 5,
+      scoreHistogram: [0, 1, 0, 0, 1],
+    });
+  });
+
+  it('invalidateGameStats should drop the cached statistics of the game', async () => {
+    const execute = sinon.stub().resolves({ rows: [rawStats('1')] });
+    sinon.stub(conn, 'getConnection').resolves({ execute, close: _.noop });
+
+    await statsDao.getGameStats('1');
+    await statsDao.getGameStats('1');
+    sinon.assert.calledOnce(execute);
+
+    statsDao.invalidateGameStats('1');
+    await statsDao.getGameStats('1');
+    sinon.assert.calledTwice(execute);
+  });
+});
@@ -1,10 +1,13 @@
 const appRoot = require('app-root-path');
 const { expect } = require('chai');
+const JsonApiSerializer = require('jsonapi-serializer').Serializer;
 const _ = require('lodash');
 const sinon = require('sinon');
 
 const conn = appRoot.require('api/v1/db/oracledb/connection');
+const { serializerOptions } = appRoot.require('utils/jsonapi');
 const { openapi } = appRoot.require('utils/load-openapi');
+const { apiBaseUrl, resourcePathLink } = appRoot.require('utils/uri-builder');
 const { fakeId, fakeBaseUrl } = appRoot.require('tests/unit/test-data');
 
 const createConnStub = executeReturn => sinon.stub(conn, 'getConnection').resolves({
@@ -88,8 +91,29 @@ const getDefinitionProps = (definition, nestedOption) => {
   return result;
 };
 
+/**
+ * Helper function to serialize records with jsonapi-serializer, which the compiled serializers
+ * replace. The self link of each resource is built by a dataLinks function as it used to be.
+ *
+ * @param {string} resourceType type of resource as named in openapi
+ * @param {object} serializerArgs arguments of serializerOptions
+ * @param {object|object[]} records records to serialize
+ * @returns {object} serialized document
+ */
+const jsonApiSerializerDocument = (resourceType, serializerArgs, records) => {
+  const { resourcePath, identifierField, enableDataLinks } = serializerArgs;
+  const resourceUrl = resourcePathLink(apiBaseUrl, resourcePath);
+  const options = _.assign(serializerOptions(serializerArgs), {
+    dataLinks: {
+      self: row => (enableDataLinks ? resourcePathLink(resourceUrl, row[identifierField]) : null),
+    },
+  });
+  return new JsonApiSerializer(resourceType, options).serialize(records);
+};
+
 module.exports = {
   createConnStub,
+  jsonApiSerializerDocument,
   testSingleResource,
   testMultipleResources,
   getDefinitionProps,
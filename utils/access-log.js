@@ -0,0 +1,166 @@
+const appRoot = require('app-root-path');
+const config = require('config');
+const fs = require('fs');
+const _ = require('lodash');
+const path = require('path');
+
+const { registerMetrics } = require('./metrics');
+
+const { name } = appRoot.require('package');
+
+const {
+  flushInterval,
+  batchSize,
+  maxBuffered,
+  maxBodyLength,
+  dirname,
+} = _.defaults({}, config.has('accessLog') ? config.get('accessLog') : {}, {
+  flushInterval: 1000,
+  batchSize: 500,
+  maxBuffered: 10000,
+  maxBodyLength: 1024,
+  dirname: 'logs',
+});
+
+/** Records waiting to be written, in the order they were logged */
+const buffer = [];
+const stats = { written: 0, dropped: 0 };
+
+/** File stream of the access log of the current day and the day it was opened for */
+let stream;
+let streamDate;
+
+/** Whether a write is waiting for the file stream to drain */
+let isWriting = false;
+
+/** Timer of the next periodic flush and whether a flush of a full batch is scheduled */
+let flushTimer;
+let isFlushScheduled = false;
+
+/** Promise of the access log being closed once the process is shutting down */
+let closing;
+
+/**
+ * Get the access log file stream of the current day. The log is rotated daily like the log files
+ * of the logger.
+ *
+ * @param {string} date Current date as YYYY-MM-DD
+ * @returns {stream.Writable} File stream
+ */
+const getStream = (date) => {
+  if (date !== streamDate) {
+    if (stream) {
+      stream.end();
+    }
+    fs.mkdirSync(dirname, { recursive: true });
+    stream = fs.createWriteStream(path.join(dirname, `${name}-access-${date}.log`), { flags: 'a' });
+    streamDate = date;
+  }
+  return stream;
+};
+
+/**
+ * Format records as lines of JSON. The request bodies are serialized and truncated to
+ * maxBodyLength characters here rather than when the request is logged. A maxBodyLength of 0
+ * leaves the bodies out.
+ *
+ * @param {object[]} records Access log records
+ * @returns {string} Lines of JSON
+ */
+const formatRecords = records => _.map(records, (record) => {
+  const line = _.assign(_.omit(record, 'body'), {
+    timestamp: new Date(record.timestamp).toISOString(),
+  });
+  if (record.body !== undefined && maxBodyLength > 0) {
+    const body = JSON.stringify(record.body);
+    line.body = body.length > maxBodyLength ? `${body.slice(0, maxBodyLength)}...` : body;
+  }
+  return `${JSON.stringify(line)}\n`;
+}).join('');
+
+/**
+ * Write the buffered records in batches of batchSize. Writing pauses while the file stream is
+ * backed up and resumes once it drains.
+ */
+const flush = () => {
+  clearTimeout(flushTimer);
+  flushTimer = undefined;
+  isFlushScheduled = false;
+  while (!isWriting && !_.isEmpty(buffer)) {
+    const records = buffer.splice(0, batchSize);
+    stats.written += records.length;
+    const fileStream = getStream(new Date().toISOString().slice(0, 10));
+    if (!fileStream.write(formatRecords(records))) {
+      isWriting = true;
+      fileStream.once('drain', () => {
+        isWriting = false;
+        flush();
+      });
+    }
+  }
+};
+
+/**
+ * Buffer an access log record. The record is written by the next flush, which happens every
+ * flushInterval milliseconds or as soon as a batch is full. A record is dropped and counted
+ * rather than buffered once maxBuffered records are waiting, so a slow disk never holds up
+ * requests or grows the buffer without bound. Records logged after the access log is closed are
+ * dropped as well.
+ *
+ * @param {object} record Access log record. Its timestamp is a number of milliseconds and its
+ *                        body is an object which is serialized when the record is written.
+ */
+const logAccess = (record) => {
+  if (closing || buffer.length >= maxBuffered) {
+    stats.dropped += 1;
+    return;
+  }
+  buffer.push(record);
+  if (buffer.length >= batchSize) {
+    if (!isFlushScheduled && !isWriting) {
+      isFlushScheduled = true;
+      setImmediate(flush);
+    }
+  } else if (!flushTimer) {
+    flushTimer = setTimeout(flush, flushInterval);
+    flushTimer.unref();
+  }
+};
+
+/**
+ * Write the records which are still buffered behind the records the file stream already queued
+ * and close the file stream
+ *
+ * @returns {Promise} Promise which resolves once every record is written
+ */
+const closeAccessLog = () => {
+  if (!closing) {
+    clearTimeout(flushTimer);
+    closing = new Promise((resolve) => {
+      if (!_.isEmpty(buffer)) {
+        stats.written += buffer.length;
+        (stream || getStream(new Date().toISOString().slice(0, 10))).write(formatRecords(buffer));
+        buffer.length = 0;
+      }
+      if (!stream) {
+        resolve();
+        return;
+      }
+      stream.once('close', resolve);
+      stream.end();
+    });
+  }
+  return closing;
+};
+
+/*
+ * Records are only written through the file stream, so they are written in order. The stream is
+ * drained once the event loop is empty, where the records of the last flushInterval are still
+ * buffered, and before the process exits on SIGTERM.
+ */
+process.once('beforeExit', closeAccessLog);
+process.once('SIGTERM', () => closeAccessLog().then(() => process.exit()));
+
+registerMetrics('accessLog', () => _.assign({ buffered: buffer.length }, stats));
+
+module.exports = { logAccess, closeAccessLog };
@@ -0,0 +1,177 @@
+const cluster = require('cluster');
+const config = require('config');
+const _ = require('lodash');
+
+const { registerMetrics } = require('./metrics');
+
+const { maxEntries, ttl } = _.defaults(
+  {},
+  config.has('cache') ? config.get('cache') : {},
+  { maxEntries: 1000, ttl: 60 },
+);
+
+/** Caches of this process keyed by name, so that the invalidations of other workers find them */
+const caches = {};
+
+/**
+ * Invalidations of this worker which are not sent to the other workers yet. An invalidation
+ * without a key clears the whole cache.
+ */
+const pendingInvalidations = [];
+
+/**
+ * Send the pending invalidations to the other workers through the primary in a single message, so
+ * that a bulk write does not send a message per key
+ */
+const sendInvalidations = () => {
+  if (process.connected) {
+    process.send({ type: 'cache:invalidate', invalidations: pendingInvalidations });
+  }
+  pendingInvalidations.length = 0;
+};
+
+/**
+ * Tell the other workers of the cluster to drop a key. Outside of cluster mode there are no other
+ * workers.
+ *
+ * @param {string} name Name of the cache
+ * @param {string} [key] Cache key. Every key is dropped if it is undefined.
+ */
+const broadcastInvalidation = (name, key) => {
+  if (!cluster.isWorker) {
+    return;
+  }
+  if (_.isEmpty(pendingInvalidations)) {
+    setImmediate(sendInvalidations);
+  }
+  pendingInvalidations.push({ name, key });
+};
+
+/**
+ * Create a bounded, in-process LRU cache whose entries expire after the configured TTL. Hit, miss
+ * and eviction counters are exposed through the metrics of the admin app. In cluster mode every
+ * worker has its own cache and invalidations are sent to the caches of the same name of the other
+ * workers.
+ *
+ * @param {string} name Name of the cache in the metrics document
+ * @returns {object} Cache
+ */
+const createCache = (name) => {
+  // Map iterates in insertion order, so the first key is always the least recently used one
+  const entries = new Map();
+  const stats = {
+    hits: 0,
+    misses: 0,
+    evictions: 0,
+    invalidations: 0,
+  };
+  let generation = 0;
+
+  /**
+   * Get a value and mark it as most recently used
+   *
+   * @param {string} key Cache key
+   * @returns {*} Cached value or undefined if the key is missing or expired
+   */
+  const get = (key) => {
+    const entry = entries.get(key);
+    if (entry) {
+      entries.delete(key);
+      if (entry.expiresAt > Date.now()) {
+        entries.set(key, entry);
+        stats.hits += 1;
+        return entry.value;
+      }
+    }
+    stats.misses += 1;
+    return undefined;
+  };
+
+  /**
+   * Cache a value, evicting the least recently used entry if the cache is full. The value is not
+   * cached if any key was invalidated since the given generation, because it may have been read
+   * before a write committed.
+   *
+   * @param {string} key Cache key
+   * @param {*} value Value to cache
+   * @param {number} [readGeneration] Generation of the cache when the value was read
+   */
+  const set = (key, value, readGeneration = generation) => {
+    if (maxEntries < 1 || readGeneration !== generation) {
+      return;
+    }
+    entries.delete(key);
+    entries.set(key, { value, expiresAt: Date.now() + (ttl * 1000) });
+    if (entries.size > maxEntries) {
+      entries.delete(entries.keys().next().value);
+      stats.evictions += 1;
+    }
+  };
+
+  /**
+   * Remove a key from the cache of this process
+   *
+   * @param {string} key Cache key
+   */
+  const invalidateLocal = (key) => {
+    generation += 1;
+    stats.invalidations += 1;
+    entries.delete(key);
+  };
+
+  /** Remove every key from the cache of this process */
+  const clearLocal = () => {
+    generation += 1;
+    stats.invalidations += 1;
+    entries.clear();
+  };
+
+  /**
+   * Remove a key from the cache of every worker
+   *
+   * @param {string} key Cache key
+   */
+  const invalidate = (key) => {
+    invalidateLocal(key);
+    broadcastInvalidation(name, key);
+  };
+
+  /** Remove every key from the cache of every worker */
+  const clear = () => {
+    clearLocal();
+    broadcastInvalidation(name);
+  };
+
+  registerMetrics(`caches.${name}`, () => _.assign({ size: entries.size, maxEntries, ttl }, stats));
+
+  caches[name] = { invalidateLocal, clearLocal };
+
+  return {
+    get,
+    set,
+    invalidate,
+    clear,
+    generation: () => generation,
+  };
+};
+
+if (cluster.isWorker) {
+  // apply the invalidations of the other workers, which the primary relays to this worker
+  process.on('message', (message) => {
+    if (message.type === 'cache:invalidate') {
+      _.forEach(message.invalidations, ({ name, key }) => {
+        const cache = caches[name];
+        if (!cache) {
+          return;
+        }
+        if (key === undefined) {
+          cache.clearLocal();
+        } else {
+          cache.invalidateLocal(key);
+        }
+      });
+    }
+  });
+}
+
+module.exports = { createCache };
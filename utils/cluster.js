@@ -0,0 +1,250 @@
+const cluster = require('cluster');
+const config = require('config');
+const https = require('https');
+const _ = require('lodash');
+const os = require('os');
+
+const { logger } = require('./logger');
+const { shareSessionTicketKeys } = require('./tls');
+
+const { workers, shutdownTimeout } = _.defaults(
+  {},
+  config.has('cluster') ? config.get('cluster') : {},
+  { workers: 1, shutdownTimeout: 30 },
+);
+
+/** Number of worker processes. 0 starts one worker per CPU. */
+const workerCount = workers === 0 ? os.cpus().length : workers;
+
+/** Number of milliseconds the primary waits for the workers to send their metrics */
+const collectTimeout = 2000;
+
+/** Number of milliseconds the primary waits before replacing a worker which crashed */
+const respawnDelay = 1000;
+
+/**
+ * Whether the servers should run in worker processes started by a primary process
+ *
+ * @returns {boolean} Whether this process should start the cluster
+ */
+const isClusterPrimary = () => cluster.isMaster && workerCount > 1;
+
+/** Tell the primary that the servers of this worker are listening */
+const notifyReady = () => {
+  if (cluster.isWorker) {
+    process.send({ type: 'worker:ready' });
+  }
+};
+
+/** Whether the primary is retiring this worker */
+let isRetiring = false;
+
+/** Keep-alive connections of the servers of this worker which wait for their next request */
+const idleSockets = new Set();
+
+/**
+ * Close the keep-alive connections of servers once the primary retires this worker. Idle
+ * connections are closed at once and busy ones once their current response is sent with a
+ * "Connection: close" header, so the worker exits as soon as its requests are done rather than
+ * when the load balancer drops its idle connections.
+ *
+ * @param {object[]} servers HTTP or HTTPS servers
+ */
+const closeConnectionsOnRetire = (servers) => {
+  _.forEach(servers, (server) => {
+    const connectionEvent = server instanceof https.Server ? 'secureConnection' : 'connection';
+    server.on(connectionEvent, (socket) => {
+      idleSockets.add(socket);
+      socket.once('close', () => idleSockets.delete(socket));
+    });
+    server.on('request', (req, res) => {
+      const { socket } = req;
+      idleSockets.delete(socket);
+      if (isRetiring) {
+        res.setHeader('Connection', 'close');
+      }
+      res.once('finish', () => {
+        if (isRetiring) {
+          socket.end();
+        } else if (!socket.destroyed) {
+          idleSockets.add(socket);
+        }
+      });
+    });
+  });
+};
+
+if (cluster.isWorker) {
+  process.on('message', (message) => {
+    if (message.type === 'worker:retire') {
+      isRetiring = true;
+      _.forEach([...idleSockets], socket => socket.destroy());
+      idleSockets.clear();
+    }
+  });
+  /*
+   * a worker is disconnected once its servers are closed and their connections have ended. It
+   * then stops as it does on SIGTERM, so that handlers such as the access log drain first.
+   */
+  cluster.worker.on('disconnect', () => process.kill(process.pid, 'SIGTERM'));
+}
+
+/**
+ * Start the primary process of the cluster. The primary forks the workers, replaces workers which
+ * crash, relays cache invalidations between the workers and gathers the metrics of the workers for
+ * the admin app. SIGHUP replaces the workers one at a time and SIGTERM stops them, letting each
+ * worker finish the requests it already accepted.
+ */
+const startPrimary = () => {
+  // workers inherit the keys, so a client can resume its TLS session on any of them
+  shareSessionTicketKeys();
+
+  const health = { expectedWorkers: workerCount, restarts: 0 };
+  const collections = new Map();
+  let lastCollectionId = 0;
+  let isRestarting = false;
+  let isShuttingDown = false;
+
+  /**
+   * Answer the request of a worker with the snapshots of every live worker
+   *
+   * @param {object} requester Worker which requested the metrics
+   * @param {number} requestId ID of the request of the worker
+   */
+  const collectSnapshots = (requester, requestId) => {
+    lastCollectionId += 1;
+    const collectionId = lastCollectionId;
+    const liveWorkers = _.filter(cluster.workers, worker => worker.isConnected());
+    const collection = { snapshots: [], expected: liveWorkers.length };
+
+    const reply = () => {
+      if (collections.delete(collectionId) && requester.isConnected()) {
+        clearTimeout(collection.timer);
+        requester.send({
+          type: 'metrics:result',
+          requestId,
+          snapshots: _.sortBy(collection.snapshots, 'pid'),
+          health: _.assign({ liveWorkers: liveWorkers.length }, health),
+        });
+      }
+    };
+    collection.reply = reply;
+    collection.timer = setTimeout(reply, collectTimeout);
+    collections.set(collectionId, collection);
+
+    _.forEach(liveWorkers, worker => worker.send({ type: 'metrics:collect', collectionId }));
+  };
+
+  /**
+   * Route a message of a worker
+   *
+   * @param {object} worker Worker which sent the message
+   * @param {object} message Message
+   */
+  const onMessage = (worker, message) => {
+    if (message.type === 'metrics:request') {
+      collectSnapshots(worker, message.requestId);
+    } else if (message.type === 'cache:invalidate') {
+      _.forEach(cluster.workers, (other) => {
+        if (other !== worker && other.isConnected()) {
+          other.send(message);
+        }
+      });
+    } else if (message.type === 'metrics:snapshot') {
+      const collection = collections.get(message.collectionId);
+      if (collection) {
+        collection.snapshots.push(message.snapshot);
+        if (collection.snapshots.length >= collection.expected) {
+          collection.reply();
+        }
+      }
+    }
+  };
+
+  /**
+   * Fork a worker
+   *
+   * @returns {Promise<object>} Promise object represents the worker once its servers listen. It
+   *                            is rejected if the worker exits before.
+   */
+  const fork = () => new Promise((resolve, reject) => {
+    const worker = cluster.fork();
+    worker.on('message', (message) => {
+      if (message.type === 'worker:ready') {
+        resolve(worker);
+      } else {
+        onMessage(worker, message);
+      }
+    });
+    worker.once('exit', () => reject(new Error(`Worker ${worker.process.pid} did not start`)));
+  });
+
+  /** Fork a worker. Workers which exit before they listen are replaced by the exit handler. */
+  const spawn = () => fork().catch(_.noop);
+
+  /**
+   * Stop a worker once it finishes the requests it already accepted. The worker closes its idle
+   * keep-alive connections first and is killed if it does not exit in time.
+   *
+   * @param {object} worker Worker
+   * @returns {Promise} Promise object which resolves once the worker exits
+   */
+  const retire = worker => new Promise((resolve) => {
+    const timer = setTimeout(() => worker.kill(), shutdownTimeout * 1000);
+    worker.once('exit', () => {
+      clearTimeout(timer);
+      resolve();
+    });
+    worker.send({ type: 'worker:retire' });
+    worker.disconnect();
+  });
+
+  /** Replace the workers one at a time so that the servers keep accepting connections */
+  const rollingRestart = async () => {
+    if (isRestarting || isShuttingDown) {
+      return;
+    }
+    isRestarting = true;
+    logger.info('Restarting workers');
+    try {
+      // eslint-disable-next-line no-restricted-syntax
+      for (const worker of _.values(cluster.workers)) {
+        // eslint-disable-next-line no-await-in-loop
+        await fork();
+        // eslint-disable-next-line no-await-in-loop
+        await retire(worker);
+      }
+      logger.info('Restarted workers');
+    } finally {
+      isRestarting = false;
+    }
+  };
+
+  cluster.on('exit', (worker, code, signal) => {
+    if (worker.exitedAfterDisconnect || isShuttingDown) {
+      return;
+    }
+    logger.error(`Worker ${worker.process.pid} exited with ${signal || code}`);
+    health.restarts += 1;
+    setTimeout(spawn, respawnDelay);
+  });
+
+  process.on('SIGHUP', () => {
+    rollingRestart().catch(err => logger.error(err));
+  });
+  process.on('SIGTERM', async () => {
+    isShuttingDown = true;
+    await Promise.all(_.map(cluster.workers, retire));
+    process.exit();
+  });
+
+  _.times(workerCount, spawn);
+};
+
+module.exports = {
+  workerCount,
+  isClusterPrimary,
+  notifyReady,
+  closeConnectionsOnRetire,
+  startPrimary,
+};
@@ -0,0 +1,80 @@
+const config = require('config');
+const _ = require('lodash');
+const util = require('util');
+const zlib = require('zlib');
+
+const {
+  enabled,
+  threshold,
+  gzipLevel,
+  brotliQuality,
+} = _.defaults({}, config.get('server').compression, {
+  enabled: true,
+  threshold: 1024,
+  gzipLevel: 6,
+  brotliQuality: 4,
+});
+
+/**
+ * Compressors keyed by content coding in order of preference. Brotli is only offered by Node.js
+ * versions whose zlib supports it.
+ */
+const compressors = _.pickBy({
+  br: zlib.brotliCompress && {
+    compress: util.promisify(zlib.brotliCompress),
+    createStream: zlib.createBrotliCompress,
+    options: () => ({ params: { [zlib.constants.BROTLI_PARAM_QUALITY]: brotliQuality } }),
+  },
+  gzip: {
+    compress: util.promisify(zlib.gzip),
+    createStream: zlib.createGzip,
+    options: () => ({ level: gzipLevel }),
+  },
+});
+
+/** Content codings offered to clients. identity lets a client prefer an uncompressed body. */
+const offeredEncodings = _.concat(_.keys(compressors), 'identity');
+
+/**
+ * Choose the content coding of a response body from the Accept-Encoding header of the request.
+ * Responses which may be compressed vary on Accept-Encoding.
+ *
+ * @param {Request} req Request
+ * @param {Response} res Response
+ * @param {number} [length] Length of the body. Streamed bodies have no known length and are
+ *                          always compressed.
+ * @returns {string} Content coding or undefined if the body should be sent as it is
+ */
+const negotiateEncoding = (req, res, length = Infinity) => {
+  if (!enabled || length < threshold) {
+    return undefined;
+  }
+  res.vary('Accept-Encoding');
+  const encoding = req.acceptsEncodings(offeredEncodings);
+  return compressors[encoding] ? encoding : undefined;
+};
+
+/**
+ * Compress a response body
+ *
+ * @param {string} body Response body
+ * @param {string} encoding Content coding returned by negotiateEncoding
+ * @returns {Promise<Buffer>} Promise object represents the compressed body
+ */
+const compressBody = (body, encoding) => {
+  const { compress, options } = compressors[encoding];
+  return compress(body, options());
+};
+
+/**
+ * Create a stream which compresses a streamed response body
+ *
+ * @param {string} encoding Content coding returned by negotiateEncoding
+ * @returns {stream.Transform} Compression stream
+ */
+const compressionStream = (encoding) => {
+  const { createStream, options } = compressors[encoding];
+  return createStream(options());
+};
+
+module.exports = { negotiateEncoding, compressBody, compressionStream };
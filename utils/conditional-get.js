@@ -0,0 +1,77 @@
+const crypto = require('crypto');
+
+const { negotiateEncoding, compressBody } = require('./compression');
+const { logger } = require('./logger');
+
+/**
+ * JSON bodies, hashes and compressed bodies of documents which have been encoded already.
+ * Documents served from a cache or shared by coalesced requests are only stringified, hashed and
+ * compressed once per content coding.
+ *
+ * @type {WeakMap}
+ */
+const encodedDocuments = new WeakMap();
+
+/**
+ * Encode a JSON API document and compute the hash of its body
+ *
+ * @param {object} document JSON API document
+ * @returns {object} JSON body and hash of the document
+ */
+const encodeDocument = (document) => {
+  let encodedDocument = encodedDocuments.get(document);
+  if (!encodedDocument) {
+    const body = JSON.stringify(document);
+    const hash = crypto.createHash('sha1').update(body).digest('base64');
+    encodedDocument = { body, hash, compressedBodies: {} };
+    encodedDocuments.set(document, encodedDocument);
+  }
+  return encodedDocument;
+};
+
+/**
+ * Compress the body of an encoded document
+ *
+ * @param {object} encodedDocument Document encoded by encodeDocument
+ * @param {string} encoding Content coding
+ * @returns {Promise<Buffer>} Promise object represents the compressed body
+ */
+const compressedBody = (encodedDocument, encoding) => {
+  const { body, compressedBodies } = encodedDocument;
+  if (!compressedBodies[encoding]) {
+    compressedBodies[encoding] = compressBody(body, encoding);
+  }
+  return compressedBodies[encoding];
+};
+
+/**
+ * Send a JSON API document with a strong ETag, or an empty 304 response if the document matches
+ * the If-None-Match header of the request. Large documents are compressed if the client accepts a
+ * content coding. Each coding is a different representation, so it has its own ETag.
+ *
+ * @param {Request} req Request
+ * @param {Response} res Response
+ * @param {object} document JSON API document
+ */
+const sendDocument = (req, res, document) => {
+  const encodedDocument = encodeDocument(document);
+  const { body, hash } = encodedDocument;
+  const encoding = negotiateEncoding(req, res, body.length);
+  res.set('ETag', encoding ? `"${hash}-${encoding}"` : `"${hash}"`);
+  if (req.fresh) {
+    res.status(304).end();
+  } else if (!encoding) {
+    res.type('json').send(body);
+  } else {
+    compressedBody(encodedDocument, encoding).then((compressed) => {
+      res.set('Content-Encoding', encoding);
+      res.type('json').send(compressed);
+    }, (err) => {
+      logger.error(err);
+      res.set('ETag', `"${hash}"`);
+      res.type('json').send(body);
+    });
+  }
+};
+
+module.exports = { sendDocument };
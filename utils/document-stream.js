@@ -0,0 +1,70 @@
+const _ = require('lodash');
+const { pipeline, Transform } = require('stream');
+
+const { negotiateEncoding, compressionStream } = require('./compression');
+const { logger } = require('./logger');
+
+/**
+ * Create a stream which serializes the records written to it into a JSON API document without
+ * holding more than one record in memory. The top-level links are written before the data and the
+ * total number of results is written as meta after it.
+ *
+ * @param {Function} serializer serializer created by compileSerializer
+ * @param {object} options JSON API serializer options
+ * @param {Function} [converter] function which converts a raw record in place before serializing
+ * @returns {stream.Transform} stream with object mode writable side and JSON text readable side
+ */
+const documentStream = (serializer, options, converter = _.noop) => {
+  const header = `{"links":${JSON.stringify(options.topLevelLinks)},"data":[`;
+  let totalResults = 0;
+
+  return new Transform({
+    writableObjectMode: true,
+    transform(record, encoding, callback) {
+      converter(record);
+      const resource = JSON.stringify(serializer.serializeRecord(record, options));
+      const separator = totalResults === 0 ? header : ',';
+      totalResults += 1;
+      callback(null, `${separator}${resource}`);
+    },
+    flush(callback) {
+      const separator = totalResults === 0 ? header : '';
+      callback(null, `${separator}],"meta":${JSON.stringify({ totalResults })}}`);
+    },
+  });
+};
+
+/**
+ * Pipe a serialized document stream to the response. Backpressure from the client is propagated
+ * back to the data source. Headers are already sent once the first chunk is written, so an error
+ * can only be logged and the response is terminated. The stream is compressed if the client
+ * accepts a content coding.
+ *
+ * @param {Request} req Request
+ * @param {Response} res Response
+ * @param {stream.Readable} serializedStream stream of JSON text
+ */
+const sendDocumentStream = (req, res, serializedStream) => {
+  const encoding = negotiateEncoding(req, res);
+  res.type('json');
+  const streams = [serializedStream];
+  if (encoding) {
+    res.set('Content-Encoding', encoding);
+    streams.push(compressionStream(encoding));
+  }
+  pipeline(...streams, res, (err) => {
+    if (err) {
+      logger.error(err);
+    }
+  });
+};
+
+/**
+ * Check whether the query parameters request every result unpaginated
+ *
+ * @param {object} query Query parameters
+ * @returns {boolean} Whether page[size] is 0
+ */
+const isUnpaginated = query => parseInt(query['page[size]'], 10) === 0;
+
+module.exports = { documentStream, sendDocumentStream, isUnpaginated };
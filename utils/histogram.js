@@ -0,0 +1,118 @@
+const _ = require('lodash');
+
+/** Upper bounds in milliseconds of the buckets of latency histograms */
+const latencyBounds = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+/**
+ * Create a cumulative histogram of durations. Bucket "le<bound>" counts the observations which
+ * took at most bound milliseconds and "leInf" counts every observation, so the snapshots of several
+ * workers can be summed.
+ *
+ * @param {number[]} [bounds] Ascending upper bounds of the buckets in milliseconds
+ * @returns {object} Histogram
+ */
+const createHistogram = (bounds = latencyBounds) => {
+  const buckets = _.map(bounds, () => 0);
+  let count = 0;
+  let sum = 0;
+
+  /**
+   * Record a duration
+   *
+   * @param {number} duration Duration in milliseconds
+   */
+  const observe = (duration) => {
+    _.forEach(bounds, (bound, index) => {
+      if (duration <= bound) {
+        buckets[index] += 1;
+      }
+    });
+    count += 1;
+    sum += duration;
+  };
+
+  /**
+   * Take a snapshot of the histogram
+   *
+   * @returns {object} Number and total duration of the observations and the bucket counts
+   */
+  const snapshot = () => _.assign(
+    { count, sum: _.round(sum, 3) },
+    _.zipObject(_.map(bounds, bound => `le${bound}`), buckets),
+    { leInf: count },
+  );
+
+  return { observe, snapshot };
+};
+
+/**
+ * Create a histogram of the durations observed during the last windowSeconds seconds. The window is
+ * split into slotCount slots and the slot which falls out of the window is reset when it is reused,
+ * so old observations expire slot by slot without any timer.
+ *
+ * @param {number} windowSeconds Number of seconds observations are kept
+ * @param {number} [slotCount] Number of slots of the window
+ * @param {number[]} [bounds] Ascending upper bounds of the buckets in milliseconds
+ * @returns {object} Histogram
+ */
+const createRollingHistogram = (windowSeconds, slotCount = 6, bounds = latencyBounds) => {
+  const slotLength = (windowSeconds * 1000) / slotCount;
+  const slots = _.times(slotCount, () => ({ index: -1, histogram: createHistogram(bounds) }));
+
+  /**
+   * Get the slot of the current time, resetting it if it still holds an older slot
+   *
+   * @param {number} now Current time in milliseconds
+   * @returns {object} Slot
+   */
+  const currentSlot = (now) => {
+    const index = Math.floor(now / slotLength);
+    const slot = slots[index % slotCount];
+    if (slot.index !== index) {
+      _.assign(slot, { index, histogram: createHistogram(bounds) });
+    }
+    return slot;
+  };
+
+  /**
+   * Record a duration
+   *
+   * @param {number} duration Duration in milliseconds
+   */
+  const observe = (duration) => {
+    currentSlot(Date.now()).histogram.observe(duration);
+  };
+
+  /**
+   * Take a snapshot of the observations of the window
+   *
+   * @returns {object} Number and total duration of the observations and the bucket counts
+   */
+  const snapshot = () => {
+    const { index } = currentSlot(Date.now());
+    const liveSlots = _.filter(slots, slot => slot.index > index - slotCount);
+    const total = _.mergeWith(
+      {},
+      ..._.map(liveSlots, slot => slot.histogram.snapshot()),
+      (sum, value) => (sum || 0) + value,
+    );
+    return _.assign(total, { sum: _.round(total.sum, 3) });
+  };
+
+  return { observe, snapshot };
+};
+
+/**
+ * Start a timer
+ *
+ * @returns {Function} Function which returns the number of milliseconds since the timer started
+ */
+const startTimer = () => {
+  const start = process.hrtime();
+  return () => {
+    const [seconds, nanoseconds] = process.hrtime(start);
+    return (seconds * 1e3) + (nanoseconds / 1e6);
+  };
+};
+
+module.exports = { createHistogram, createRollingHistogram, startTimer };
@@ -1,4 +1,5 @@
 const appRoot = require('app-root-path');
+const JsonApiSerializer = require('jsonapi-serializer').Serializer;
 const _ = require('lodash');
 
 const { apiBaseUrl, resourcePathLink, paramsLink } = appRoot.require('utils/uri-builder');
@@ -16,7 +17,20 @@ const pageParamsBuilder = (pageNumber, pageSize) => (
 );
 
 /**
- * Generate JSON API serializer options
+ * Helper function to generate cursor pagination params
+ *
+ * @param {string} cursor page[after] cursor
+ * @param {number} pageSize page size
+ * @returns {object} cursor pagination parameters object
+ */
+const cursorParamsBuilder = (cursor, pageSize) => (
+  { 'page[size]': pageSize, 'page[after]': cursor }
+);
+
+/**
+ * Generate JSON API serializer options for a serializer created by compileSerializer. Nothing is
+ * built per record: the self link of each resource is only enabled here and built by the
+ * serializer.
  *
  * @param {object[]} serializerArgs JSON API serializer arguments
  * @returns {object} JSON API serializer options
@@ -39,18 +53,21 @@ const serializerOptions = (serializerArgs) => {
     attributes: resourceKeys,
     id: identifierField,
     keyForAttribute: keyForAttribute || 'camelCase',
-    dataLinks: {
-      self: (row) => {
-        if (enableDataLinks) {
-          return resourcePathLink(resourceUrl, row[identifierField]);
-        }
-        return null;
-      },
-    },
+    enableDataLinks: Boolean(enableDataLinks),
     topLevelLinks: { self: topLevelSelfLink },
   };
 
-  if (pagination) {
+  if (pagination && _.has(pagination, 'nextCursor')) {
+    const { nextCursor, pageSize } = pagination;
+
+    options.topLevelLinks = _.assign(options.topLevelLinks, {
+      next: nextCursor
+        ? paramsLink(paramsLink(resourceUrl, cursorParamsBuilder(nextCursor, pageSize)), query)
+        : null,
+    });
+
+    options.meta = { currentPageSize: pageSize };
+  } else if (pagination) {
     const {
       pageNumber,
       totalPages,
@@ -82,4 +99,136 @@ const serializerOptions = (serializerArgs) => {
   return options;
 };
 
-module.exports = { serializerOptions };
+/**
+ * Narrow the attribute keys of a resource to a sparse fieldset
+ *
+ * @param {string[]} resourceKeys attribute keys of the resource
+ * @param {string[]} [fields] fields requested by fields[type]. Every key is kept if omitted.
+ * @returns {string[]} attribute keys to serialize
+ */
+const sparseFieldset = (resourceKeys, fields) => (
+  fields ? _.intersection(resourceKeys, fields) : resourceKeys
+);
+
+/**
+ * Map attribute keys to the keys jsonapi-serializer emits for them with camelCase
+ * keyForAttribute. The mapping is taken from jsonapi-serializer itself by serializing a single
+ * probe record once, so compiled serializers emit exactly the same keys.
+ *
+ * @param {string} resourceType resource type
+ * @param {string[]} resourceKeys attribute keys of the resource
+ * @returns {object} serialized attribute keys keyed by attribute key
+ */
+const serializedAttributeKeys = (resourceType, resourceKeys) => {
+  const probeRecord = _.assign({ id: 'probe' }, _.zipObject(resourceKeys, resourceKeys));
+  const { data: { attributes } } = new JsonApiSerializer(resourceType, {
+    pluralizeType: false,
+    attributes: resourceKeys,
+    keyForAttribute: 'camelCase',
+  }).serialize(probeRecord);
+  return _.invert(attributes);
+};
+
+/**
+ * Compile a JSON API serializer for a resource defined in openapi. Everything that does not depend
+ * on the records is computed once, so serializing a document is a single pass over the records. The
+ * documents are identical to the ones jsonapi-serializer produces for resources with flat
+ * attributes from the same options and a dataLinks.self function which links each resource when
+ * enableDataLinks is set and returns null otherwise.
+ *
+ * @param {object} resourceProp properties of the resource definition in openapi
+ * @param {string} resourcePath resource path
+ * @param {string} [subresourcePath] path appended to the self link of each resource when the
+ *                                   resource is a subresource such as games/{id}/stats
+ * @returns {Function} serializer which takes the records and serializer options and returns the
+ *                     serialized document. Its serializeRecord property serializes a single
+ *                     record into a resource object.
+ */
+const compileSerializer = (resourceProp, resourcePath, subresourcePath) => {
+  const resourceType = resourceProp.type.enum[0];
+  const resourceKeys = _.keys(resourceProp.attributes.properties);
+  const resourceUrl = resourcePathLink(apiBaseUrl, resourcePath);
+  const attributeKeys = serializedAttributeKeys(resourceType, resourceKeys);
+  const linkSuffix = subresourcePath ? `/${subresourcePath}` : '';
+
+  /**
+   * Serialize a single record into a resource object
+   *
+   * @param {object} record data row
+   * @param {string} identifierField name of the identifier field
+   * @param {string[]} keys attribute keys to serialize
+   * @param {boolean} enableDataLinks whether to link the resource or set its self link to null
+   * @returns {object} resource object
+   */
+  const serializeRecord = (record, identifierField, keys, enableDataLinks) => {
+    if (record === null) {
+      return null;
+    }
+    const id = record[identifierField];
+    const resource = {
+      type: resourceType,
+      id: String(id),
+      links: { self: enableDataLinks ? `${resourceUrl}/${id}${linkSuffix}` : null },
+    };
+    for (let i = 0; i < keys.length; i += 1) {
+      const key = keys[i];
+      if (key in record) {
+        if (!resource.attributes) {
+          resource.attributes = {};
+        }
+        resource.attributes[attributeKeys[key] || key] = record[key];
+      }
+    }
+    return resource;
+  };
+
+  const serializer = (records, options) => {
+    const {
+      id: identifierField,
+      attributes: keys,
+      enableDataLinks,
+      topLevelLinks,
+      meta,
+    } = options;
+
+    const document = {};
+    if (topLevelLinks) {
+      document.links = _.clone(topLevelLinks);
+    }
+    if (meta) {
+      document.meta = _.clone(meta);
+    }
+    document.data = _.isArray(records)
+      ? _.map(records, record => serializeRecord(record, identifierField, keys, enableDataLinks))
+      : serializeRecord(records, identifierField, keys, enableDataLinks);
+    return document;
+  };
+  serializer.serializeRecord = (record, options) => (
+    serializeRecord(record, options.id, options.attributes, options.enableDataLinks)
+  );
+
+  return serializer;
+};
+
+/**
+ * Build the document of a bulk operation. The result of every item is listed in meta in the order
+ * of the request and the resources which were created or updated are linked in data.
+ *
+ * @param {Function} serializer serializer created by compileSerializer
+ * @param {object[]} results result of each item with its index, status and the id of its resource
+ *                           or an error detail
+ * @returns {object} bulk operation document
+ */
+const bulkResultsDocument = (serializer, results) => ({
+  data: _.map(_.filter(results, ({ status }) => _.includes(['200', '201'], status)), ({ id }) => (
+    serializer.serializeRecord({ id }, { id: 'id', attributes: [], enableDataLinks: true })
+  )),
+  meta: { results },
+});
+
+module.exports = {
+  serializerOptions,
+  compileSerializer,
+  sparseFieldset,
+  bulkResultsDocument,
+};
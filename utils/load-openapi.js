@@ -1,8 +1,25 @@
+const appRoot = require('app-root-path');
+const crypto = require('crypto');
 const deasync = require('deasync');
+const fs = require('fs');
+const _ = require('lodash');
+const path = require('path');
 const SwaggerParser = require('swagger-parser');
 
 const { logger } = require('./logger');
 
+/** OpenAPI document of the API */
+const openapiPath = appRoot.resolve('openapi.yaml');
+
+/**
+ * Validated and dereferenced OpenAPI document written by a previous start or by
+ * `npm run build-openapi`. It is reused as long as the hash of openapi.yaml matches.
+ */
+const artifactPath = appRoot.resolve('build/openapi.json');
+
+/** Version of the artifact format, which is raised whenever the content of the artifact changes */
+const artifactVersion = 2;
+
 /**
  * Wrap async parser in a synchronous function. Preserve "this" context.
  *
@@ -11,19 +28,86 @@ const { logger } = require('./logger');
 const validateSync = deasync(SwaggerParser.validate).bind(SwaggerParser);
 
 /**
- * Attempt to parse openapi.yaml and log error and exit if error is thrown
+ * Collect the names of the query parameters of every operation, so that the DAOs do not derive
+ * them from the document on each request. Path level parameters such as Authorization are merged
+ * first, but only query parameters are kept since the DAOs bind them to their queries.
+ *
+ * @param {object} openapi Dereferenced OpenAPI document
+ * @returns {object} Query parameter names keyed by path and method
+ */
+const collectParameterNames = openapi => _.mapValues(openapi.paths, pathItem => _.mapValues(
+  _.omit(pathItem, 'parameters'),
+  operation => _.map(
+    _.filter(_.concat(pathItem.parameters || [], operation.parameters || []), { in: 'query' }),
+    'name',
+  ),
+));
+
+/**
+ * Read the artifact of a previous validation of openapi.yaml
+ *
+ * @param {string} hash Hash of the content of openapi.yaml
+ * @returns {object} Artifact or undefined if it is missing or was built from another openapi.yaml
+ *                   or by another version
+ */
+const readArtifact = (hash) => {
+  try {
+    const artifact = JSON.parse(fs.readFileSync(artifactPath, 'utf8'));
+    return artifact.hash === hash && artifact.version === artifactVersion ? artifact : undefined;
+  } catch (err) {
+    return undefined;
+  }
+};
+
+/**
+ * Validate openapi.yaml and write the artifact of the validation. A read-only file system only
+ * costs the validation on every start, so failing to write the artifact is not an error.
  *
- * @returns {object} The parsed openapi document
+ * @param {string} hash Hash of the content of openapi.yaml
+ * @returns {object} Artifact
  */
-const parseOpenApi = () => {
+const buildArtifact = (hash) => {
+  const openapi = validateSync(openapiPath);
+  const artifact = {
+    hash,
+    version: artifactVersion,
+    openapi,
+    parameterNames: collectParameterNames(openapi),
+  };
   try {
-    return validateSync('openapi.yaml');
+    // the artifact is renamed into place so that other processes never read a partial file
+    const temporaryPath = `${artifactPath}.${process.pid}`;
+    fs.mkdirSync(path.dirname(artifactPath), { recursive: true });
+    fs.writeFileSync(temporaryPath, JSON.stringify(artifact));
+    fs.renameSync(temporaryPath, artifactPath);
+  } catch (err) {
+    logger.warn(`Unable to write ${artifactPath}: ${err.message}`);
+  }
+  return artifact;
+};
+
+/**
+ * Attempt to load the validated openapi document, from the artifact if openapi.yaml has not
+ * changed since it was built, and log error and exit if openapi.yaml is invalid
+ *
+ * @param {boolean} [rebuild] Whether to validate openapi.yaml even if the artifact is current
+ * @returns {object} The parsed openapi document and the parameter names of its operations
+ */
+const loadOpenApi = (rebuild) => {
+  try {
+    const hash = crypto.createHash('sha256').update(fs.readFileSync(openapiPath)).digest('hex');
+    return (!rebuild && readArtifact(hash)) || buildArtifact(hash);
   } catch (err) {
     logger.error(err);
     return process.exit(1);
   }
 };
 
-const openapi = parseOpenApi();
+const { openapi, parameterNames } = loadOpenApi(require.main === module);
+
+// validate openapi.yaml and write the artifact when run as a build step
+if (require.main === module) {
+  logger.info(`Wrote ${artifactPath}`);
+}
 
-module.exports = { openapi };
+module.exports = { openapi, parameterNames };
@@ -0,0 +1,117 @@
+const cluster = require('cluster');
+const _ = require('lodash');
+
+/** Metric collectors keyed by their dot separated path in the metrics document */
+const collectors = {};
+
+/** Metrics which are settings of each worker rather than counters, so they are not summed */
+const settingKeys = ['maxEntries', 'ttl'];
+
+/** Number of milliseconds a worker waits for the metrics of the other workers */
+const aggregateTimeout = 5000;
+
+/** Resolve functions of the aggregations a worker is waiting for keyed by request ID */
+const pendingAggregations = new Map();
+let lastRequestId = 0;
+
+/**
+ * Register a function that collects a snapshot of runtime metrics
+ *
+ * @param {string} path Dot separated path of the metrics in the metrics document
+ * @param {Function} collect Function that returns a snapshot of the metrics
+ */
+const registerMetrics = (path, collect) => {
+  collectors[path] = collect;
+};
+
+/**
+ * Collect a snapshot of every registered metric
+ *
+ * @returns {object} Metrics document
+ */
+const collectMetrics = () => {
+  const metrics = {};
+  _.forEach(collectors, (collect, path) => {
+    _.set(metrics, path, collect());
+  });
+  return metrics;
+};
+
+/**
+ * Collect the health and metrics of this process
+ *
+ * @returns {object} Snapshot of the process
+ */
+const processSnapshot = () => ({
+  pid: process.pid,
+  uptime: process.uptime(),
+  rss: process.memoryUsage().rss,
+  metrics: collectMetrics(),
+});
+
+/**
+ * Sum the metrics documents of several workers. Settings are taken from the first worker.
+ *
+ * @param {object[]} documents Metrics documents
+ * @returns {object} Metrics document of all workers
+ */
+const sumMetrics = documents => _.mergeWith({}, ...documents, (total, value, key) => {
+  if (_.isNumber(value)) {
+    return _.includes(settingKeys, key) && total !== undefined ? total : (total || 0) + value;
+  }
+  return undefined;
+});
+
+/**
+ * Collect the metrics of every worker of the cluster. The primary process gathers the snapshots of
+ * the workers. Outside of cluster mode the metrics of this process are returned as they are.
+ *
+ * @returns {Promise<object>} Promise object represents the metrics document
+ */
+const aggregateMetrics = () => {
+  if (!cluster.isWorker) {
+    return Promise.resolve(collectMetrics());
+  }
+  lastRequestId += 1;
+  const requestId = lastRequestId;
+
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => {
+      pendingAggregations.delete(requestId);
+      reject(new Error('Timed out waiting for the metrics of the cluster.'));
+    }, aggregateTimeout);
+
+    pendingAggregations.set(requestId, ({ snapshots, health }) => {
+      clearTimeout(timer);
+      resolve(_.assign(sumMetrics(_.map(snapshots, 'metrics')), {
+        cluster: _.assign({}, health, { workers: _.map(snapshots, s => _.omit(s, 'metrics')) }),
+      }));
+    });
+    process.send({ type: 'metrics:request', requestId });
+  });
+};
+
+if (cluster.isWorker) {
+  process.on('message', (message) => {
+    if (message.type === 'metrics:collect') {
+      process.send({
+        type: 'metrics:snapshot',
+        collectionId: message.collectionId,
+        snapshot: processSnapshot(),
+      });
+    } else if (message.type === 'metrics:result') {
+      const resolve = pendingAggregations.get(message.requestId);
+      if (resolve) {
+        pendingAggregations.delete(message.requestId);
+        resolve(message);
+      }
+    }
+  });
+}
+
+module.exports = {
+  registerMetrics,
+  collectMetrics,
+  sumMetrics,
+  aggregateMetrics,
+};
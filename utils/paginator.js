@@ -5,13 +5,28 @@ const _ = require('lodash');
  *
  * @param {object[]} rows Data rows
  * @param {object} pageQuery Pagination query parameter
+ * @param {object} [pageResult] Page result when the data source has already paginated the rows,
+ *                              containing either totalResults or nextCursor. If omitted, rows are
+ *                              sliced in memory.
  * @returns {*} Paginated data rows
  */
-const paginate = (rows, pageQuery) => {
-  const pageNumber = parseInt(pageQuery.number, 10);
+const paginate = (rows, pageQuery, pageResult = {}) => {
   const pageSize = parseInt(pageQuery.size, 10);
-  const totalPages = Math.ceil(rows.length / pageSize) || 1;
-  const paginatedRows = _.slice(rows, (pageNumber - 1) * pageSize, pageNumber * pageSize);
+  if (_.has(pageResult, 'nextCursor')) {
+    return {
+      paginatedRows: rows,
+      pageSize,
+      nextCursor: pageResult.nextCursor,
+    };
+  }
+
+  const isPrePaginated = pageResult.totalResults !== undefined;
+  const totalResults = isPrePaginated ? pageResult.totalResults : rows.length;
+  const pageNumber = parseInt(pageQuery.number, 10);
+  const totalPages = Math.ceil(totalResults / pageSize) || 1;
+  const paginatedRows = isPrePaginated
+    ? rows
+    : _.slice(rows, (pageNumber - 1) * pageSize, pageNumber * pageSize);
   const isOutOfBounds = pageNumber < 1 || pageNumber > totalPages;
   const nextPage = isOutOfBounds || pageNumber >= totalPages ? null : pageNumber + 1;
   const prevPage = isOutOfBounds || pageNumber <= 1 ? null : pageNumber - 1;
@@ -23,7 +38,65 @@ const paginate = (rows, pageQuery) => {
     pageSize,
     nextPage,
     prevPage,
+    totalResults,
   };
 };
 
-module.exports = { paginate };
+/**
+ * Encode the position of a row in a sorted result set as an opaque, URL safe cursor
+ *
+ * @param {string} sort Sort parameter the result set is ordered by
+ * @param {string} value Value of the sort key of the row or null if sorted by id
+ * @param {string} id Unique ID of the row
+ * @returns {string} Cursor
+ */
+const encodeCursor = (sort, value, id) => Buffer.from(JSON.stringify([sort, value, id]))
+  .toString('base64')
+  .replace(/\+/g, '-')
+  .replace(/\//g, '_')
+  .replace(/=+$/, '');
+
+/**
+ * Decode a cursor created by encodeCursor
+ *
+ * @param {string} cursor Cursor
+ * @returns {object} Decoded cursor or undefined if the cursor is malformed
+ */
+const decodeCursor = (cursor) => {
+  try {
+    const decoded = JSON.parse(Buffer.from(cursor, 'base64').toString());
+    if (!_.isArray(decoded) || decoded.length !== 3) {
+      return undefined;
+    }
+    const [sort, value, id] = decoded;
+    if (!_.isString(sort) || !(_.isString(value) || _.isNull(value)) || !/^\d+$/.test(id)) {
+      return undefined;
+    }
+    return { sort, value, id };
+  } catch (err) {
+    return undefined;
+  }
+};
+
+/**
+ * Check that a page[after] cursor is well formed and was issued for the requested sort order. An
+ * empty cursor is valid and starts cursor pagination from the first row.
+ *
+ * @param {string} cursor Cursor
+ * @param {string} [sort] Sort parameter of the request
+ * @returns {boolean} Whether the cursor can be used
+ */
+const isValidCursor = (cursor, sort = 'id') => {
+  if (cursor === '') {
+    return true;
+  }
+  const decoded = decodeCursor(cursor);
+  return !!decoded && decoded.sort === sort;
+};
+
+module.exports = {
+  paginate,
+  encodeCursor,
+  decodeCursor,
+  isValidCursor,
+};
@@ -0,0 +1,61 @@
+const crypto = require('crypto');
+const util = require('util');
+
+const scrypt = util.promisify(crypto.scrypt);
+
+/** CPU and memory cost of new hashes. Each hash keeps the cost it was created with. */
+const defaultCost = 16384;
+
+/** Number of bytes of the salt and of the derived key of new hashes */
+const saltLength = 16;
+const keyLength = 32;
+
+/**
+ * Hash a password with scrypt and a random salt. The hash is formatted as
+ * scrypt$<cost>$<base64 salt>$<base64 key>.
+ *
+ * @param {string} password Password
+ * @param {number} [cost] CPU and memory cost. Must be a power of 2.
+ * @returns {string} Salted hash of the password
+ */
+const hashPassword = (password, cost = defaultCost) => {
+  const salt = crypto.randomBytes(saltLength);
+  const key = crypto.scryptSync(password, salt, keyLength, { N: cost });
+  return ['scrypt', cost, salt.toString('base64'), key.toString('base64')].join('$');
+};
+
+/**
+ * Check a password against a hash created by hashPassword. The keys are compared in constant
+ * time.
+ *
+ * @param {string} password Password
+ * @param {string} passwordHash Salted hash of the password
+ * @returns {Promise<boolean>} Promise object represents whether the password matches the hash
+ * @throws Throws an error if the hash is not a scrypt hash
+ */
+const verifyPassword = async (password, passwordHash) => {
+  const [algorithm, cost, salt, key] = passwordHash.split('$');
+  if (algorithm !== 'scrypt') {
+    throw new Error('Password hashes must be created by hashPassword.');
+  }
+  const expectedKey = Buffer.from(key, 'base64');
+  const derivedKey = await scrypt(
+    password,
+    Buffer.from(salt, 'base64'),
+    expectedKey.length,
+    { N: Number(cost) },
+  );
+  return crypto.timingSafeEqual(derivedKey, expectedKey);
+};
+
+// print the hash of the password passed as argument when run as a script
+if (require.main === module) {
+  const [password] = process.argv.slice(2);
+  if (!password) {
+    process.stderr.write('Usage: npm run hash-password -- <password>\n');
+    process.exit(1);
+  }
+  process.stdout.write(`${hashPassword(password)}\n`);
+}
+
+module.exports = { hashPassword, verifyPassword };
@@ -0,0 +1,113 @@
+const inspector = require('inspector');
+const _ = require('lodash');
+
+/** File extension of each type of profile, which the Chrome DevTools expect when loading it */
+const profileExtensions = {
+  cpu: 'cpuprofile',
+  heap: 'heapprofile',
+  snapshot: 'heapsnapshot',
+};
+
+/** Whether a profile is being captured. Profiles slow down every request, so one runs at a time. */
+let isProfiling = false;
+
+/**
+ * Post a message to the inspector session
+ *
+ * @param {inspector.Session} session Inspector session
+ * @param {string} method Method of the inspector protocol
+ * @param {object} [params] Parameters of the method
+ * @returns {Promise} Promise object which resolves with the result of the method
+ */
+const post = (session, method, params = {}) => new Promise((resolve, reject) => {
+  session.post(method, params, (err, result) => (err ? reject(err) : resolve(result)));
+});
+
+/**
+ * Wait for a number of seconds
+ *
+ * @param {number} seconds Number of seconds
+ * @returns {Promise} Promise object which resolves after the seconds passed
+ */
+const sleep = seconds => new Promise(resolve => setTimeout(resolve, seconds * 1000));
+
+/**
+ * Profile the CPU for a number of seconds
+ *
+ * @param {inspector.Session} session Inspector session
+ * @param {number} seconds Number of seconds
+ * @returns {Promise<object>} Promise object which resolves with the CPU profile
+ */
+const captureCpuProfile = async (session, seconds) => {
+  await post(session, 'Profiler.enable');
+  await post(session, 'Profiler.start');
+  await sleep(seconds);
+  const { profile } = await post(session, 'Profiler.stop');
+  return profile;
+};
+
+/**
+ * Sample the heap allocations for a number of seconds
+ *
+ * @param {inspector.Session} session Inspector session
+ * @param {number} seconds Number of seconds
+ * @returns {Promise<object>} Promise object which resolves with the sampling heap profile
+ */
+const captureHeapProfile = async (session, seconds) => {
+  await post(session, 'HeapProfiler.enable');
+  await post(session, 'HeapProfiler.startSampling');
+  await sleep(seconds);
+  const { profile } = await post(session, 'HeapProfiler.stopSampling');
+  return profile;
+};
+
+/**
+ * Take a heap snapshot. The process is paused while the snapshot is taken.
+ *
+ * @param {inspector.Session} session Inspector session
+ * @returns {Promise<string>} Promise object which resolves with the heap snapshot
+ */
+const captureHeapSnapshot = async (session) => {
+  const chunks = [];
+  session.on('HeapProfiler.addHeapSnapshotChunk', ({ params }) => chunks.push(params.chunk));
+  await post(session, 'HeapProfiler.takeHeapSnapshot');
+  return chunks.join('');
+};
+
+/**
+ * Capture a profile of this process
+ *
+ * @param {string} type 'cpu' for a CPU profile, 'heap' for a sampling heap profile of the
+ *                      allocations or 'snapshot' for a heap snapshot
+ * @param {number} seconds Number of seconds to profile. A heap snapshot is taken at once.
+ * @returns {Promise<object>} Promise object which resolves with the file name and the content of
+ *                            the profile, or with undefined if another profile is being captured
+ */
+const captureProfile = async (type, seconds) => {
+  if (isProfiling) {
+    return undefined;
+  }
+  isProfiling = true;
+  const session = new inspector.Session();
+  session.connect();
+  try {
+    let profile;
+    if (type === 'snapshot') {
+      profile = await captureHeapSnapshot(session);
+    } else if (type === 'heap') {
+      profile = await captureHeapProfile(session, seconds);
+    } else {
+      profile = await captureCpuProfile(session, seconds);
+    }
+    const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
+    return {
+      filename: `${process.pid}-${timestamp}.${profileExtensions[type]}`,
+      content: _.isString(profile) ? profile : JSON.stringify(profile),
+    };
+  } finally {
+    session.disconnect();
+    isProfiling = false;
+  }
+};
+
+module.exports = { captureProfile, profileExtensions };
@@ -0,0 +1,89 @@
+const { AsyncLocalStorage } = require('async_hooks');
+const _ = require('lodash');
+
+const { startTimer } = require('./histogram');
+
+/** Stage durations of the request which the current code serves */
+const storage = new AsyncLocalStorage();
+
+/**
+ * Run a function with the stage durations of a request, so that the stages timed by the function
+ * and by everything it calls asynchronously are added to them
+ *
+ * @param {object} timings Stage durations in milliseconds keyed by stage name
+ * @param {Function} fn Function
+ * @returns {*} Result of the function
+ */
+const runWithTimings = (timings, fn) => storage.run(timings, fn);
+
+/**
+ * Get the stage durations of the current request
+ *
+ * @returns {object} Stage durations or undefined outside of a request
+ */
+const currentTimings = () => storage.getStore();
+
+/**
+ * Add a duration to a stage of the current request. Stages of concurrent calls, such as several
+ * statements in flight, add up.
+ *
+ * @param {string} stage Stage name
+ * @param {number} duration Duration in milliseconds
+ */
+const recordStage = (stage, duration) => {
+  const timings = currentTimings();
+  if (timings) {
+    timings[stage] = (timings[stage] || 0) + duration;
+  }
+};
+
+/**
+ * Stages whose synchronous part is running. A call nested in a call of the same stage, such as a
+ * serializer which serializes included resources, is part of the outer call and is not added
+ * again.
+ */
+const activeStages = new Set();
+
+/**
+ * Time every call of a function as a stage of the current request. Promises are timed until they
+ * settle. Calls outside of a request are not timed.
+ *
+ * @param {string} stage Stage name
+ * @param {Function} fn Function
+ * @returns {Function} Timed function
+ */
+const timeStage = (stage, fn) => (...args) => {
+  if (activeStages.has(stage) || !currentTimings()) {
+    return fn(...args);
+  }
+  const elapsed = startTimer();
+  let result;
+  activeStages.add(stage);
+  try {
+    result = fn(...args);
+  } finally {
+    activeStages.delete(stage);
+  }
+  if (result && typeof result.then === 'function') {
+    return result.finally(() => recordStage(stage, elapsed()));
+  }
+  recordStage(stage, elapsed());
+  return result;
+};
+
+/**
+ * Time every function of a module as a stage of the current request
+ *
+ * @param {string} stage Stage name
+ * @param {object} functions Functions keyed by name
+ * @returns {object} Timed functions keyed by name
+ */
+const timeStages = (stage, functions) => _.mapValues(functions, fn => timeStage(stage, fn));
+
+module.exports = {
+  runWithTimings,
+  currentTimings,
+  recordStage,
+  timeStage,
+  timeStages,
+};
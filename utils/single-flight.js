@@ -0,0 +1,45 @@
+const _ = require('lodash');
+
+const { registerMetrics } = require('./metrics');
+
+/**
+ * Normalize query parameters into a key that is the same for identical queries regardless of the
+ * order of the parameters
+ *
+ * @param {object} queries Query parameters
+ * @returns {string} Normalized key
+ */
+const queryKey = queries => JSON.stringify(_.sortBy(_.toPairs(queries), 0));
+
+/**
+ * Wrap a function that takes query parameters so that concurrent calls with identical query
+ * parameters share a single execution and its result instead of each running on its own. The
+ * number of executions and coalesced calls is exposed through the metrics of the admin app.
+ *
+ * @param {string} name Name of the function in the metrics document
+ * @param {Function} fn Async function to wrap. Its first argument is the query parameters.
+ * @returns {Function} Wrapped function
+ */
+const singleFlight = (name, fn) => {
+  const inFlight = new Map();
+  const stats = { executions: 0, coalesced: 0 };
+
+  registerMetrics(`singleFlight.${name}`, () => _.assign({ inFlight: inFlight.size }, stats));
+
+  return (queries, ...args) => {
+    const key = queryKey(queries);
+    if (inFlight.has(key)) {
+      stats.coalesced += 1;
+      return inFlight.get(key);
+    }
+
+    stats.executions += 1;
+    const promise = fn(queries, ...args);
+    inFlight.set(key, promise);
+    const settle = () => inFlight.delete(key);
+    promise.then(settle, settle);
+    return promise;
+  };
+};
+
+module.exports = { singleFlight };
@@ -0,0 +1,45 @@
+const config = require('config');
+const crypto = require('crypto');
+const fs = require('fs');
+
+const { ticketKeysPath } = config.get('server');
+
+/** Environment variable which passes the session ticket keys of the primary to its workers */
+const ticketKeysVariable = 'TLS_TICKET_KEYS';
+
+/** Number of bytes of the session ticket keys of a TLS server */
+const ticketKeysLength = 48;
+
+/**
+ * Get the keys which encrypt TLS session tickets. Every process which shares the keys can resume
+ * the sessions of the others, so a client skips the full handshake whichever worker or instance
+ * it reconnects to. The keys are read from ticketKeysPath if it is configured, taken from the
+ * primary process in cluster mode or else generated by each HTTPS server.
+ *
+ * @returns {Buffer} Session ticket keys or undefined if each server generates its own keys
+ * @throws Throws an error if the file of the keys does not hold 48 bytes
+ */
+const sessionTicketKeys = () => {
+  let ticketKeys;
+  if (ticketKeysPath) {
+    ticketKeys = fs.readFileSync(ticketKeysPath);
+  } else if (process.env[ticketKeysVariable]) {
+    ticketKeys = Buffer.from(process.env[ticketKeysVariable], 'hex');
+  }
+  if (ticketKeys && ticketKeys.length !== ticketKeysLength) {
+    throw new Error(`Session ticket keys must be ${ticketKeysLength} bytes.`);
+  }
+  return ticketKeys;
+};
+
+/**
+ * Generate session ticket keys in the primary process of a cluster which its workers inherit,
+ * unless the keys are read from ticketKeysPath
+ */
+const shareSessionTicketKeys = () => {
+  if (!ticketKeysPath && !process.env[ticketKeysVariable]) {
+    process.env[ticketKeysVariable] = crypto.randomBytes(ticketKeysLength).toString('hex');
+  }
+};
+
+module.exports = { sessionTicketKeys, shareSessionTicketKeys };
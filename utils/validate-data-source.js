@@ -11,6 +11,9 @@ const json = dataSources.includes('json')
 const oracledb = dataSources.includes('oracledb')
   ? appRoot.require('api/v1/db/oracledb/connection').validateOracleDb
   : null;
+const sqlite = dataSources.includes('sqlite')
+  ? appRoot.require('api/v1/db/sqlite/connection').validateSqlite
+  : null;
 const awsS3 = dataSources.includes('awsS3')
   ? appRoot.require('api/v1/db/awsS3/aws-operations').validateAwsS3
   : null;
@@ -22,6 +25,7 @@ const validateDataSource = () => {
     http: null, // TODO: add HTTP validation method
     json,
     oracledb,
+    sqlite,
   };
 
   _.each(dataSources, (dataSourceType) => {